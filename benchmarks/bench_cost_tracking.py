@@ -0,0 +1,112 @@
+"""Throughput and exactness of cost tracking under thread and process contention.
+
+Run from the repository root::
+
+    python benchmarks/bench_cost_tracking.py [--records 20000] [--workers 8]
+
+Every mode records ``--records`` calls per worker and checks the tracker's
+totals afterwards, so a lost update shows up as a failed check.
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from powertools.router.llm_router import (  # noqa: E402
+    RemoteUsageRecorder,
+    ShardedRecorder,
+    TokenCostTracker,
+    UsageAggregator,
+)
+
+
+def _tracker() -> TokenCostTracker:
+    tracker = TokenCostTracker()
+    tracker.register_model_pricing("gpt", input_cost_per_1k=1.0, output_cost_per_1k=2.0)
+    return tracker
+
+
+def _check(tracker: TokenCostTracker, expected: int) -> str:
+    ok = tracker.call_count == expected and tracker.total_tokens == expected * 150
+    return "exact" if ok else f"LOST {expected - tracker.call_count} calls"
+
+
+def _threads(record, workers: int, records: int) -> float:
+    barrier = threading.Barrier(workers + 1)
+
+    def work() -> None:
+        barrier.wait()
+        for _ in range(records):
+            record(model="gpt", input_tokens=100, output_tokens=50)
+
+    threads = [threading.Thread(target=work) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started
+
+
+def _remote_worker(address, records: int, batch_size: int) -> None:
+    with RemoteUsageRecorder(address, batch_size=batch_size) as recorder:
+        for _ in range(records):
+            recorder.record_usage(model="gpt", input_tokens=100, output_tokens=50)
+
+
+def _report(name: str, elapsed: float, total: int, result: str) -> None:
+    print(f"{name:<34} {total / elapsed:>12,.0f} records/s   {result}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=20_000, help="records per worker")
+    parser.add_argument("--workers", type=int, default=8, help="threads or processes")
+    parser.add_argument("--batch-size", type=int, default=256)
+    args = parser.parse_args()
+    total = args.records * args.workers
+
+    tracker = _tracker()
+    elapsed = _threads(tracker.record_usage, 1, total)
+    _report("1 thread, tracker.record_usage", elapsed, total, _check(tracker, total))
+
+    tracker = _tracker()
+    elapsed = _threads(tracker.record_usage, args.workers, args.records)
+    _report(f"{args.workers} threads, tracker.record_usage", elapsed, total, _check(tracker, total))
+
+    tracker = _tracker()
+    recorder = ShardedRecorder(tracker, batch_size=args.batch_size)
+    elapsed = _threads(recorder.record_usage, args.workers, args.records)
+    started = time.perf_counter()
+    recorder.flush()
+    elapsed += time.perf_counter() - started
+    _report(f"{args.workers} threads, ShardedRecorder", elapsed, total, _check(tracker, total))
+
+    tracker = _tracker()
+    with tempfile.TemporaryDirectory() as directory:
+        with UsageAggregator(tracker, os.path.join(directory, "usage.sock")) as aggregator:
+            processes = [
+                multiprocessing.Process(
+                    target=_remote_worker, args=(aggregator.address, args.records, args.batch_size)
+                )
+                for _ in range(args.workers)
+            ]
+            started = time.perf_counter()
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+            elapsed = time.perf_counter() - started
+    _report(f"{args.workers} processes, UsageAggregator", elapsed, total, _check(tracker, total))
+
+
+if __name__ == "__main__":
+    main()
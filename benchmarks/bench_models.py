@@ -0,0 +1,84 @@
+"""Per-object construction cost of the router's response and stream types.
+
+Run from the repository root::
+
+    python benchmarks/bench_models.py [--number 200000]
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+from typing import Dict
+
+from pydantic import BaseModel, Field
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from powertools.router.llm_router.models import LLMResponse, ProviderType, StreamChunk  # noqa: E402
+
+CONTENT = "The quick brown fox jumps over the lazy dog. " * 8
+USAGE = {"prompt_tokens": 120, "completion_tokens": 80, "total_tokens": 200}
+METADATA = {"ttft_ms": 42.0, "streamed": True, "decision_ms": 0.3}
+
+
+class ValidatedStreamChunk(BaseModel):
+    """The pydantic chunk type streams used before ``StreamChunk`` became a slotted dataclass."""
+
+    content: str
+    done: bool = False
+    usage: Dict[str, int] = Field(default_factory=dict)
+
+
+def _response_validated() -> LLMResponse:
+    return LLMResponse(
+        content=CONTENT, model="llama3", provider="ollama", provider_type=ProviderType.LOCAL,
+        usage=USAGE, metadata=METADATA,
+    )
+
+
+def _response_model_construct() -> LLMResponse:
+    return LLMResponse.model_construct(
+        content=CONTENT, model="llama3", provider="ollama", provider_type=ProviderType.LOCAL,
+        usage=USAGE, metadata=METADATA,
+    )
+
+
+def _response_trusted() -> LLMResponse:
+    return LLMResponse.trusted(
+        content=CONTENT, model="llama3", provider="ollama", provider_type=ProviderType.LOCAL,
+        usage=USAGE, metadata=METADATA,
+    )
+
+
+def _chunk_validated() -> ValidatedStreamChunk:
+    return ValidatedStreamChunk(content="fox")
+
+
+def _chunk_slotted() -> StreamChunk:
+    return StreamChunk(content="fox")
+
+
+CASES = [
+    ("LLMResponse(...)", _response_validated),
+    ("LLMResponse.model_construct(...)", _response_model_construct),
+    ("LLMResponse.trusted(...)", _response_trusted),
+    ("pydantic StreamChunk(...)", _chunk_validated),
+    ("slotted StreamChunk(...)", _chunk_slotted),
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=200_000, help="constructions per measurement")
+    parser.add_argument("--repeat", type=int, default=5, help="measurements per case; the best is reported")
+    args = parser.parse_args()
+
+    assert _response_trusted() == _response_validated()
+    for name, build in CASES:
+        best = min(timeit.repeat(build, number=args.number, repeat=args.repeat))
+        print(f"{name:<36} {best / args.number * 1e9:8.0f} ns/object")
+
+
+if __name__ == "__main__":
+    main()
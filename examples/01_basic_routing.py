@@ -1,9 +1,9 @@
 import asyncio
 import os
 from dotenv import load_dotenv
-from powertools.core.llm_router.router import LLMRouter
-from powertools.integrations.llm.ollama import OllamaProvider
-from powertools.integrations.llm.openai import OpenAIProvider
+from powertools.router.llm_router import LLMRouter
+from powertools.meta.integrations.llm.ollama import OllamaProvider
+from powertools.meta.integrations.llm.openai import OpenAIProvider
 
 load_dotenv()
 
@@ -23,7 +23,12 @@ async def main():
         local_model="mistral:7b",
         cloud_model="gpt-3.5-turbo"
     )
-    
+
+    # 4. Open pooled connections; leaving the block closes them
+    async with router:
+        await run_tasks(router)
+
+async def run_tasks(router: LLMRouter):
     print("--- Task 1: Low Complexity (should route to Local) ---")
     try:
         response = await router.route(
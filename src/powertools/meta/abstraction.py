@@ -2,6 +2,8 @@ from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional, Union
 from pydantic import BaseModel
 
+from ..utils.token_counter import default_token_counter
+
 class LLMResponse(BaseModel):
     """Standardized response format for all PowerTools."""
     content: str
@@ -39,7 +41,10 @@ class BaseProvider(ABC):
         """Standard text completion/generation method."""
         pass
         
-    @abstractmethod
     def get_token_count(self, text: str, model: str) -> int:
-        """Standardized token counting for cost tracking."""
-        pass
+        """Standardized token counting for cost tracking.
+
+        Uses the shared token counter: exact for models ``tiktoken`` knows,
+        a calibrated estimate otherwise. Override for provider-native counting.
+        """
+        return default_token_counter().count(text, model)
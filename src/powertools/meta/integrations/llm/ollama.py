@@ -1,58 +1,144 @@
-import httpx
-from typing import List, Dict, Any
-from ...core.llm_router.base import LLMProvider
-from ...core.llm_router.models import LLMResponse, ProviderType
+from typing import AsyncIterator, List, Dict, Any, Optional
+from ....router.llm_router.base import LLMProvider
+from ....router.llm_router.models import LLMResponse, ProviderType, StreamChunk
+from ....router.llm_router.streaming import iter_ndjson
+from ....utils.http_pool import HTTPClientPool
 
 class OllamaProvider(LLMProvider):
-    def __init__(self, base_url: str = "http://localhost:11434"):
+    def __init__(
+        self,
+        base_url: str = "http://localhost:11434",
+        *,
+        http_pool: Optional[HTTPClientPool] = None,
+        provider_id: str = "ollama",
+    ):
         self.base_url = base_url
+        self._provider_id = provider_id
         self._supported_models = []
+        self._http_pool = http_pool or HTTPClientPool()
+        self._owns_pool = http_pool is None
 
     @property
     def provider_id(self) -> str:
-        return "ollama"
+        return self._provider_id
 
     @property
     def provider_type(self) -> ProviderType:
         return ProviderType.LOCAL
 
     async def generate(self, prompt: str, model: str, **kwargs) -> LLMResponse:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                f"{self.base_url}/api/generate",
-                json={
-                    "model": model,
-                    "prompt": prompt,
-                    "stream": False,
-                    **kwargs
-                }
-            )
+        client = self._http_pool.client(self.base_url)
+        response = await client.post(
+            f"{self.base_url}/api/generate",
+            json={
+                "model": model,
+                "prompt": prompt,
+                "stream": False,
+                **kwargs
+            }
+        )
+        response.raise_for_status()
+        data = response.json()
+
+        return LLMResponse(
+            content=data["response"],
+            model=model,
+            provider=self.provider_id,
+            provider_type=self.provider_type,
+            usage=self._usage(data)
+        )
+
+    async def generate_stream(self, prompt: str, model: str, **kwargs) -> AsyncIterator[StreamChunk]:
+        client = self._http_pool.client(self.base_url)
+        async with client.stream(
+            "POST",
+            f"{self.base_url}/api/generate",
+            json={
+                "model": model,
+                "prompt": prompt,
+                "stream": True,
+                **kwargs
+            }
+        ) as response:
             response.raise_for_status()
-            data = response.json()
-            
-            return LLMResponse(
-                content=data["response"],
-                model=model,
-                provider=self.provider_id,
-                provider_type=self.provider_type,
-                usage={
-                    "prompt_tokens": data.get("prompt_eval_count", 0),
-                    "completion_tokens": data.get("eval_count", 0),
-                    "total_tokens": data.get("prompt_eval_count", 0) + data.get("eval_count", 0)
-                }
-            )
+            async for data in iter_ndjson(response.aiter_lines()):
+                if data.get("done"):
+                    yield StreamChunk(
+                        content=data.get("response", ""),
+                        done=True,
+                        usage=self._usage(data),
+                    )
+                    return
+                yield StreamChunk(content=data.get("response", ""))
+
+    @staticmethod
+    def _usage(data: Dict[str, Any]) -> Dict[str, int]:
+        return {
+            "prompt_tokens": data.get("prompt_eval_count", 0),
+            "completion_tokens": data.get("eval_count", 0),
+            "total_tokens": data.get("prompt_eval_count", 0) + data.get("eval_count", 0)
+        }
 
     async def is_healthy(self) -> bool:
         try:
-            async with httpx.AsyncClient(timeout=2.0) as client:
-                response = await client.get(f"{self.base_url}/api/tags")
-                if response.status_code == 200:
-                    data = response.json()
-                    self._supported_models = [m["name"] for m in data.get("models", [])]
-                    return True
-                return False
+            client = self._http_pool.client(self.base_url)
+            response = await client.get(f"{self.base_url}/api/tags", timeout=2.0)
+            if response.status_code == 200:
+                data = response.json()
+                self._supported_models = [m["name"] for m in data.get("models", [])]
+                return True
+            return False
         except Exception:
             return False
 
     def get_supported_models(self) -> List[str]:
         return self._supported_models
+
+    async def get_loaded_models(self) -> Optional[List[str]]:
+        try:
+            client = self._http_pool.client(self.base_url)
+            response = await client.get(f"{self.base_url}/api/ps", timeout=2.0)
+            response.raise_for_status()
+            return [m["name"] for m in response.json().get("models", [])]
+        except Exception:
+            return None
+
+    async def open(self) -> None:
+        self._http_pool.client(self.base_url)
+
+    async def aclose(self) -> None:
+        if self._owns_pool:
+            await self._http_pool.aclose()
+
+
+class OllamaEmbedder:
+    """Async embedding callable backed by a local Ollama ``/api/embed`` endpoint.
+
+    Suitable as the *embedder* of a
+    :class:`~powertools.router.llm_router.semantic_cache.SemanticCache`.
+    """
+
+    def __init__(
+        self,
+        model: str = "nomic-embed-text",
+        base_url: str = "http://localhost:11434",
+        *,
+        http_pool: Optional[HTTPClientPool] = None,
+    ):
+        self.model = model
+        self.base_url = base_url
+        self._http_pool = http_pool or HTTPClientPool()
+        self._owns_pool = http_pool is None
+
+    async def __call__(self, texts: List[str]) -> List[List[float]]:
+        client = self._http_pool.client(self.base_url)
+        response = await client.post(
+            f"{self.base_url}/api/embed",
+            json={"model": self.model, "input": texts},
+        )
+        response.raise_for_status()
+        return response.json()["embeddings"]
+
+    async def aclose(self) -> None:
+        if self._owns_pool:
+            await self._http_pool.aclose()
@@ -1,14 +1,22 @@
-import httpx
 import os
-from typing import List, Dict, Any, Optional
-from ...core.llm_router.base import LLMProvider
-from ...core.llm_router.models import LLMResponse, ProviderType
+from typing import AsyncIterator, List, Dict, Any, Optional
+from ....router.llm_router.base import LLMProvider
+from ....router.llm_router.models import LLMResponse, ProviderType, StreamChunk
+from ....router.llm_router.streaming import iter_sse_data
+from ....utils.http_pool import HTTPClientPool
 
 class OpenAIProvider(LLMProvider):
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        *,
+        http_pool: Optional[HTTPClientPool] = None,
+    ):
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         self.base_url = "https://api.openai.com/v1"
         self._models = ["gpt-4", "gpt-4-turbo", "gpt-3.5-turbo", "gpt-4o"]
+        self._http_pool = http_pool or HTTPClientPool()
+        self._owns_pool = http_pool is None
 
     @property
     def provider_id(self) -> str:
@@ -22,33 +30,67 @@ class OpenAIProvider(LLMProvider):
         if not self.api_key:
             raise ValueError("OpenAI API key not provided.")
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                f"{self.base_url}/chat/completions",
-                headers={"Authorization": f"Bearer {self.api_key}"},
-                json={
-                    "model": model,
-                    "messages": [{"role": "user", "content": prompt}],
-                    **kwargs
-                }
-            )
+        client = self._http_pool.client(self.base_url)
+        response = await client.post(
+            f"{self.base_url}/chat/completions",
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            json={
+                "model": model,
+                "messages": [{"role": "user", "content": prompt}],
+                **kwargs
+            }
+        )
+        response.raise_for_status()
+        data = response.json()
+
+        choice = data["choices"][0]
+        usage = data.get("usage", {})
+
+        return LLMResponse(
+            content=choice["message"]["content"],
+            model=model,
+            provider=self.provider_id,
+            provider_type=self.provider_type,
+            usage=self._usage(usage)
+        )
+
+    async def generate_stream(self, prompt: str, model: str, **kwargs) -> AsyncIterator[StreamChunk]:
+        if not self.api_key:
+            raise ValueError("OpenAI API key not provided.")
+
+        client = self._http_pool.client(self.base_url)
+        usage: Dict[str, Any] = {}
+        async with client.stream(
+            "POST",
+            f"{self.base_url}/chat/completions",
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            json={
+                "model": model,
+                "messages": [{"role": "user", "content": prompt}],
+                "stream": True,
+                "stream_options": {"include_usage": True},
+                **kwargs
+            }
+        ) as response:
             response.raise_for_status()
-            data = response.json()
-            
-            choice = data["choices"][0]
-            usage = data.get("usage", {})
-            
-            return LLMResponse(
-                content=choice["message"]["content"],
-                model=model,
-                provider=self.provider_id,
-                provider_type=self.provider_type,
-                usage={
-                    "prompt_tokens": usage.get("prompt_tokens", 0),
-                    "completion_tokens": usage.get("completion_tokens", 0),
-                    "total_tokens": usage.get("total_tokens", 0)
-                }
-            )
+            async for data in iter_sse_data(response.aiter_lines()):
+                choices = data.get("choices") or []
+                if choices:
+                    content = (choices[0].get("delta") or {}).get("content")
+                    if content:
+                        yield StreamChunk(content=content)
+                if data.get("usage"):
+                    usage = data["usage"]
+
+        yield StreamChunk(content="", done=True, usage=self._usage(usage))
+
+    @staticmethod
+    def _usage(usage: Dict[str, Any]) -> Dict[str, int]:
+        return {
+            "prompt_tokens": usage.get("prompt_tokens", 0),
+            "completion_tokens": usage.get("completion_tokens", 0),
+            "total_tokens": usage.get("total_tokens", 0)
+        }
 
     async def is_healthy(self) -> bool:
         # For cloud providers, 'healthy' usually means API key is present
@@ -57,3 +99,10 @@ class OpenAIProvider(LLMProvider):
 
     def get_supported_models(self) -> List[str]:
         return self._models
+
+    async def open(self) -> None:
+        self._http_pool.client(self.base_url)
+
+    async def aclose(self) -> None:
+        if self._owns_pool:
+            await self._http_pool.aclose()
@@ -10,6 +10,7 @@ from .models import (
 from .discover import discover_models
 from .benchmark import benchmark_model, benchmark_models, DEFAULT_PROMPTS
 from .tier import tier_model, tier_models
+from .complexity import ComplexityEstimator, extract_features, FEATURE_NAMES
 from .registry import ModelRegistry, DEFAULT_ROUTING_PROFILES
 
 __all__ = [
@@ -30,6 +31,10 @@ __all__ = [
     # Tiering
     "tier_model",
     "tier_models",
+    # Complexity estimation
+    "ComplexityEstimator",
+    "extract_features",
+    "FEATURE_NAMES",
     # Registry
     "ModelRegistry",
     "DEFAULT_ROUTING_PROFILES",
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import re
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+FEATURE_NAMES: List[str] = [
+    "log_chars",
+    "lines",
+    "code",
+    "questions",
+    "reasoning_terms",
+    "simple_terms",
+    "constraints",
+    "avg_word_length",
+]
+
+_CODE_MARKERS = ("```", "def ", "class ", "function ", "import ", "return ", "=>", "};", "();")
+_REASONING_TERMS = re.compile(
+    r"\b(architect\w*|design\w*|prove|proof|optimi[sz]\w*|analy[sz]\w*|refactor\w*|debug\w*|"
+    r"trade-?offs?|step[- ]by[- ]step|why|concurren\w*|algorithm\w*|scal\w*|migrat\w*|"
+    r"security|threat|edge cases?|complexity|derive|compare|evaluate)\b",
+    re.IGNORECASE,
+)
+_SIMPLE_TERMS = re.compile(
+    r"\b(hi|hello|thanks|summari[sz]e|summary|translate|list|extract|classify|"
+    r"rephrase|spell\w*|tl;?dr|define|what is)\b",
+    re.IGNORECASE,
+)
+_CONSTRAINTS = re.compile(
+    r"\b(must|should|ensure|never|always|require[sd]?)\b|^\s*(?:\d+[.)]|[-*])\s",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+# Only this many leading characters are scanned for the lexical features, so
+# scoring stays cheap for long agent prompts; log_chars uses the full length.
+MAX_SCANNED_CHARS = 2048
+
+# Hand-set starting point: short chit-chat scores ~0.1, long design or
+# debugging prompts with code score ~0.7+. Refine with ComplexityEstimator.fit().
+DEFAULT_WEIGHTS: List[float] = [0.45, 0.15, 1.2, 0.2, 0.9, -0.9, 0.25, 0.1]
+DEFAULT_BIAS = -4.0
+
+
+def extract_features(prompt: str) -> List[float]:
+    """Cheap lexical features of *prompt*, in :data:`FEATURE_NAMES` order.
+
+    Counts are log-scaled so a very long prompt cannot dominate the score.
+    Apart from ``log_chars``, which uses the full length, features are taken
+    from the first :data:`MAX_SCANNED_CHARS` characters, so the cost is
+    bounded whatever the prompt length.
+
+    Args:
+        prompt: The prompt text.
+
+    Returns:
+        List of floats, one per feature name.
+    """
+    length = len(prompt)
+    prompt = prompt[:MAX_SCANNED_CHARS]
+    words = prompt.split()
+    code_hits = sum(prompt.count(marker) for marker in _CODE_MARKERS)
+    return [
+        math.log1p(length),
+        math.log1p(prompt.count("\n")),
+        math.log1p(code_hits),
+        math.log1p(prompt.count("?")),
+        math.log1p(len(_REASONING_TERMS.findall(prompt))),
+        math.log1p(len(_SIMPLE_TERMS.findall(prompt))),
+        math.log1p(len(_CONSTRAINTS.findall(prompt))),
+        (sum(len(w) for w in words) / len(words)) if words else 0.0,
+    ]
+
+
+def _sigmoid(z: float) -> float:
+    if z < -30:
+        return 0.0
+    if z > 30:
+        return 1.0
+    return 1.0 / (1.0 + math.exp(-z))
+
+
+class ComplexityEstimator:
+    """Logistic-regression complexity score in ``[0, 1]`` from lexical features.
+
+    Scoring costs a few regex passes over at most the first
+    :data:`MAX_SCANNED_CHARS` characters of the prompt (well under a
+    millisecond) and results are memoised by prompt hash. The model
+    is a weight per feature plus a bias; train it on labelled prompts with
+    :meth:`fit` and persist it with the :class:`ModelRegistry` JSON.
+
+    Usage::
+
+        estimator = ComplexityEstimator()
+        estimator.fit([("hi there", 0.0), ("Design a sharded queue ...", 0.9)])
+        estimator.score("Refactor this parser for speed")
+    """
+
+    def __init__(
+        self,
+        weights: Optional[Sequence[float]] = None,
+        bias: float = DEFAULT_BIAS,
+        cache_size: int = 4096,
+    ) -> None:
+        weights = list(DEFAULT_WEIGHTS if weights is None else weights)
+        if len(weights) != len(FEATURE_NAMES):
+            raise ValueError(f"Expected {len(FEATURE_NAMES)} weights, got {len(weights)}")
+        self.weights = weights
+        self.bias = bias
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[bytes, float]" = OrderedDict()
+
+    def score(self, prompt: str) -> float:
+        """Return the estimated complexity of *prompt* in ``[0, 1]``."""
+        digest = hashlib.blake2b(prompt.encode("utf-8"), digest_size=16).digest()
+        cached = self._cache.get(digest)
+        if cached is not None:
+            self._cache.move_to_end(digest)
+            return cached
+        value = self._predict(extract_features(prompt))
+        self._cache[digest] = value
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return value
+
+    def _predict(self, features: Sequence[float]) -> float:
+        return _sigmoid(self.bias + sum(w * x for w, x in zip(self.weights, features)))
+
+    def fit(
+        self,
+        samples: Sequence[Tuple[str, float]],
+        epochs: int = 200,
+        learning_rate: float = 0.05,
+        l2: float = 1e-3,
+    ) -> float:
+        """Train on ``(prompt, complexity)`` pairs with gradient descent on log loss.
+
+        Starts from the current weights, so repeated calls refine the model.
+        Clears the score cache.
+
+        Args:
+            samples: Prompts labelled with a target complexity in ``[0, 1]``.
+            epochs: Passes over the samples.
+            learning_rate: Step size.
+            l2: L2 regularisation strength on the weights.
+
+        Returns:
+            Mean log loss after the final epoch.
+        """
+        if not samples:
+            raise ValueError("fit() needs at least one sample")
+        data = [(extract_features(prompt), min(max(target, 0.0), 1.0)) for prompt, target in samples]
+        n = len(data)
+        loss = 0.0
+        for _ in range(epochs):
+            grad_w = [0.0] * len(self.weights)
+            grad_b = 0.0
+            loss = 0.0
+            for features, target in data:
+                predicted = self._predict(features)
+                error = predicted - target
+                for i, x in enumerate(features):
+                    grad_w[i] += error * x
+                grad_b += error
+                p = min(max(predicted, 1e-9), 1 - 1e-9)
+                loss -= target * math.log(p) + (1 - target) * math.log(1 - p)
+            for i in range(len(self.weights)):
+                self.weights[i] -= learning_rate * (grad_w[i] / n + l2 * self.weights[i])
+            self.bias -= learning_rate * grad_b / n
+        self._cache.clear()
+        return loss / n
+
+    def to_dict(self) -> Dict[str, object]:
+        return {"features": list(FEATURE_NAMES), "weights": list(self.weights), "bias": self.bias}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> "ComplexityEstimator":
+        """Rebuild an estimator saved by :meth:`to_dict`.
+
+        Raises:
+            ValueError: If the saved feature set differs from this version's.
+        """
+        if list(data.get("features", FEATURE_NAMES)) != FEATURE_NAMES:
+            raise ValueError("Saved complexity model uses a different feature set")
+        return cls(weights=data["weights"], bias=float(data["bias"]))
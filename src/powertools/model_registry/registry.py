@@ -5,6 +5,7 @@ from pathlib import Path
 from typing import Dict, List, Optional
 
 from .benchmark import ModelCallable, benchmark_models
+from .complexity import ComplexityEstimator
 from .discover import discover_models
 from .models import (
     ModelAccreditation,
@@ -49,6 +50,10 @@ DEFAULT_ROUTING_PROFILES: List[RoutingProfile] = [
 ]
 
 
+# Lower rank = stronger tier
+_TIER_RANK: Dict[ModelTier, int] = {ModelTier.S: 0, ModelTier.A: 1, ModelTier.B: 2, ModelTier.C: 3}
+
+
 class ModelRegistry:
     """Central registry for discovered, benchmarked and tiered AI models.
 
@@ -61,12 +66,18 @@ class ModelRegistry:
 
     Once populated, use :meth:`get_models_for_task` to look up the best models
     for a given task type according to the routing profiles.
+
+    The registry also carries the :class:`ComplexityEstimator` the router
+    uses when no complexity is given; train it with
+    ``registry.complexity_estimator.fit(...)`` and it is saved with the rest
+    of the registry.
     """
 
     def __init__(self) -> None:
         self._entries: List[ModelEntry] = []
         self._accreditations: Dict[str, ModelAccreditation] = {}
         self._routing_profiles: List[RoutingProfile] = list(DEFAULT_ROUTING_PROFILES)
+        self.complexity_estimator = ComplexityEstimator()
 
     # ------------------------------------------------------------------
     # Discovery
@@ -168,6 +179,53 @@ class ModelRegistry:
 
         return []
 
+    def get_fallback_models(self, task_type: str) -> List[ModelAccreditation]:
+        """Return the preferred-tier models followed by the fallback-tier models.
+
+        Unlike :meth:`get_models_for_task`, the fallback tier is included even
+        when preferred-tier models exist, so callers retrying after a failure
+        can step down (or up) a tier. Task types without a routing profile
+        return all accreditations, strongest tier first.
+
+        Args:
+            task_type: A task type string matching a :class:`RoutingProfile`.
+
+        Returns:
+            Ordered list of :class:`ModelAccreditation` objects.
+        """
+        profile = next(
+            (p for p in self._routing_profiles if p.task_type == task_type), None
+        )
+        if profile is None:
+            return sorted(self._accreditations.values(), key=lambda a: _TIER_RANK[a.tier])
+        tiers = [profile.preferred_tier]
+        if profile.fallback_tier is not None and profile.fallback_tier != profile.preferred_tier:
+            tiers.append(profile.fallback_tier)
+        return [a for tier in tiers for a in self._accreditations.values() if a.tier == tier]
+
+    def get_models_meeting_floor(self, task_type: str) -> List[ModelAccreditation]:
+        """Return every accredited model at or above the task's preferred tier.
+
+        Unlike :meth:`get_models_for_task`, stronger tiers are included too,
+        which lets cost-aware callers pick the cheapest model that still meets
+        the quality floor. Ordered strongest tier first. Task types without a
+        routing profile have no floor, so all accreditations are returned.
+
+        Args:
+            task_type: A task type string matching a :class:`RoutingProfile`.
+
+        Returns:
+            List of :class:`ModelAccreditation` objects.
+        """
+        profile = next(
+            (p for p in self._routing_profiles if p.task_type == task_type), None
+        )
+        floor = _TIER_RANK[profile.preferred_tier] if profile else _TIER_RANK[ModelTier.C]
+        return sorted(
+            (a for a in self._accreditations.values() if _TIER_RANK[a.tier] <= floor),
+            key=lambda a: _TIER_RANK[a.tier],
+        )
+
     # ------------------------------------------------------------------
     # Persistence
     # ------------------------------------------------------------------
@@ -180,6 +238,7 @@ class ModelRegistry:
                 k: v.model_dump() for k, v in self._accreditations.items()
             },
             "routing_profiles": [p.model_dump() for p in self._routing_profiles],
+            "complexity_model": self.complexity_estimator.to_dict(),
         }
 
     def save(self, path: str) -> None:
@@ -211,4 +270,6 @@ class ModelRegistry:
             registry._routing_profiles = [
                 RoutingProfile(**p) for p in data["routing_profiles"]
             ]
+        if "complexity_model" in data:
+            registry.complexity_estimator = ComplexityEstimator.from_dict(data["complexity_model"])
         return registry
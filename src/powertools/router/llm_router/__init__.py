@@ -1,14 +1,97 @@
 from .router import LLMRouter
-from .models import LLMResponse, ProviderType, RoutingDecision
+from .models import LLMResponse, ProviderType, RoutingDecision, RoutingObjective, StreamChunk
 from .base import LLMProvider
-from .token_cost_tracker import TokenCostTracker, UsageRecord
+from .affinity import AffinityStats, PrefixAffinity
+from .aggregation import RemoteUsageRecorder, ShardedRecorder, UsageAggregator
+from .budget import BudgetAction, BudgetEnforcer, BudgetExceededError, BudgetRule, UsageWindows, Window
+from .cache import CacheStats, CacheStore, ResponseCache, SQLiteCacheStore
+from .circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerConfig,
+    CircuitBreakerRegistry,
+    CircuitOpenError,
+    CircuitState,
+    CircuitTransition,
+)
+from .concurrency import BatchResult, BatchTask, ConcurrencyLimiter
+from .fallback import Attempt, ErrorClass, FallbackPolicy, classify_error
+from .health import HealthMonitor, HealthState
+from .hedging import HedgingPolicy
+from .model_index import ModelIndex
+from .pool import BalancingStrategy, PoolEndpoint, ProviderPool
+from .rate_limit import RateLimit, RateLimiter, TokenBucket
+from .scheduling import Priority, PriorityScheduler, SchedulerConfig
+from .semantic_cache import SemanticCache, VectorIndex
+from .singleflight import SingleFlight
+from .stats import EndpointStats, ProviderStats
+from .streaming import LLMStream
+from .token_cost_tracker import TokenCostTracker, UsageLog, UsageRecord
+from ...utils.token_counter import TokenCounter, default_token_counter
+from .ledger import SegmentFileUsageLedger, SegmentRollup, SQLiteUsageLedger, SyncMode, UsageLedger
 
 __all__ = [
     "LLMRouter",
     "LLMResponse",
     "ProviderType",
     "RoutingDecision",
+    "RoutingObjective",
+    "StreamChunk",
+    "LLMStream",
     "LLMProvider",
+    "AffinityStats",
+    "PrefixAffinity",
+    "RemoteUsageRecorder",
+    "ShardedRecorder",
+    "UsageAggregator",
+    "BudgetAction",
+    "BudgetEnforcer",
+    "BudgetExceededError",
+    "BudgetRule",
+    "UsageWindows",
+    "Window",
+    "CacheStats",
+    "CacheStore",
+    "ResponseCache",
+    "SQLiteCacheStore",
+    "CircuitBreaker",
+    "CircuitBreakerConfig",
+    "CircuitBreakerRegistry",
+    "CircuitOpenError",
+    "CircuitState",
+    "CircuitTransition",
+    "BatchResult",
+    "BatchTask",
+    "ConcurrencyLimiter",
+    "Attempt",
+    "ErrorClass",
+    "FallbackPolicy",
+    "classify_error",
+    "HealthMonitor",
+    "HealthState",
+    "HedgingPolicy",
+    "ModelIndex",
+    "BalancingStrategy",
+    "PoolEndpoint",
+    "ProviderPool",
+    "RateLimit",
+    "RateLimiter",
+    "TokenBucket",
+    "Priority",
+    "PriorityScheduler",
+    "SchedulerConfig",
+    "SemanticCache",
+    "VectorIndex",
+    "SingleFlight",
+    "EndpointStats",
+    "ProviderStats",
     "TokenCostTracker",
     "UsageRecord",
+    "UsageLog",
+    "TokenCounter",
+    "default_token_counter",
+    "UsageLedger",
+    "SQLiteUsageLedger",
+    "SegmentFileUsageLedger",
+    "SegmentRollup",
+    "SyncMode",
 ]
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterable, Optional, TypeVar
+
+from .cache import normalize_prompt
+
+T = TypeVar("T")
+
+
+def rendezvous_score(key: str, instance: str) -> int:
+    """Highest-random-weight score of *instance* for *key*."""
+    digest = hashlib.blake2b(f"{key}\x00{instance}".encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def rendezvous_pick(key: str, items: Iterable[T], instance_of=str) -> Optional[T]:
+    """Pick the item whose instance id scores highest for *key* (rendezvous hashing).
+
+    The same key keeps landing on the same instance while it is available;
+    when it is removed, only the keys it owned move, each to its own
+    second choice, so load spreads evenly over the survivors.
+    """
+    return max(items, key=lambda item: rendezvous_score(key, instance_of(item)), default=None)
+
+
+@dataclass
+class AffinityStats:
+    """``hits``: a key went to the same instance as last time; ``moves``: it did not."""
+
+    new_keys: int = 0
+    hits: int = 0
+    moves: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.moves
+        return self.hits / total if total else 0.0
+
+
+class PrefixAffinity:
+    """
+    Sticky routing keys for prompt-prefix KV-cache reuse.
+
+    A request's key is its session key when given, otherwise a hash of the
+    first ``prefix_chars`` characters of the normalised prompt, so agent
+    loops that resend a long shared system prompt share a key. The router
+    sends a key to the same instance via :func:`rendezvous_pick` and reports
+    where it actually landed through :meth:`record`; the last instance of up
+    to ``max_keys`` keys is remembered for :attr:`stats`.
+    """
+
+    def __init__(self, prefix_chars: int = 1024, max_keys: int = 100_000) -> None:
+        if prefix_chars < 1:
+            raise ValueError(f"prefix_chars must be >= 1, got {prefix_chars}")
+        self.prefix_chars = prefix_chars
+        self.max_keys = max_keys
+        self.stats = AffinityStats()
+        self._last: "OrderedDict[str, str]" = OrderedDict()
+
+    def key_for(self, prompt: str, session_key: Optional[str] = None) -> str:
+        if session_key is not None:
+            return f"session:{session_key}"
+        prefix = normalize_prompt(prompt)[: self.prefix_chars]
+        return "prefix:" + hashlib.blake2b(prefix.encode("utf-8"), digest_size=16).hexdigest()
+
+    def record(self, key: str, instance: str) -> None:
+        last = self._last.get(key)
+        if last is None:
+            self.stats.new_keys += 1
+        elif last == instance:
+            self.stats.hits += 1
+        else:
+            self.stats.moves += 1
+        self._last[key] = instance
+        self._last.move_to_end(key)
+        if len(self._last) > self.max_keys:
+            self._last.popitem(last=False)
+
+    def last_instance(self, key: str) -> Optional[str]:
+        return self._last.get(key)
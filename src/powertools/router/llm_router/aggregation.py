@@ -0,0 +1,330 @@
+from __future__ import annotations
+
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from .token_cost_tracker import TokenCostTracker, UsageRow
+
+# A Unix socket path, or a (host, port) pair for TCP on localhost.
+Address = Union[str, Tuple[str, int]]
+
+
+class _Shard:
+    __slots__ = ("lock", "rows")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.rows: List[UsageRow] = []
+
+
+class ShardedRecorder:
+    """
+    Front end for a :class:`TokenCostTracker` shared by many threads.
+
+    Each thread appends to its own shard under that shard's (almost always
+    uncontended) lock; a shard is applied to the tracker with one
+    :meth:`TokenCostTracker.record_batch` call once it holds ``batch_size``
+    rows, so the tracker's lock is taken once per batch rather than per
+    call. A shard's lock is held until its batch is in the tracker, so
+    reads through the recorder, which :meth:`flush` every shard first, are
+    exact. Asyncio tasks on one loop share that thread's shard.
+    """
+
+    def __init__(
+        self,
+        tracker: TokenCostTracker,
+        batch_size: int = 256,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be >= 1, got {batch_size}")
+        self.tracker = tracker
+        self.batch_size = batch_size
+        self._clock = clock
+        self._local = threading.local()
+        self._shards: List[_Shard] = []
+        self._shards_lock = threading.Lock()
+
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = _Shard()
+            with self._shards_lock:
+                self._shards.append(shard)
+        return shard
+
+    def record_usage(
+        self,
+        *,
+        model: str,
+        input_tokens: int,
+        output_tokens: int,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        if not self.tracker.has_pricing(model):
+            raise ValueError(f"No pricing registered for model: {model}")
+        shard = self._shard()
+        with shard.lock:
+            shard.rows.append((model, input_tokens, output_tokens, metadata, self._clock()))
+            if len(shard.rows) >= self.batch_size:
+                self._apply(shard)
+
+    def flush(self) -> None:
+        """Apply every shard's pending rows to the tracker."""
+        with self._shards_lock:
+            shards = list(self._shards)
+        for shard in shards:
+            with shard.lock:
+                if shard.rows:
+                    self._apply(shard)
+
+    def _apply(self, shard: _Shard) -> None:
+        # Called with shard.lock held, so no flush() can pass this shard
+        # while its rows are on their way into the tracker.
+        rows, shard.rows = shard.rows, []
+        self.tracker.record_batch(rows)
+
+    @property
+    def pending(self) -> int:
+        with self._shards_lock:
+            return sum(len(shard.rows) for shard in self._shards)
+
+    @property
+    def total_cost(self) -> float:
+        self.flush()
+        return self.tracker.total_cost
+
+    @property
+    def total_tokens(self) -> int:
+        self.flush()
+        return self.tracker.total_tokens
+
+    @property
+    def call_count(self) -> int:
+        self.flush()
+        return self.tracker.call_count
+
+    def summarize_by_model(self) -> Dict[str, Dict[str, float]]:
+        self.flush()
+        return self.tracker.summarize_by_model()
+
+
+class _AggregatorHandler(socketserver.StreamRequestHandler):
+    server: "_UnixServer | _TCPServer"
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            try:
+                batch = json.loads(line)
+                reply = {"ok": self.server.aggregator._apply(batch["sender"], batch["seq"], batch["rows"])}
+            except Exception as e:
+                reply = {"error": f"{type(e).__name__}: {e}"}
+            self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 128  # a pool of workers connecting at once
+
+
+if hasattr(socket, "AF_UNIX"):
+    class _UnixServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+        request_queue_size = 128
+else:  # pragma: no cover - Windows
+    _UnixServer = None
+
+
+class UsageAggregator:
+    """
+    Collects usage from worker processes into one :class:`TokenCostTracker`.
+
+    Listens on a Unix socket path (or ``(host, port)``; port 0 picks a free
+    one, see :attr:`address`) and applies each batch sent by a
+    :class:`RemoteUsageRecorder` atomically with
+    :meth:`TokenCostTracker.record_batch` before acknowledging it, so an
+    acknowledged row is counted exactly once. Cost is computed here from
+    the tracker's pricing. Every batch carries its sender's id and a
+    sequence number; a batch resent after a lost acknowledgement is
+    acknowledged again but not re-applied. Runs on background threads; no
+    event loop needed.
+
+    Usage::
+
+        aggregator = UsageAggregator(tracker, "/tmp/usage.sock").start()
+        # in each worker process:
+        recorder = RemoteUsageRecorder("/tmp/usage.sock")
+        recorder.record_usage(model="gpt-4o", input_tokens=120, output_tokens=40)
+        recorder.close()
+    """
+
+    def __init__(self, tracker: TokenCostTracker, address: Address) -> None:
+        self.tracker = tracker
+        if isinstance(address, str):
+            if _UnixServer is None:  # pragma: no cover - Windows
+                raise ValueError("Unix sockets are not available; pass a (host, port) address")
+            if os.path.exists(address):
+                os.unlink(address)
+            self._server = _UnixServer(address, _AggregatorHandler)
+        else:
+            self._server = _TCPServer(address, _AggregatorHandler)
+        self._server.aggregator = self
+        self._applied: Dict[str, int] = {}  # sender id -> last applied sequence number
+        self._applied_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def _apply(self, sender: str, seq: int, rows: List[Any]) -> int:
+        with self._applied_lock:
+            if seq <= self._applied.get(sender, 0):
+                return len(rows)  # duplicate of an applied batch
+            count = self.tracker.record_batch([tuple(row) for row in rows])
+            self._applied[sender] = seq
+            return count
+
+    @property
+    def address(self) -> Address:
+        return self._server.server_address
+
+    def start(self) -> "UsageAggregator":
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._server.serve_forever, name="usage-aggregator", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def close(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+
+    def __enter__(self) -> "UsageAggregator":
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class RemoteUsageRecorder:
+    """
+    Worker-process side of :class:`UsageAggregator`.
+
+    Rows are buffered and sent in batches of ``batch_size``; each send waits
+    for the aggregator's acknowledgement, so once :meth:`flush` or
+    :meth:`close` returns every row has been counted. A batch whose send
+    fails with :class:`OSError` is kept and resent unchanged under the same
+    sequence number, so it is counted once even if the first copy arrived.
+    A batch the aggregator rejects (e.g. a model without pricing) raises
+    :class:`ValueError` and is dropped. Safe to share between threads;
+    pickles as its address, so it can be handed to ``ProcessPoolExecutor``
+    workers (each unpickled copy is a new sender).
+    """
+
+    def __init__(
+        self,
+        address: Address,
+        batch_size: int = 256,
+        timeout: float = 10.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.address = address if isinstance(address, str) else tuple(address)
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._rows: List[UsageRow] = []
+        self._sender = uuid.uuid4().hex
+        self._seq = 0
+        self._in_flight: Optional[bytes] = None  # encoded batch awaiting acknowledgement
+        self._sock: Optional[socket.socket] = None
+        self._reader: Any = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"address": self.address, "batch_size": self.batch_size, "timeout": self.timeout}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(state["address"], state["batch_size"], state["timeout"])
+
+    def record_usage(
+        self,
+        *,
+        model: str,
+        input_tokens: int,
+        output_tokens: int,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        with self._lock:
+            self._rows.append((model, input_tokens, output_tokens, metadata, self._clock()))
+            if len(self._rows) >= self.batch_size:
+                self._send()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._send()
+
+    def _send(self) -> None:
+        while self._in_flight is not None or self._rows:
+            if self._in_flight is None:
+                self._seq += 1
+                batch = {"sender": self._sender, "seq": self._seq, "rows": self._rows}
+                self._in_flight = json.dumps(batch, separators=(",", ":")).encode("utf-8") + b"\n"
+                self._rows = []
+            self._send_in_flight()
+
+    def _send_in_flight(self) -> None:
+        payload = self._in_flight
+        try:
+            if self._sock is None:
+                family = socket.AF_UNIX if isinstance(self.address, str) else socket.AF_INET
+                self._sock = socket.socket(family, socket.SOCK_STREAM)
+                # Connect blocking: with a timeout set, a full Unix-socket
+                # backlog fails immediately with EAGAIN instead of waiting.
+                self._sock.connect(self.address)
+                self._sock.settimeout(self.timeout)
+                self._reader = self._sock.makefile("rb")
+            self._sock.sendall(payload)
+            line = self._reader.readline()
+            if not line:
+                raise ConnectionError("Usage aggregator closed the connection")
+        except OSError:
+            # Keep the batch for the next attempt; the aggregator drops it if
+            # the first copy was applied before the connection failed.
+            self._disconnect()
+            raise
+        self._in_flight = None
+        reply = json.loads(line)
+        if "error" in reply:
+            raise ValueError(f"Usage aggregator rejected batch: {reply['error']}")
+
+    def _disconnect(self) -> None:
+        if self._reader is not None:
+            self._reader.close()
+        if self._sock is not None:
+            self._sock.close()
+        self._sock = None
+        self._reader = None
+
+    def close(self) -> None:
+        with self._lock:
+            try:
+                self._send()
+            finally:
+                self._disconnect()
+
+    def __enter__(self) -> "RemoteUsageRecorder":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
@@ -1,8 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
-from .models import LLMResponse, ProviderType
+from typing import AsyncIterator, List, Optional, Dict, Any
+from .models import LLMResponse, ProviderType, StreamChunk
 
 class LLMProvider(ABC):
+    # True if generate()/generate_stream() accept an ``affinity_key`` kwarg
+    # and use it to pick a consistent backend instance.
+    supports_affinity: bool = False
+
     @property
     @abstractmethod
     def provider_id(self) -> str:
@@ -25,6 +29,20 @@ class LLMProvider(ABC):
         """Generate a response from the LLM."""
         pass
 
+    async def generate_stream(
+        self,
+        prompt: str,
+        model: str,
+        **kwargs
+    ) -> AsyncIterator[StreamChunk]:
+        """Stream the response as chunks, ending with a ``done`` chunk carrying usage.
+
+        Providers without native streaming inherit this fallback, which yields
+        the whole :meth:`generate` result as a single final chunk.
+        """
+        response = await self.generate(prompt, model, **kwargs)
+        yield StreamChunk(content=response.content, done=True, usage=response.usage)
+
     @abstractmethod
     async def is_healthy(self) -> bool:
         """Check if the provider is currently available."""
@@ -34,3 +52,15 @@ class LLMProvider(ABC):
     def get_supported_models(self) -> List[str]:
         """List models supported by this provider."""
         pass
+
+    async def get_loaded_models(self) -> Optional[List[str]]:
+        """Models currently held in memory, or ``None`` if the provider cannot tell. Optional."""
+        return None
+
+    async def open(self) -> None:
+        """Acquire long-lived resources (e.g. pooled HTTP clients). Optional."""
+        pass
+
+    async def aclose(self) -> None:
+        """Release resources acquired by :meth:`open` or lazily during calls. Optional."""
+        pass
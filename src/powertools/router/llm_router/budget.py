@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .token_cost_tracker import UsageRecord
+
+# (scope, name): ("global", ""), ("model", "gpt-4o") or ("tag", "team=search").
+ScopeKey = Tuple[str, str]
+GLOBAL: ScopeKey = ("global", "")
+
+
+class Window(str, Enum):
+    """Sliding windows kept by :class:`UsageWindows`, with their bucket layout."""
+
+    MINUTE = "minute"
+    HOUR = "hour"
+    DAY = "day"
+
+    @property
+    def bucket_seconds(self) -> float:
+        return {Window.MINUTE: 1.0, Window.HOUR: 60.0, Window.DAY: 3600.0}[self]
+
+    @property
+    def buckets(self) -> int:
+        return {Window.MINUTE: 60, Window.HOUR: 60, Window.DAY: 24}[self]
+
+    @property
+    def seconds(self) -> float:
+        return self.bucket_seconds * self.buckets
+
+
+def tags_of(metadata: Mapping[str, object]) -> List[str]:
+    """``key=value`` tags for the string values in a record's metadata."""
+    return [f"{key}={value}" for key, value in metadata.items() if isinstance(value, str)]
+
+
+def scope_keys(model: str, tags: Iterable[str]) -> List[ScopeKey]:
+    return [GLOBAL, ("model", model), *(("tag", tag) for tag in tags)]
+
+
+class _RollingWindow:
+    """Ring of time buckets plus running totals per scope key over the whole ring."""
+
+    def __init__(self, bucket_seconds: float, buckets: int) -> None:
+        self.bucket_seconds = bucket_seconds
+        self.size = buckets
+        self._ring: List[Optional[Dict[ScopeKey, List[float]]]] = [None] * buckets
+        self._current: Optional[int] = None
+        self.totals: Dict[ScopeKey, List[float]] = {}
+
+    def advance(self, now: float) -> int:
+        """Move the window to *now*, dropping buckets that fell out; amortised O(1)."""
+        bucket = int(now // self.bucket_seconds)
+        if self._current is None:
+            self._current = bucket
+        elif bucket > self._current:
+            for stale in range(max(self._current + 1, bucket - self.size + 1), bucket + 1):
+                slot = stale % self.size
+                evicted = self._ring[slot]
+                if evicted is not None:
+                    self._ring[slot] = None
+                    for key, (cost, tokens, calls) in evicted.items():
+                        total = self.totals[key]
+                        total[2] -= calls
+                        if total[2] <= 0:
+                            del self.totals[key]  # also resets float drift
+                        else:
+                            total[0] -= cost
+                            total[1] -= tokens
+            self._current = bucket
+        return self._current
+
+    def add(
+        self,
+        timestamp: float,
+        keys: Iterable[ScopeKey],
+        cost: float,
+        tokens: float,
+        calls: int = 1,
+    ) -> None:
+        current = self.advance(timestamp)
+        bucket = int(timestamp // self.bucket_seconds)
+        if bucket <= current - self.size:
+            return  # older than the window
+        slot = bucket % self.size
+        cells = self._ring[slot]
+        if cells is None:
+            cells = self._ring[slot] = {}
+        for key in keys:
+            for target in (cells, self.totals):
+                row = target.get(key)
+                if row is None:
+                    row = target[key] = [0.0, 0.0, 0.0]
+                row[0] += cost
+                row[1] += tokens
+                row[2] += calls
+
+    def series(self, key: ScopeKey, now: float) -> List[Dict[str, float]]:
+        current = self.advance(now)
+        out = []
+        for bucket in range(current - self.size + 1, current + 1):
+            cells = self._ring[bucket % self.size] or {}
+            cost, tokens, calls = cells.get(key, (0.0, 0.0, 0.0))
+            out.append({"start": bucket * self.bucket_seconds, "cost": cost, "tokens": tokens, "calls": calls})
+        return out
+
+
+def _row(values: Optional[List[float]]) -> Dict[str, float]:
+    cost, tokens, calls = values or (0.0, 0.0, 0.0)
+    return {"calls": calls, "tokens": tokens, "cost": cost}
+
+
+class UsageWindows:
+    """
+    Sliding per-minute, per-hour and per-day usage totals.
+
+    Each :class:`Window` is a ring of time buckets (60 one-second buckets,
+    60 one-minute buckets, 24 one-hour buckets) with running totals kept per
+    scope: globally, per model and per ``key=value`` tag taken from the
+    string values of a record's metadata (the router tags every call with
+    ``provider=<id>``). Reading a total is O(1); expired buckets are
+    subtracted as the window slides, and :meth:`series` is O(buckets).
+    Totals have bucket granularity: the hour window covers the current
+    minute and the 59 before it. Safe to share between threads.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._windows = {window: _RollingWindow(window.bucket_seconds, window.buckets) for window in Window}
+
+    def record(self, record: UsageRecord) -> None:
+        keys = scope_keys(record.model, tags_of(record.metadata))
+        with self._lock:
+            for rolling in self._windows.values():
+                rolling.add(record.timestamp, keys, record.cost, record.total_tokens)
+
+    def record_many(self, records: Iterable[UsageRecord]) -> None:
+        """Record several rows, adding rows that share a second, model and tags as one."""
+        groups: Dict[Tuple[int, str, Tuple[str, ...]], List[float]] = {}
+        for record in records:
+            group_key = (int(record.timestamp), record.model, tuple(tags_of(record.metadata)))
+            group = groups.get(group_key)
+            if group is None:
+                group = groups[group_key] = [0.0, 0.0, 0, record.timestamp]
+            group[0] += record.cost
+            group[1] += record.total_tokens
+            group[2] += 1
+        with self._lock:
+            for (_, model, tags), (cost, tokens, calls, timestamp) in groups.items():
+                keys = scope_keys(model, tags)
+                for rolling in self._windows.values():
+                    rolling.add(timestamp, keys, cost, tokens, calls)
+
+    def total(self, window: Window, key: ScopeKey = GLOBAL) -> Dict[str, float]:
+        rolling = self._windows[Window(window)]
+        with self._lock:
+            rolling.advance(self._clock())
+            return _row(rolling.totals.get(key))
+
+    def usage(
+        self,
+        window: Window,
+        *,
+        model: Optional[str] = None,
+        tag: Optional[str] = None,
+    ) -> Dict[str, float]:
+        """``calls``, ``tokens`` and ``cost`` in *window* for a model, a tag, or globally."""
+        return self.total(window, _scope(model, tag))
+
+    def spend(self, window: Window, *, model: Optional[str] = None, tag: Optional[str] = None) -> float:
+        return self.usage(window, model=model, tag=tag)["cost"]
+
+    def breakdown(self, window: Window, scope: str = "model") -> Dict[str, Dict[str, float]]:
+        """Totals in *window* for every model (``scope="model"``) or tag (``scope="tag"``)."""
+        rolling = self._windows[Window(window)]
+        with self._lock:
+            rolling.advance(self._clock())
+            return {name: _row(values) for (kind, name), values in rolling.totals.items() if kind == scope}
+
+    def series(
+        self,
+        window: Window,
+        *,
+        model: Optional[str] = None,
+        tag: Optional[str] = None,
+    ) -> List[Dict[str, float]]:
+        """Per-bucket totals across *window*, oldest bucket first."""
+        rolling = self._windows[Window(window)]
+        with self._lock:
+            return rolling.series(_scope(model, tag), self._clock())
+
+
+def _scope(model: Optional[str], tag: Optional[str]) -> ScopeKey:
+    if model is not None and tag is not None:
+        raise ValueError("Pass either model or tag, not both")
+    if model is not None:
+        return ("model", model)
+    if tag is not None:
+        return ("tag", tag)
+    return GLOBAL
+
+
+class BudgetAction(str, Enum):
+    REFUSE = "refuse"
+    DOWNGRADE = "downgrade"
+
+
+@dataclass
+class BudgetRule:
+    """
+    A spend or token limit over a sliding :class:`Window`.
+
+    Applies to calls for ``model``, to calls tagged ``tag`` (``"key=value"``,
+    e.g. ``"provider=openai"`` or a tag passed to ``route(tags=...)``), or,
+    with neither, to all calls. Once the window's usage reaches a limit,
+    further requests in scope are refused with :class:`BudgetExceededError`
+    or, with ``DOWNGRADE``, re-routed to ``downgrade_to`` (default: the
+    router's local model).
+    """
+
+    window: Window = Window.DAY
+    max_cost: Optional[float] = None
+    max_tokens: Optional[int] = None
+    model: Optional[str] = None
+    tag: Optional[str] = None
+    action: BudgetAction = BudgetAction.REFUSE
+    downgrade_to: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        self.window = Window(self.window)
+        self.action = BudgetAction(self.action)
+        if self.max_cost is None and self.max_tokens is None:
+            raise ValueError("BudgetRule needs max_cost or max_tokens")
+        self.scope = _scope(self.model, self.tag)
+
+    def exceeded(self, usage: Dict[str, float]) -> bool:
+        return (self.max_cost is not None and usage["cost"] >= self.max_cost) or (
+            self.max_tokens is not None and usage["tokens"] >= self.max_tokens
+        )
+
+
+class BudgetExceededError(RuntimeError):
+    def __init__(self, rule: BudgetRule, usage: Dict[str, float]) -> None:
+        scope = "global" if rule.scope == GLOBAL else f"{rule.scope[0]} '{rule.scope[1]}'"
+        super().__init__(
+            f"Budget exceeded for {scope} over the last {rule.window.value}: "
+            f"cost {usage['cost']:.4f}, tokens {int(usage['tokens'])}"
+        )
+        self.rule = rule
+        self.usage = usage
+
+
+class BudgetEnforcer:
+    """Budget rules indexed by scope, checked against :class:`UsageWindows` before dispatch."""
+
+    def __init__(self, windows: UsageWindows, rules: Iterable[BudgetRule] = ()) -> None:
+        self.windows = windows
+        self._rules: Dict[ScopeKey, List[BudgetRule]] = {}
+        for rule in rules:
+            self.add_rule(rule)
+
+    def add_rule(self, rule: BudgetRule) -> None:
+        self._rules.setdefault(rule.scope, []).append(rule)
+
+    @property
+    def rules(self) -> List[BudgetRule]:
+        return [rule for rules in self._rules.values() for rule in rules]
+
+    def check(self, model: str, tags: Iterable[str] = ()) -> Optional[Tuple[BudgetRule, Dict[str, float]]]:
+        """Return the first exceeded rule that applies to a call, with its usage, or ``None``.
+
+        Costs O(1) per rule in scope: only rules for the global scope, *model*
+        and the call's *tags* are looked at, each reading a running total.
+        """
+        for key in scope_keys(model, tags):
+            for rule in self._rules.get(key, ()):
+                usage = self.windows.total(rule.window, key)
+                if rule.exceeded(usage):
+                    return rule, usage
+        return None
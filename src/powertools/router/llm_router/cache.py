@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .models import LLMResponse
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Normalise line endings and outer whitespace; inner whitespace is significant."""
+    return prompt.replace("\r\n", "\n").strip()
+
+
+def cache_key(prompt: str, model: str, provider_id: str, params: Dict[str, Any]) -> str:
+    """Stable key over the normalised prompt, target and generation kwargs."""
+    material = json.dumps(
+        [normalize_prompt(prompt), model, provider_id, params],
+        sort_keys=True,
+        default=repr,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    saved_cost: float = 0.0
+    saved_latency_ms: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@dataclass
+class _Entry:
+    response: LLMResponse
+    expires_at: float
+    size: int
+
+
+class CacheStore(ABC):
+    """Persistent second tier for :class:`ResponseCache`."""
+
+    @abstractmethod
+    def get(self, key: str, now: float) -> Optional[Tuple[LLMResponse, float]]:
+        """Return ``(response, expires_at)`` if present and not expired."""
+
+    @abstractmethod
+    def set(self, key: str, response: LLMResponse, expires_at: float) -> None:
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteCacheStore(CacheStore):
+    """SQLite-backed cache tier that survives restarts.
+
+    Calls block on disk I/O; :class:`LLMRouter` reaches the store through
+    :meth:`ResponseCache.aget` / :meth:`ResponseCache.aset`, which run it in a
+    worker thread.
+    """
+
+    def __init__(self, path: str) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS response_cache ("
+            "key TEXT PRIMARY KEY, response TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def get(self, key: str, now: float) -> Optional[Tuple[LLMResponse, float]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, expires_at FROM response_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        if row[1] <= now:
+            self.delete(key)
+            return None
+        return LLMResponse.model_validate_json(row[0]), row[1]
+
+    def set(self, key: str, response: LLMResponse, expires_at: float) -> None:
+        payload = response.model_dump_json()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO response_cache (key, response, expires_at) VALUES (?, ?, ?)",
+                (key, payload, expires_at),
+            )
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM response_cache WHERE key = ?", (key,))
+
+    def purge_expired(self, now: Optional[float] = None) -> int:
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM response_cache WHERE expires_at <= ?", (now or time.time(),)
+            )
+        return cursor.rowcount
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM response_cache")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class ResponseCache:
+    """
+    Exact-match cache of :class:`LLMResponse` objects for :class:`LLMRouter`.
+
+    The in-memory tier is an LRU bounded by ``max_entries`` and by the total
+    size of cached content (``max_bytes``); entries also expire after
+    ``ttl_seconds``. An optional :class:`CacheStore` (e.g.
+    :class:`SQLiteCacheStore`) is written through on every store and consulted
+    on memory misses, so cached responses survive restarts. :meth:`aget` and
+    :meth:`aset` do the store I/O in a worker thread for use on the event loop.
+
+    A hit is served as a copy with ``cost`` and ``latency_ms`` zeroed and
+    ``metadata["cache_hit"]`` set, so spend is not counted twice; the original
+    figures go to :attr:`stats`.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float = 3600.0,
+        max_entries: int = 10_000,
+        max_bytes: int = 64 * 1024 * 1024,
+        store: Optional[CacheStore] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.store = store
+        self.stats = CacheStats()
+        self._clock = clock
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def get(self, key: str) -> Optional[LLMResponse]:
+        """Return a copy of the cached response for *key*, or ``None``; updates stats."""
+        now = self._clock()
+        entry = self._memory_entry(key, now)
+        if entry is None and self.store is not None:
+            entry = self._promote(key, self.store.get(key, now))
+        return self._serve(key, entry)
+
+    async def aget(self, key: str) -> Optional[LLMResponse]:
+        """:meth:`get` for the event loop; the store tier is read in a worker thread."""
+        now = self._clock()
+        entry = self._memory_entry(key, now)
+        if entry is None and self.store is not None:
+            entry = self._promote(key, await asyncio.to_thread(self.store.get, key, now))
+        return self._serve(key, entry)
+
+    def set(self, key: str, response: LLMResponse) -> None:
+        cached, expires_at = self._remember(key, response)
+        if self.store is not None:
+            self.store.set(key, cached, expires_at)
+
+    async def aset(self, key: str, response: LLMResponse) -> None:
+        """:meth:`set` for the event loop; the store tier is written in a worker thread."""
+        cached, expires_at = self._remember(key, response)
+        if self.store is not None:
+            await asyncio.to_thread(self.store.set, key, cached, expires_at)
+
+    def invalidate(self, key: str) -> None:
+        self._remove(key)
+        if self.store is not None:
+            self.store.delete(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+        if self.store is not None:
+            self.store.clear()
+
+    def _memory_entry(self, key: str, now: float) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= now:
+            self._remove(key)
+            return None
+        return entry
+
+    def _promote(self, key: str, stored: Optional[Tuple[LLMResponse, float]]) -> Optional[_Entry]:
+        if stored is None:
+            return None
+        return self._insert(key, stored[0], stored[1])
+
+    def _serve(self, key: str, entry: Optional[_Entry]) -> Optional[LLMResponse]:
+        if entry is None:
+            self.stats.misses += 1
+            return None
+
+        if key in self._entries:  # oversized store entries are served without promotion
+            self._entries.move_to_end(key)
+        self.stats.hits += 1
+        self.stats.saved_cost += entry.response.cost
+        self.stats.saved_latency_ms += entry.response.latency_ms
+        response = entry.response.model_copy(deep=True)
+        response.cost = 0.0
+        response.latency_ms = 0.0
+        response.metadata["cache_hit"] = True
+        return response
+
+    def _remember(self, key: str, response: LLMResponse) -> Tuple[LLMResponse, float]:
+        expires_at = self._clock() + self.ttl_seconds
+        cached = response.model_copy(deep=True)
+        self._insert(key, cached, expires_at)
+        return cached, expires_at
+
+    def _insert(self, key: str, response: LLMResponse, expires_at: float) -> _Entry:
+        self._remove(key)
+        entry = _Entry(response=response, expires_at=expires_at, size=len(response.content.encode("utf-8")))
+        if entry.size > self.max_bytes:
+            return entry  # would evict everything and still not fit
+        self._entries[key] = entry
+        self._bytes += entry.size
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.stats.evictions += 1
+        return entry
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a call is refused because its circuit is open."""
+
+
+@dataclass
+class CircuitBreakerConfig:
+    """
+    Trip and recovery thresholds shared by every breaker in a registry.
+
+    A breaker opens when, over the last ``window`` calls (and at least
+    ``min_calls``), the failure rate reaches ``error_rate_threshold`` or, if
+    ``slow_call_ms`` is set, the share of calls slower than that reaches
+    ``slow_call_rate_threshold``. After ``open_seconds`` it goes half-open
+    and admits up to ``half_open_max_calls`` concurrent trial calls;
+    ``half_open_successes`` successful trials close it again, any failed
+    trial re-opens it.
+    """
+
+    window: int = 20
+    min_calls: int = 5
+    error_rate_threshold: float = 0.5
+    slow_call_ms: Optional[float] = None
+    slow_call_rate_threshold: float = 0.8
+    open_seconds: float = 30.0
+    half_open_max_calls: int = 1
+    half_open_successes: int = 2
+
+
+@dataclass
+class CircuitTransition:
+    key: str
+    from_state: CircuitState
+    to_state: CircuitState
+    at: float
+    reason: str
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker for one provider or provider/model pair."""
+
+    def __init__(
+        self,
+        key: str,
+        config: CircuitBreakerConfig,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        on_transition: Optional[Callable[[CircuitTransition], None]] = None,
+    ) -> None:
+        self.key = key
+        self.config = config
+        self._clock = clock
+        self._on_transition = on_transition
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._outcomes: Deque[Tuple[bool, bool]] = deque()
+        self._failures = 0
+        self._slow = 0
+        self._trials_in_flight = 0
+        self._trial_successes = 0
+
+    @property
+    def state(self) -> CircuitState:
+        if (
+            self._state == CircuitState.OPEN
+            and self._clock() - self._opened_at >= self.config.open_seconds
+        ):
+            self._transition(CircuitState.HALF_OPEN, "open period elapsed")
+        return self._state
+
+    def is_open(self) -> bool:
+        """``True`` if a call would currently be refused. Does not reserve a trial slot."""
+        state = self.state
+        if state == CircuitState.OPEN:
+            return True
+        if state == CircuitState.HALF_OPEN:
+            return self._trials_in_flight >= self.config.half_open_max_calls
+        return False
+
+    def try_acquire(self) -> bool:
+        """Admit a call, reserving a trial slot when half-open."""
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return True
+        if state == CircuitState.HALF_OPEN and self._trials_in_flight < self.config.half_open_max_calls:
+            self._trials_in_flight += 1
+            return True
+        return False
+
+    def release(self) -> None:
+        """Give back a slot from :meth:`try_acquire` for a call with no outcome (e.g. cancelled)."""
+        if self._state == CircuitState.HALF_OPEN and self._trials_in_flight:
+            self._trials_in_flight -= 1
+
+    def record_success(self, latency_ms: float = 0.0) -> None:
+        slow = self.config.slow_call_ms is not None and latency_ms > self.config.slow_call_ms
+        if self._state == CircuitState.HALF_OPEN:
+            self.release()
+            if slow:
+                self._transition(CircuitState.OPEN, f"slow trial call ({latency_ms:.0f}ms)")
+                return
+            self._trial_successes += 1
+            if self._trial_successes >= self.config.half_open_successes:
+                self._transition(CircuitState.CLOSED, "trial calls succeeded")
+            return
+        self._observe(failed=False, slow=slow)
+
+    def record_failure(self) -> None:
+        if self._state == CircuitState.HALF_OPEN:
+            self.release()
+            self._transition(CircuitState.OPEN, "trial call failed")
+            return
+        self._observe(failed=True, slow=False)
+
+    def _observe(self, *, failed: bool, slow: bool) -> None:
+        if self._state != CircuitState.CLOSED:
+            return
+        self._outcomes.append((failed, slow))
+        self._failures += failed
+        self._slow += slow
+        if len(self._outcomes) > self.config.window:
+            old_failed, old_slow = self._outcomes.popleft()
+            self._failures -= old_failed
+            self._slow -= old_slow
+
+        calls = len(self._outcomes)
+        if calls < self.config.min_calls:
+            return
+        if self._failures / calls >= self.config.error_rate_threshold:
+            self._transition(CircuitState.OPEN, f"error rate {self._failures}/{calls}")
+        elif self.config.slow_call_ms is not None and self._slow / calls >= self.config.slow_call_rate_threshold:
+            self._transition(CircuitState.OPEN, f"slow-call rate {self._slow}/{calls}")
+
+    def _transition(self, to_state: CircuitState, reason: str) -> None:
+        from_state = self._state
+        self._state = to_state
+        if to_state == CircuitState.OPEN:
+            self._opened_at = self._clock()
+        if to_state != CircuitState.HALF_OPEN:
+            self._outcomes.clear()
+            self._failures = self._slow = 0
+        self._trials_in_flight = 0
+        self._trial_successes = 0
+        if self._on_transition is not None:
+            self._on_transition(
+                CircuitTransition(self.key, from_state, to_state, self._clock(), reason)
+            )
+
+
+class CircuitBreakerRegistry:
+    """
+    Lazily created breakers for each provider and each ``(provider, model)``.
+
+    A call is admitted only if both its provider breaker and its model
+    breaker admit it, so a crashed host trips every model on it while one
+    broken model leaves the others on the same host in rotation. Recent
+    transitions are kept in :attr:`transitions` and pushed to listeners.
+    """
+
+    def __init__(
+        self,
+        config: Optional[CircuitBreakerConfig] = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        history: int = 100,
+    ) -> None:
+        self.config = config or CircuitBreakerConfig()
+        self._clock = clock
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self.transitions: Deque[CircuitTransition] = deque(maxlen=history)
+        self._listeners: List[Callable[[CircuitTransition], None]] = []
+
+    def add_listener(self, listener: Callable[[CircuitTransition], None]) -> None:
+        self._listeners.append(listener)
+
+    def breaker(self, provider_id: str, model: Optional[str] = None) -> CircuitBreaker:
+        key = provider_id if model is None else f"{provider_id}:{model}"
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            breaker = self._breakers[key] = CircuitBreaker(
+                key, self.config, clock=self._clock, on_transition=self._notify
+            )
+        return breaker
+
+    def states(self) -> Dict[str, CircuitState]:
+        return {key: breaker.state for key, breaker in self._breakers.items()}
+
+    def is_open(self, provider_id: str, model: str) -> bool:
+        return self.breaker(provider_id).is_open() or self.breaker(provider_id, model).is_open()
+
+    def try_acquire(self, provider_id: str, model: str) -> bool:
+        provider = self.breaker(provider_id)
+        if not provider.try_acquire():
+            return False
+        if not self.breaker(provider_id, model).try_acquire():
+            provider.release()
+            return False
+        return True
+
+    def release(self, provider_id: str, model: str) -> None:
+        self.breaker(provider_id).release()
+        self.breaker(provider_id, model).release()
+
+    def record_success(self, provider_id: str, model: str, latency_ms: float = 0.0) -> None:
+        self.breaker(provider_id).record_success(latency_ms)
+        self.breaker(provider_id, model).record_success(latency_ms)
+
+    def record_failure(self, provider_id: str, model: str) -> None:
+        self.breaker(provider_id).record_failure()
+        self.breaker(provider_id, model).record_failure()
+
+    def _notify(self, transition: CircuitTransition) -> None:
+        self.transitions.append(transition)
+        for listener in self._listeners:
+            listener(transition)
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Optional
+
+from .models import LLMResponse
+from .scheduling import Priority
+
+
+@dataclass
+class BatchTask:
+    """One item of work for :meth:`LLMRouter.route_many`; fields mirror :meth:`LLMRouter.route`."""
+
+    task: str
+    complexity: Optional[float] = None
+    required_model: Optional[str] = None
+    task_type: Optional[str] = None
+    priority: Priority = Priority.STANDARD
+    tags: Optional[Dict[str, str]] = None
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one :class:`BatchTask`; exactly one of ``response``/``error`` is set."""
+
+    index: int
+    task: BatchTask
+    response: Optional[LLMResponse] = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class ConcurrencyLimiter:
+    """
+    Per-provider and per-model caps on concurrent provider calls.
+
+    The router acquires a slot for the chosen provider and then for the
+    chosen model around every call, so a single local box is never asked to
+    run more requests than it is configured for, however many callers are
+    routing at once. Providers and models without a configured limit are
+    unbounded. Changing a limit only affects calls that start afterwards.
+    """
+
+    def __init__(
+        self,
+        provider_limits: Optional[Dict[str, int]] = None,
+        model_limits: Optional[Dict[str, int]] = None,
+    ) -> None:
+        self._provider_sems: Dict[str, asyncio.Semaphore] = {}
+        self._model_sems: Dict[str, asyncio.Semaphore] = {}
+        self._in_flight: Dict[str, int] = {}
+        for provider_id, limit in (provider_limits or {}).items():
+            self.set_provider_limit(provider_id, limit)
+        for model, limit in (model_limits or {}).items():
+            self.set_model_limit(model, limit)
+
+    def set_provider_limit(self, provider_id: str, limit: Optional[int]) -> None:
+        self._set_limit(self._provider_sems, provider_id, limit)
+
+    def set_model_limit(self, model: str, limit: Optional[int]) -> None:
+        self._set_limit(self._model_sems, model, limit)
+
+    @staticmethod
+    def _set_limit(sems: Dict[str, asyncio.Semaphore], key: str, limit: Optional[int]) -> None:
+        if limit is None:
+            sems.pop(key, None)
+            return
+        if limit < 1:
+            raise ValueError(f"Concurrency limit must be >= 1, got {limit}")
+        sems[key] = asyncio.Semaphore(limit)
+
+    def in_flight(self, provider_id: str) -> int:
+        """Number of calls currently holding a slot for *provider_id*."""
+        return self._in_flight.get(provider_id, 0)
+
+    @asynccontextmanager
+    async def acquire(self, provider_id: str, model: str) -> AsyncIterator[None]:
+        # Always provider first, then model, so two callers can never deadlock.
+        provider_sem = self._provider_sems.get(provider_id)
+        model_sem = self._model_sems.get(model)
+        if provider_sem is not None:
+            await provider_sem.acquire()
+        try:
+            if model_sem is not None:
+                await model_sem.acquire()
+            self._in_flight[provider_id] = self._in_flight.get(provider_id, 0) + 1
+            try:
+                yield
+            finally:
+                self._in_flight[provider_id] -= 1
+                if model_sem is not None:
+                    model_sem.release()
+        finally:
+            if provider_sem is not None:
+                provider_sem.release()
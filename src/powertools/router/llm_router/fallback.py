@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - providers that use httpx require it anyway
+    httpx = None
+
+from .circuit_breaker import CircuitOpenError
+
+
+class ErrorClass(str, Enum):
+    """How a failed provider call should affect the rest of a fallback chain."""
+
+    BAD_REQUEST = "bad_request"  # the request itself is wrong; no target will accept it
+    AUTH = "auth"  # this provider refuses us; other providers may not
+    RATE_LIMITED = "rate_limited"
+    TIMEOUT = "timeout"
+    UNAVAILABLE = "unavailable"
+
+    @property
+    def retryable(self) -> bool:
+        return self is not ErrorClass.BAD_REQUEST
+
+
+_BAD_REQUEST_STATUSES = {400, 413, 422}
+_AUTH_STATUSES = {401, 403}
+
+
+def classify_error(error: BaseException) -> ErrorClass:
+    """Map a provider exception to an :class:`ErrorClass`.
+
+    HTTP errors are classified by status code; timeouts (``asyncio``'s and
+    httpx's) are ``TIMEOUT``; open circuits and anything unrecognised are
+    treated as the target being ``UNAVAILABLE``.
+    """
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError)):
+        return ErrorClass.TIMEOUT
+    if httpx is not None and isinstance(error, httpx.TimeoutException):
+        return ErrorClass.TIMEOUT
+    if isinstance(error, CircuitOpenError):
+        return ErrorClass.UNAVAILABLE
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    if status in _BAD_REQUEST_STATUSES:
+        return ErrorClass.BAD_REQUEST
+    if status in _AUTH_STATUSES:
+        return ErrorClass.AUTH
+    if status == 429:
+        return ErrorClass.RATE_LIMITED
+    return ErrorClass.UNAVAILABLE
+
+
+@dataclass
+class FallbackPolicy:
+    """
+    How :class:`LLMRouter` retries a failed call on other targets.
+
+    ``chains`` maps a ``task_type`` to an ordered list of targets to try
+    after the routed one fails. Each entry is ``"provider:model"`` or a bare
+    model name (every provider serving it, in registration order). Task
+    types without a chain use the default order: the same model on other
+    providers, the registry's candidates for the task (preferred tier, then
+    fallback tier), the default local model on other local providers and
+    finally the default cloud model.
+
+    At most ``max_attempts`` calls are made per request, including the
+    first. ``deadline_seconds`` bounds the whole request; each attempt gets
+    whatever time is left, further capped by ``attempt_timeout_seconds``.
+    """
+
+    max_attempts: int = 4
+    deadline_seconds: Optional[float] = None
+    attempt_timeout_seconds: Optional[float] = None
+    chains: Dict[str, List[str]] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        if self.max_attempts < 1:
+            raise ValueError(f"max_attempts must be >= 1, got {self.max_attempts}")
+
+
+@dataclass
+class Attempt:
+    """One provider call made while serving a request, as recorded in ``metadata["attempts"]``."""
+
+    provider: str
+    model: str
+    ok: bool
+    latency_ms: float
+    error: Optional[str] = None
+    error_class: Optional[ErrorClass] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "provider": self.provider,
+            "model": self.model,
+            "ok": self.ok,
+            "latency_ms": self.latency_ms,
+            "error": self.error,
+            "error_class": self.error_class.value if self.error_class is not None else None,
+        }
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .base import LLMProvider
+
+
+@dataclass
+class HealthState:
+    """Last known health of a provider."""
+
+    healthy: bool
+    checked_at: float
+    last_error: Optional[str] = None
+
+
+class HealthMonitor:
+    """
+    TTL-cached provider health with an optional background prober.
+
+    Routing reads the cached state in O(1) via :meth:`check`; only a missing or
+    expired entry triggers an inline probe. While the background prober is
+    running (see :meth:`start`) entries are refreshed every
+    ``probe_interval_seconds`` so routing never waits on ``is_healthy()``.
+    Real call outcomes are fed back through :meth:`mark_healthy` and
+    :meth:`mark_unhealthy`, so a failed generation takes a provider out of
+    rotation immediately rather than at the next probe.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float = 30.0,
+        probe_interval_seconds: float = 10.0,
+        probe_timeout_seconds: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.probe_interval_seconds = probe_interval_seconds
+        self.probe_timeout_seconds = probe_timeout_seconds
+        self._clock = clock
+        self._providers: Dict[str, LLMProvider] = {}
+        self._states: Dict[str, HealthState] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._probe_listeners: List[Callable[[LLMProvider, bool], None]] = []
+
+    def track(self, provider: LLMProvider) -> None:
+        """Start tracking *provider*; replaces any previous provider with the same id."""
+        self._providers[provider.provider_id] = provider
+        self._states.pop(provider.provider_id, None)
+
+    def add_probe_listener(self, listener: Callable[[LLMProvider, bool], None]) -> None:
+        """Call ``listener(provider, healthy)`` after every completed probe."""
+        self._probe_listeners.append(listener)
+
+    def get_state(self, provider_id: str) -> Optional[HealthState]:
+        return self._states.get(provider_id)
+
+    def cached(self, provider_id: str) -> Optional[bool]:
+        """Return cached health, or ``None`` if unknown or older than the TTL."""
+        state = self._states.get(provider_id)
+        if state is None or self._clock() - state.checked_at > self.ttl_seconds:
+            return None
+        return state.healthy
+
+    def mark_healthy(self, provider_id: str) -> None:
+        self._states[provider_id] = HealthState(healthy=True, checked_at=self._clock())
+
+    def mark_unhealthy(self, provider_id: str, error: Optional[BaseException] = None) -> None:
+        self._states[provider_id] = HealthState(
+            healthy=False,
+            checked_at=self._clock(),
+            last_error=repr(error) if error is not None else None,
+        )
+
+    async def probe(self, provider: LLMProvider) -> bool:
+        """Call ``provider.is_healthy()`` under the probe timeout and cache the result."""
+        try:
+            healthy = bool(
+                await asyncio.wait_for(provider.is_healthy(), self.probe_timeout_seconds)
+            )
+        except Exception as exc:
+            self.mark_unhealthy(provider.provider_id, exc)
+            return False
+        if healthy:
+            self.mark_healthy(provider.provider_id)
+        else:
+            self.mark_unhealthy(provider.provider_id)
+        for listener in self._probe_listeners:
+            listener(provider, healthy)
+        return healthy
+
+    async def probe_all(self) -> Dict[str, bool]:
+        providers = list(self._providers.values())
+        results = await asyncio.gather(*(self.probe(p) for p in providers))
+        return {p.provider_id: healthy for p, healthy in zip(providers, results)}
+
+    async def check(self, provider: LLMProvider) -> bool:
+        """Return cached health for *provider*, probing inline only when stale."""
+        cached = self.cached(provider.provider_id)
+        if cached is not None:
+            return cached
+        return await self.probe(provider)
+
+    async def check_many(
+        self,
+        providers: Iterable[LLMProvider],
+        timeout: Optional[float] = None,
+    ) -> Dict[str, bool]:
+        """Return health for each of *providers*, probing all stale ones concurrently.
+
+        The probes share one deadline of *timeout* seconds (default
+        ``probe_timeout_seconds``). A provider whose probe has not finished by
+        then is reported unhealthy for this call; its probe keeps running and
+        caches the result for the next one. A provider is never probed twice
+        at the same time.
+        """
+        results: Dict[str, bool] = {}
+        pending: Dict[str, asyncio.Task] = {}
+        for provider in providers:
+            provider_id = provider.provider_id
+            if provider_id in results or provider_id in pending:
+                continue
+            cached = self.cached(provider_id)
+            if cached is not None:
+                results[provider_id] = cached
+            else:
+                pending[provider_id] = self._probe_task(provider)
+        if pending:
+            await asyncio.wait(
+                pending.values(),
+                timeout=self.probe_timeout_seconds if timeout is None else timeout,
+            )
+            for provider_id, task in pending.items():
+                results[provider_id] = (
+                    task.done() and not task.cancelled() and task.exception() is None and task.result()
+                )
+        return results
+
+    def _probe_task(self, provider: LLMProvider) -> asyncio.Task:
+        provider_id = provider.provider_id
+        task = self._in_flight.get(provider_id)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(self.probe(provider))
+            self._in_flight[provider_id] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(provider_id, None))
+        return task
+
+    # ------------------------------------------------------------------
+    # Background probing
+    # ------------------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Launch the background prober on the running event loop."""
+        if not self.running:
+            self._task = asyncio.get_running_loop().create_task(self._probe_loop())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _probe_loop(self) -> None:
+        while True:
+            await self.probe_all()
+            await asyncio.sleep(self.probe_interval_seconds)
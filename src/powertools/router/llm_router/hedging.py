@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Tuple
+
+
+@dataclass
+class HedgingPolicy:
+    """
+    When to fire a hedge request in :meth:`LLMRouter.route`.
+
+    A hedge is started once the primary call has been running longer than the
+    ``percentile`` latency observed for its ``(provider, model)`` over the last
+    ``window`` successful calls. Until ``min_samples`` calls have been seen,
+    ``initial_delay_ms`` is used instead. ``allow_same_target`` lets the hedge
+    go to the same provider/model when no other candidate exists, which for
+    cloud APIs usually lands on a different backend replica.
+    """
+
+    percentile: float = 0.95
+    window: int = 200
+    min_samples: int = 20
+    initial_delay_ms: float = 2000.0
+    min_delay_ms: float = 50.0
+    allow_same_target: bool = True
+
+    def __post_init__(self) -> None:
+        if not 0.0 < self.percentile < 1.0:
+            raise ValueError(f"percentile must be between 0 and 1, got {self.percentile}")
+
+
+class LatencyWindow:
+    """Rolling window of recent latencies per ``(provider, model)``."""
+
+    def __init__(self, size: int = 200) -> None:
+        self.size = size
+        self._samples: Dict[Tuple[str, str], Deque[float]] = {}
+
+    def record(self, provider_id: str, model: str, latency_ms: float) -> None:
+        samples = self._samples.get((provider_id, model))
+        if samples is None:
+            samples = self._samples[(provider_id, model)] = deque(maxlen=self.size)
+        samples.append(latency_ms)
+
+    def count(self, provider_id: str, model: str) -> int:
+        return len(self._samples.get((provider_id, model), ()))
+
+    def percentile(self, provider_id: str, model: str, q: float) -> float:
+        """Nearest-rank percentile of the recorded latencies; 0.0 if none."""
+        samples = self._samples.get((provider_id, model))
+        if not samples:
+            return 0.0
+        ordered = sorted(samples)
+        rank = min(len(ordered) - 1, max(0, int(q * len(ordered) + 0.5) - 1))
+        return ordered[rank]
+
+
+class HedgeController:
+    """Latency bookkeeping and hedge-delay computation for one router."""
+
+    def __init__(self, policy: HedgingPolicy) -> None:
+        self.policy = policy
+        self.latencies = LatencyWindow(policy.window)
+
+    def record(self, provider_id: str, model: str, latency_ms: float) -> None:
+        self.latencies.record(provider_id, model, latency_ms)
+
+    def delay_seconds(self, provider_id: str, model: str) -> float:
+        policy = self.policy
+        if self.latencies.count(provider_id, model) < policy.min_samples:
+            delay_ms = policy.initial_delay_ms
+        else:
+            delay_ms = self.latencies.percentile(provider_id, model, policy.percentile)
+        return max(delay_ms, policy.min_delay_ms) / 1000
@@ -0,0 +1,435 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import IO, Callable, Dict, Iterable, List, Optional
+
+from .token_cost_tracker import UsageRecord
+
+
+class SyncMode(str, Enum):
+    """When a ledger forces written records to disk.
+
+    ``FULL`` syncs after every batch; ``NORMAL`` leaves it to the OS (and
+    SQLite's WAL checkpoints) and syncs on rotation and close; ``OFF`` never
+    syncs explicitly.
+    """
+
+    FULL = "full"
+    NORMAL = "normal"
+    OFF = "off"
+
+
+def _empty_row() -> Dict[str, float]:
+    return {"calls": 0.0, "input_tokens": 0.0, "output_tokens": 0.0, "cost": 0.0}
+
+
+def _add(summary: Dict[str, Dict[str, float]], model: str, row: Dict[str, float]) -> None:
+    target = summary.setdefault(model, _empty_row())
+    for column, value in row.items():
+        target[column] += value
+
+
+@dataclass
+class SegmentRollup:
+    """Per-model totals of one ledger segment and the time span its records cover."""
+
+    segment: int
+    start: float = float("inf")
+    end: float = float("-inf")
+    by_model: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
+    def add(self, record: UsageRecord) -> None:
+        self.start = min(self.start, record.timestamp)
+        self.end = max(self.end, record.timestamp)
+        _add(self.by_model, record.model, {
+            "calls": 1.0,
+            "input_tokens": float(record.input_tokens),
+            "output_tokens": float(record.output_tokens),
+            "cost": record.cost,
+        })
+
+    def to_dict(self) -> Dict[str, object]:
+        return {"segment": self.segment, "start": self.start, "end": self.end, "by_model": self.by_model}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> "SegmentRollup":
+        return cls(
+            segment=int(data["segment"]),
+            start=float(data["start"]),
+            end=float(data["end"]),
+            by_model={model: dict(row) for model, row in data["by_model"].items()},
+        )
+
+
+class UsageLedger(ABC):
+    """
+    Append-only, durable log of :class:`UsageRecord` rows behind :class:`TokenCostTracker`.
+
+    Appends are buffered and written in batches of ``batch_size`` records,
+    or sooner once ``flush_interval_seconds`` have passed since the last
+    write (checked on append; call :meth:`flush` to force a write). Records
+    still in the buffer are lost if the process dies, so ``batch_size=1``
+    with ``SyncMode.FULL`` gives per-call durability at per-call cost.
+
+    Records are grouped into segments of ``segment_records`` rows. Every
+    segment keeps a precomputed :class:`SegmentRollup`, so :meth:`summarize`
+    reads one rollup per segment rather than every record and startup time
+    stays flat as history grows. With ``max_segments`` only the raw rows of
+    the newest segments are kept; older segments survive as rollups only.
+    """
+
+    def __init__(
+        self,
+        *,
+        batch_size: int = 100,
+        flush_interval_seconds: float = 1.0,
+        segment_records: int = 100_000,
+        max_segments: Optional[int] = None,
+        sync: SyncMode = SyncMode.NORMAL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be >= 1, got {batch_size}")
+        if segment_records < 1:
+            raise ValueError(f"segment_records must be >= 1, got {segment_records}")
+        if max_segments is not None and max_segments < 1:
+            raise ValueError(f"max_segments must be >= 1, got {max_segments}")
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.segment_records = segment_records
+        self.max_segments = max_segments
+        self.sync = SyncMode(sync)
+        self._clock = clock
+        self._buffer: List[UsageRecord] = []
+        self._last_flush = clock()
+
+    def append(self, record: UsageRecord) -> None:
+        self._buffer.append(record)
+        if (
+            len(self._buffer) >= self.batch_size
+            or self._clock() - self._last_flush >= self.flush_interval_seconds
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all buffered records."""
+        self._last_flush = self._clock()
+        if not self._buffer:
+            return
+        batch, self._buffer = self._buffer, []
+        self._write(batch)
+
+    def summarize(self, since: Optional[float] = None) -> Dict[str, Dict[str, float]]:
+        """Per-model totals of every written record, or of those at or after *since*.
+
+        Segments entirely inside the window are read from their rollups; only
+        a segment straddling *since* has its raw rows scanned (and is skipped
+        if they have been rotated away).
+        """
+        self.flush()
+        summary: Dict[str, Dict[str, float]] = {}
+        for rollup in self.rollups():
+            if since is None or rollup.start >= since:
+                for model, row in rollup.by_model.items():
+                    _add(summary, model, row)
+            elif rollup.end >= since:
+                partial = SegmentRollup(rollup.segment)
+                for record in self._segment_records(rollup.segment):
+                    if record.timestamp >= since:
+                        partial.add(record)
+                for model, row in partial.by_model.items():
+                    _add(summary, model, row)
+        return summary
+
+    def records(self, since: float) -> Iterable[UsageRecord]:
+        """Yield retained records at or after *since*, reading only segments that reach it."""
+        self.flush()
+        for rollup in self.rollups():
+            if rollup.end >= since:
+                for record in self._segment_records(rollup.segment):
+                    if record.timestamp >= since:
+                        yield record
+
+    def close(self) -> None:
+        self.flush()
+        self._close()
+
+    @abstractmethod
+    def _write(self, batch: List[UsageRecord]) -> None:
+        """Durably append *batch*, update rollups and rotate segments as needed."""
+
+    @abstractmethod
+    def rollups(self) -> List[SegmentRollup]:
+        """Rollups of all segments that have records, oldest first."""
+
+    @abstractmethod
+    def _segment_records(self, segment: int) -> Iterable[UsageRecord]:
+        """Raw records of *segment* still retained, oldest first."""
+
+    @abstractmethod
+    def _close(self) -> None:
+        pass
+
+
+class SQLiteUsageLedger(UsageLedger):
+    """
+    Ledger in one SQLite database in WAL mode.
+
+    Each batch is one transaction that inserts the rows and upserts the
+    ``(segment, model)`` rollups. ``SyncMode`` maps onto
+    ``PRAGMA synchronous``. Segments are logical here: rotation deletes the
+    raw rows of segments older than ``max_segments``.
+    """
+
+    def __init__(self, path: str, **kwargs) -> None:
+        super().__init__(**kwargs)
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"PRAGMA synchronous={self.sync.value.upper()}")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS usage ("
+            "id INTEGER PRIMARY KEY, segment INTEGER NOT NULL, timestamp REAL NOT NULL, "
+            "model TEXT NOT NULL, input_tokens INTEGER NOT NULL, output_tokens INTEGER NOT NULL, "
+            "cost REAL NOT NULL, metadata TEXT)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS usage_rollups ("
+            "segment INTEGER NOT NULL, model TEXT NOT NULL, calls INTEGER NOT NULL, "
+            "input_tokens INTEGER NOT NULL, output_tokens INTEGER NOT NULL, cost REAL NOT NULL, "
+            "first_ts REAL NOT NULL, last_ts REAL NOT NULL, PRIMARY KEY (segment, model))"
+        )
+        row = self._conn.execute(
+            "SELECT segment, SUM(calls) FROM usage_rollups GROUP BY segment ORDER BY segment DESC LIMIT 1"
+        ).fetchone()
+        self._segment, self._segment_count = (row[0], row[1]) if row else (0, 0)
+
+    def _write(self, batch: List[UsageRecord]) -> None:
+        self._conn.execute("BEGIN")
+        try:
+            while batch:
+                room = self.segment_records - self._segment_count
+                if room <= 0:
+                    self._rotate()
+                    continue
+                chunk, batch = batch[:room], batch[room:]
+                self._insert(chunk)
+                self._segment_count += len(chunk)
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def _insert(self, chunk: List[UsageRecord]) -> None:
+        self._conn.executemany(
+            "INSERT INTO usage (segment, timestamp, model, input_tokens, output_tokens, cost, metadata) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (self._segment, r.timestamp, r.model, r.input_tokens, r.output_tokens, r.cost,
+                 json.dumps(r.metadata) if r.metadata else None)
+                for r in chunk
+            ],
+        )
+        rollup = SegmentRollup(self._segment)
+        first: Dict[str, float] = {}
+        last: Dict[str, float] = {}
+        for record in chunk:
+            rollup.add(record)
+            first[record.model] = min(first.get(record.model, record.timestamp), record.timestamp)
+            last[record.model] = max(last.get(record.model, record.timestamp), record.timestamp)
+        self._conn.executemany(
+            "INSERT INTO usage_rollups "
+            "(segment, model, calls, input_tokens, output_tokens, cost, first_ts, last_ts) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (segment, model) DO UPDATE SET "
+            "calls = calls + excluded.calls, "
+            "input_tokens = input_tokens + excluded.input_tokens, "
+            "output_tokens = output_tokens + excluded.output_tokens, "
+            "cost = cost + excluded.cost, "
+            "first_ts = MIN(first_ts, excluded.first_ts), "
+            "last_ts = MAX(last_ts, excluded.last_ts)",
+            [
+                (self._segment, model, int(row["calls"]), int(row["input_tokens"]),
+                 int(row["output_tokens"]), row["cost"], first[model], last[model])
+                for model, row in rollup.by_model.items()
+            ],
+        )
+
+    def _rotate(self) -> None:
+        self._segment += 1
+        self._segment_count = 0
+        if self.max_segments is not None:
+            self._conn.execute(
+                "DELETE FROM usage WHERE segment <= ?", (self._segment - self.max_segments,)
+            )
+
+    def rollups(self) -> List[SegmentRollup]:
+        rollups: Dict[int, SegmentRollup] = {}
+        for segment, model, calls, input_tokens, output_tokens, cost, first_ts, last_ts in self._conn.execute(
+            "SELECT segment, model, calls, input_tokens, output_tokens, cost, first_ts, last_ts "
+            "FROM usage_rollups ORDER BY segment"
+        ):
+            rollup = rollups.setdefault(segment, SegmentRollup(segment))
+            rollup.start = min(rollup.start, first_ts)
+            rollup.end = max(rollup.end, last_ts)
+            rollup.by_model[model] = {
+                "calls": float(calls),
+                "input_tokens": float(input_tokens),
+                "output_tokens": float(output_tokens),
+                "cost": cost,
+            }
+        return list(rollups.values())
+
+    def _segment_records(self, segment: int) -> Iterable[UsageRecord]:
+        for timestamp, model, input_tokens, output_tokens, cost, metadata in self._conn.execute(
+            "SELECT timestamp, model, input_tokens, output_tokens, cost, metadata "
+            "FROM usage WHERE segment = ? ORDER BY id",
+            (segment,),
+        ):
+            yield UsageRecord(
+                model=model,
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                total_tokens=input_tokens + output_tokens,
+                cost=cost,
+                metadata=json.loads(metadata) if metadata else {},
+                timestamp=timestamp,
+            )
+
+    def _close(self) -> None:
+        self._conn.close()
+
+
+_SEGMENT_NAME = re.compile(r"^segment-(\d+)\.jsonl$")
+
+
+class SegmentFileUsageLedger(UsageLedger):
+    """
+    Ledger as a directory of append-only JSON-lines segment files.
+
+    Records go to ``segment-NNNNNN.jsonl``; when it holds
+    ``segment_records`` rows it is synced, its rollup is written next to it
+    as ``segment-NNNNNN.rollup.json`` and a new segment is started. On
+    startup only the newest segment, which has no rollup yet, is re-read; a
+    line torn by a crash mid-write is ignored. With ``max_segments`` the
+    oldest segment files are deleted and only their rollups kept.
+    """
+
+    def __init__(self, directory: str, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self._dir = Path(directory)
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._closed: List[SegmentRollup] = []
+        for path in sorted(self._dir.glob("segment-*.rollup.json")):
+            self._closed.append(SegmentRollup.from_dict(json.loads(path.read_text())))
+        segments = sorted(
+            int(match.group(1)) for match in map(_SEGMENT_NAME.match, os.listdir(self._dir)) if match
+        )
+        done = {rollup.segment for rollup in self._closed}
+        open_segments = [s for s in segments if s not in done]
+        self._segment = max(open_segments + [r.segment + 1 for r in self._closed] + [0])
+        self._active = SegmentRollup(self._segment)
+        self._active_count = 0
+        self._truncate_torn_tail(self._path(self._segment))
+        for record in self._segment_records(self._segment):
+            self._active.add(record)
+            self._active_count += 1
+        self._file: IO[str] = open(self._path(self._segment), "a", encoding="utf-8")
+
+    @staticmethod
+    def _truncate_torn_tail(path: Path) -> None:
+        """Drop a partial last line left by a crash, so new rows start on a fresh line."""
+        if not path.exists():
+            return
+        with open(path, "rb+") as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                f.truncate(data.rfind(b"\n") + 1)
+
+    def _path(self, segment: int, suffix: str = ".jsonl") -> Path:
+        return self._dir / f"segment-{segment:06d}{suffix}"
+
+    def _write(self, batch: List[UsageRecord]) -> None:
+        for record in batch:
+            if self._active_count >= self.segment_records:
+                self._rotate()
+            row = {
+                "t": record.timestamp,
+                "m": record.model,
+                "i": record.input_tokens,
+                "o": record.output_tokens,
+                "c": record.cost,
+            }
+            if record.metadata:
+                row["md"] = record.metadata
+            self._file.write(json.dumps(row, separators=(",", ":")) + "\n")
+            self._active.add(record)
+            self._active_count += 1
+        self._file.flush()
+        if self.sync == SyncMode.FULL:
+            os.fsync(self._file.fileno())
+
+    def _rotate(self) -> None:
+        self._file.flush()
+        if self.sync != SyncMode.OFF:
+            os.fsync(self._file.fileno())
+        self._file.close()
+        self._write_rollup(self._active)
+        self._closed.append(self._active)
+        self._segment += 1
+        self._active = SegmentRollup(self._segment)
+        self._active_count = 0
+        self._file = open(self._path(self._segment), "a", encoding="utf-8")
+        if self.max_segments is not None:
+            expired = self._segment - self.max_segments
+            for rollup in self._closed:
+                if rollup.segment <= expired:
+                    self._path(rollup.segment).unlink(missing_ok=True)
+
+    def _write_rollup(self, rollup: SegmentRollup) -> None:
+        path = self._path(rollup.segment, ".rollup.json")
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(rollup.to_dict(), f)
+            f.flush()
+            if self.sync != SyncMode.OFF:
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def rollups(self) -> List[SegmentRollup]:
+        active = [self._active] if self._active_count else []
+        return self._closed + active
+
+    def _segment_records(self, segment: int) -> Iterable[UsageRecord]:
+        path = self._path(segment)
+        if not path.exists():
+            return
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                yield UsageRecord(
+                    model=row["m"],
+                    input_tokens=row["i"],
+                    output_tokens=row["o"],
+                    total_tokens=row["i"] + row["o"],
+                    cost=row["c"],
+                    metadata=row.get("md", {}),
+                    timestamp=row["t"],
+                )
+
+    def _close(self) -> None:
+        self._file.flush()
+        if self.sync != SyncMode.OFF:
+            os.fsync(self._file.fileno())
+        self._file.close()
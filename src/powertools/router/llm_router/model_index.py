@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from bisect import insort
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+
+class ModelIndex:
+    """
+    Hash index from model name and ``provider:model`` to provider id.
+
+    The router keeps one of these in sync with each provider's
+    ``get_supported_models()`` so routing decisions are dictionary lookups
+    rather than scans over every provider's model list. Updates are
+    incremental: only models that were added or removed since the last
+    :meth:`update` for a provider touch the index.
+    """
+
+    def __init__(self) -> None:
+        self._rank: Dict[str, int] = {}
+        self._models: Dict[str, FrozenSet[str]] = {}
+        self._by_model: Dict[str, List[Tuple[int, str]]] = {}
+        self._by_full_name: Dict[str, Tuple[str, str]] = {}
+
+    def update(self, provider_id: str, models: Iterable[str]) -> bool:
+        """Replace the indexed models for *provider_id*. Returns ``True`` if anything changed."""
+        rank = self._rank.setdefault(provider_id, len(self._rank))
+        new = frozenset(models)
+        old = self._models.get(provider_id, frozenset())
+        if new == old and provider_id in self._models:
+            return False
+
+        for model in old - new:
+            entries = self._by_model.get(model, [])
+            entries.remove((rank, provider_id))
+            if not entries:
+                del self._by_model[model]
+            del self._by_full_name[f"{provider_id}:{model}"]
+
+        for model in new - old:
+            insort(self._by_model.setdefault(model, []), (rank, provider_id))
+            self._by_full_name[f"{provider_id}:{model}"] = (provider_id, model)
+
+        self._models[provider_id] = new
+        return True
+
+    def remove(self, provider_id: str) -> None:
+        if provider_id in self._models:
+            self.update(provider_id, ())
+            del self._models[provider_id]
+
+    def providers_for(self, model: str) -> Sequence[str]:
+        """Provider ids serving *model*, in provider registration order."""
+        return [provider_id for _, provider_id in self._by_model.get(model, ())]
+
+    def resolve(self, full_name: str) -> Optional[Tuple[str, str]]:
+        """Map a ``provider:model`` name to ``(provider_id, model)`` if that provider serves it."""
+        return self._by_full_name.get(full_name)
+
+    def supports(self, provider_id: str, model: str) -> bool:
+        return f"{provider_id}:{model}" in self._by_full_name
+
+    def models(self, provider_id: str) -> FrozenSet[str]:
+        return self._models.get(provider_id, frozenset())
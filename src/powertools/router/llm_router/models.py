@@ -1,3 +1,4 @@
+from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any, Union
 from pydantic import BaseModel, Field
 from enum import Enum
@@ -6,6 +7,10 @@ class ProviderType(str, Enum):
     LOCAL = "local"
     CLOUD = "cloud"
 
+class RoutingObjective(str, Enum):
+    LATENCY = "latency"
+    COST = "cost"
+
 class LLMResponse(BaseModel):
     content: str
     model: str
@@ -16,6 +21,53 @@ class LLMResponse(BaseModel):
     cost: float = 0.0
     latency_ms: float = 0.0
 
+    @classmethod
+    def trusted(
+        cls,
+        content: str,
+        model: str,
+        provider: str,
+        provider_type: ProviderType,
+        usage: Optional[Dict[str, int]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        cost: float = 0.0,
+        latency_ms: float = 0.0,
+    ) -> "LLMResponse":
+        """Build a response without validation, for values whose types the caller guarantees.
+
+        Skipping validation makes this markedly cheaper than the validating
+        constructor, while ``model_construct`` is slower than both (see
+        ``benchmarks/bench_models.py``). Every field counts as explicitly set.
+        Only for responses assembled from known-good values (e.g. a finished
+        stream); replies parsed from a provider's JSON must be validated.
+        """
+        response = object.__new__(cls)
+        _set_attr(response, "__dict__", {
+            "content": content,
+            "model": model,
+            "provider": provider,
+            "provider_type": provider_type,
+            "usage": {} if usage is None else usage,
+            "metadata": {} if metadata is None else metadata,
+            "cost": cost,
+            "latency_ms": latency_ms,
+        })
+        _set_attr(response, "__pydantic_fields_set__", set(_RESPONSE_FIELDS))
+        _set_attr(response, "__pydantic_extra__", None)
+        _set_attr(response, "__pydantic_private__", None)
+        return response
+
+_set_attr = object.__setattr__
+_RESPONSE_FIELDS = frozenset(LLMResponse.model_fields)
+
+@dataclass(slots=True)
+class StreamChunk:
+    """One piece of a streamed response; a plain slotted object, as streams yield one per token."""
+
+    content: str
+    done: bool = False
+    usage: Dict[str, int] = field(default_factory=dict)
+
 class RoutingDecision(BaseModel):
     provider_id: str
     model: str
@@ -23,3 +75,5 @@ class RoutingDecision(BaseModel):
     estimated_cost: float = 0.0
     estimated_latency_ms: float = 0.0
     confidence_score: float = 1.0
+    affinity_key: Optional[str] = None
+    tags: Dict[str, str] = Field(default_factory=dict)
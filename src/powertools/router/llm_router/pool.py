@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import asyncio
+import random
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Set, Union
+
+from .affinity import rendezvous_pick
+from .base import LLMProvider
+from .fallback import ErrorClass, classify_error
+from .models import LLMResponse, ProviderType, StreamChunk
+
+
+class BalancingStrategy(str, Enum):
+    LEAST_OUTSTANDING = "least_outstanding"
+    POWER_OF_TWO = "power_of_two"
+
+
+@dataclass
+class PoolEndpoint:
+    """One backend instance in a :class:`ProviderPool` and what the pool knows about it."""
+
+    endpoint_id: str
+    provider: LLMProvider
+    healthy: bool = True
+    outstanding: int = 0
+    loaded_models: Set[str] = field(default_factory=set)
+
+    def supports(self, model: str) -> bool:
+        return model in self.provider.get_supported_models()
+
+
+class ProviderPool(LLMProvider):
+    """
+    Several endpoints of the same kind behind one logical provider.
+
+    Register the pool with :class:`LLMRouter` like any provider; each call is
+    sent to one healthy endpoint that serves the model. Endpoints that
+    already have the model in memory (per ``get_loaded_models()`` or an
+    earlier call) are preferred unless they are more than
+    ``warm_preference`` requests busier than a cold one. Among the rest the
+    endpoint with the fewest outstanding requests wins, or with
+    ``POWER_OF_TWO`` the less busy of two picked at random. Health is
+    tracked per endpoint: a connection failure or timeout takes the
+    endpoint out of rotation until the next :meth:`is_healthy` probe and the
+    call is retried on another endpoint. Calls with an ``affinity_key``
+    skip balancing and go to the key's rendezvous-hashed endpoint, so a
+    shared prompt prefix keeps hitting the same KV cache.
+    """
+
+    supports_affinity = True
+
+    def __init__(
+        self,
+        provider_id: str,
+        endpoints: Union[Sequence[LLMProvider], Dict[str, LLMProvider]],
+        *,
+        strategy: BalancingStrategy = BalancingStrategy.LEAST_OUTSTANDING,
+        warm_preference: int = 2,
+        provider_type: Optional[ProviderType] = None,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        if not endpoints:
+            raise ValueError("ProviderPool needs at least one endpoint")
+        self._provider_id = provider_id
+        self.strategy = BalancingStrategy(strategy)
+        self.warm_preference = warm_preference
+        self._rng = rng or random.Random()
+        self._endpoints: Dict[str, PoolEndpoint] = {}
+        items = endpoints.items() if isinstance(endpoints, dict) else (
+            (getattr(p, "base_url", None) or f"{provider_id}#{i}", p) for i, p in enumerate(endpoints)
+        )
+        for endpoint_id, provider in items:
+            self.add_endpoint(provider, endpoint_id)
+        self._provider_type = provider_type or next(iter(self._endpoints.values())).provider.provider_type
+
+    @property
+    def provider_id(self) -> str:
+        return self._provider_id
+
+    @property
+    def provider_type(self) -> ProviderType:
+        return self._provider_type
+
+    @property
+    def endpoints(self) -> List[PoolEndpoint]:
+        return list(self._endpoints.values())
+
+    def add_endpoint(self, provider: LLMProvider, endpoint_id: Optional[str] = None) -> PoolEndpoint:
+        endpoint_id = endpoint_id or getattr(provider, "base_url", None) or f"{self._provider_id}#{len(self._endpoints)}"
+        if endpoint_id in self._endpoints:
+            raise ValueError(f"Duplicate endpoint id '{endpoint_id}' in pool '{self._provider_id}'")
+        endpoint = self._endpoints[endpoint_id] = PoolEndpoint(endpoint_id, provider)
+        return endpoint
+
+    def remove_endpoint(self, endpoint_id: str) -> None:
+        self._endpoints.pop(endpoint_id, None)
+
+    def select(
+        self,
+        model: str,
+        exclude: Set[str] = frozenset(),
+        affinity_key: Optional[str] = None,
+    ) -> Optional[PoolEndpoint]:
+        """Choose the endpoint for the next call to *model*, or ``None`` if none is usable."""
+        healthy = [e for e in self._endpoints.values() if e.healthy and e.endpoint_id not in exclude]
+        candidates = [e for e in healthy if e.supports(model)] or healthy
+        if not candidates:
+            return None
+        if affinity_key is not None:
+            return rendezvous_pick(affinity_key, candidates, lambda e: e.endpoint_id)
+        warm = self._balance([e for e in candidates if model in e.loaded_models])
+        cold = self._balance([e for e in candidates if model not in e.loaded_models])
+        if warm is not None and (cold is None or warm.outstanding <= cold.outstanding + self.warm_preference):
+            return warm
+        return cold
+
+    def _balance(self, endpoints: List[PoolEndpoint]) -> Optional[PoolEndpoint]:
+        if not endpoints:
+            return None
+        if self.strategy == BalancingStrategy.POWER_OF_TWO and len(endpoints) > 2:
+            endpoints = self._rng.sample(endpoints, 2)
+        # min() keeps registration order on ties.
+        return min(endpoints, key=lambda e: e.outstanding)
+
+    async def generate(
+        self,
+        prompt: str,
+        model: str,
+        *,
+        affinity_key: Optional[str] = None,
+        **kwargs
+    ) -> LLMResponse:
+        tried: Set[str] = set()
+        while True:
+            endpoint = self._select_or_raise(model, tried, affinity_key)
+            endpoint.outstanding += 1
+            try:
+                response = await endpoint.provider.generate(prompt, model, **kwargs)
+            except Exception as e:
+                if not self._endpoint_failed(endpoint, e):
+                    raise
+                tried.add(endpoint.endpoint_id)
+                if self.select(model, tried) is None:
+                    raise
+                continue
+            finally:
+                endpoint.outstanding -= 1
+            endpoint.loaded_models.add(model)
+            response.provider = self._provider_id
+            response.metadata["endpoint"] = endpoint.endpoint_id
+            return response
+
+    async def generate_stream(
+        self,
+        prompt: str,
+        model: str,
+        *,
+        affinity_key: Optional[str] = None,
+        **kwargs
+    ) -> AsyncIterator[StreamChunk]:
+        tried: Set[str] = set()
+        while True:
+            endpoint = self._select_or_raise(model, tried, affinity_key)
+            endpoint.outstanding += 1
+            started = False
+            try:
+                async for chunk in endpoint.provider.generate_stream(prompt, model, **kwargs):
+                    started = True
+                    yield chunk
+            except Exception as e:
+                if started or not self._endpoint_failed(endpoint, e):
+                    raise
+                tried.add(endpoint.endpoint_id)
+                if self.select(model, tried) is None:
+                    raise
+                continue
+            finally:
+                endpoint.outstanding -= 1
+            endpoint.loaded_models.add(model)
+            return
+
+    def _select_or_raise(self, model: str, tried: Set[str], affinity_key: Optional[str]) -> PoolEndpoint:
+        endpoint = self.select(model, tried, affinity_key)
+        if endpoint is None:
+            raise ConnectionError(f"No healthy endpoint in pool '{self._provider_id}' for model '{model}'")
+        return endpoint
+
+    @staticmethod
+    def _endpoint_failed(endpoint: PoolEndpoint, error: Exception) -> bool:
+        """Take *endpoint* out of rotation if *error* means it is down; return whether it was."""
+        if classify_error(error) in (ErrorClass.UNAVAILABLE, ErrorClass.TIMEOUT):
+            endpoint.healthy = False
+            endpoint.loaded_models.clear()
+            return True
+        return False
+
+    async def is_healthy(self) -> bool:
+        """Probe every endpoint, refresh their loaded models, and report whether any is up."""
+        endpoints = list(self._endpoints.values())
+        results = await asyncio.gather(
+            *(e.provider.is_healthy() for e in endpoints), return_exceptions=True
+        )
+        for endpoint, result in zip(endpoints, results):
+            endpoint.healthy = result is True
+        up = [e for e in endpoints if e.healthy]
+        loaded = await asyncio.gather(
+            *(e.provider.get_loaded_models() for e in up), return_exceptions=True
+        )
+        for endpoint, models in zip(up, loaded):
+            if isinstance(models, list):
+                endpoint.loaded_models = set(models)
+        return bool(up)
+
+    def get_supported_models(self) -> List[str]:
+        endpoints = [e for e in self._endpoints.values() if e.healthy] or list(self._endpoints.values())
+        models: Dict[str, None] = {}
+        for endpoint in endpoints:
+            models.update(dict.fromkeys(endpoint.provider.get_supported_models()))
+        return list(models)
+
+    async def get_loaded_models(self) -> Optional[List[str]]:
+        models: Dict[str, None] = {}
+        for endpoint in self._endpoints.values():
+            if endpoint.healthy:
+                models.update(dict.fromkeys(sorted(endpoint.loaded_models)))
+        return list(models)
+
+    async def open(self) -> None:
+        for endpoint in self._endpoints.values():
+            await endpoint.provider.open()
+
+    async def aclose(self) -> None:
+        for endpoint in self._endpoints.values():
+            await endpoint.provider.aclose()
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, List, Optional
+
+
+@dataclass
+class RateLimit:
+    """
+    Requests-per-minute and tokens-per-minute budget for one provider or model.
+
+    Either limit may be ``None`` (unlimited). Buckets start full, so up to a
+    minute's worth of requests or tokens can be sent in a burst, and refill
+    continuously at ``limit / 60`` per second.
+    """
+
+    requests_per_minute: Optional[float] = None
+    tokens_per_minute: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        for name in ("requests_per_minute", "tokens_per_minute"):
+            value = getattr(self, name)
+            if value is not None and value <= 0:
+                raise ValueError(f"{name} must be > 0, got {value}")
+
+
+class TokenBucket:
+    """Continuously refilling bucket; the level may go negative to carry debt."""
+
+    def __init__(self, per_minute: float, *, clock: Callable[[], float] = time.monotonic) -> None:
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self._clock = clock
+        self._level = self.capacity
+        self._updated = clock()
+
+    @property
+    def level(self) -> float:
+        self._refill()
+        return self._level
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until *amount* can be taken; 0.0 if it can be taken now.
+
+        Requests larger than the whole bucket only wait for a full bucket, so
+        they are delayed rather than refused forever.
+        """
+        self._refill()
+        needed = min(amount, self.capacity) - self._level
+        return needed / self.rate if needed > 0 else 0.0
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        self._level -= amount
+
+    def give(self, amount: float) -> None:
+        self._refill()
+        self._level = min(self.capacity, self._level + amount)
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+@dataclass
+class _Budget:
+    requests: Optional[TokenBucket]
+    tokens: Optional[TokenBucket]
+
+    def buckets(self, tokens: float) -> List[tuple]:
+        pairs = []
+        if self.requests is not None:
+            pairs.append((self.requests, 1.0))
+        if self.tokens is not None and tokens:
+            pairs.append((self.tokens, tokens))
+        return pairs
+
+
+def retry_after_seconds(error: BaseException, default: float = 1.0) -> Optional[float]:
+    """How long a provider asked us to back off, or ``None`` if *error* is not a rate limit.
+
+    Looks for an HTTP response on *error* (as on ``httpx.HTTPStatusError``)
+    with status 429 or 503 and reads ``retry-after-ms`` or ``Retry-After``
+    (seconds or an HTTP date). A 429 without either header backs off for
+    *default* seconds.
+    """
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None)
+    if status not in (429, 503):
+        return None
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("retry-after-ms")
+    if value is not None:
+        try:
+            return max(float(value) / 1000, 0.0)
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if value is not None:
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            try:
+                return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+            except (TypeError, ValueError):
+                pass
+    return default if status == 429 else None
+
+
+class RateLimiter:
+    """
+    Client-side RPM/TPM token buckets per provider and per provider model.
+
+    Every call takes one request and its estimated tokens from the
+    provider's buckets and from the ``"provider:model"`` buckets. Token
+    reservations are settled against the real usage once the call returns.
+    :meth:`delay` lets candidate selection see which targets would have to
+    wait, and :meth:`acquire` queues callers in FIFO order per provider until
+    the budget allows. :meth:`block` pauses a provider or model entirely,
+    e.g. for a ``Retry-After`` header. Targets without limits are never
+    delayed.
+    """
+
+    def __init__(
+        self,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        self._clock = clock
+        self._sleep = sleep
+        self._budgets: Dict[str, _Budget] = {}
+        self._blocked_until: Dict[str, float] = {}
+        self._queues: Dict[str, asyncio.Lock] = {}
+
+    def set_provider_limit(self, provider_id: str, limit: Optional[RateLimit]) -> None:
+        self._set_limit(provider_id, limit)
+
+    def set_model_limit(self, provider_id: str, model: str, limit: Optional[RateLimit]) -> None:
+        self._set_limit(f"{provider_id}:{model}", limit)
+
+    def _set_limit(self, key: str, limit: Optional[RateLimit]) -> None:
+        if limit is None:
+            self._budgets.pop(key, None)
+            return
+
+        def bucket(per_minute: Optional[float]) -> Optional[TokenBucket]:
+            return TokenBucket(per_minute, clock=self._clock) if per_minute is not None else None
+
+        self._budgets[key] = _Budget(bucket(limit.requests_per_minute), bucket(limit.tokens_per_minute))
+
+    def block(self, provider_id: str, seconds: float, model: Optional[str] = None) -> None:
+        """Refuse calls to the provider (or one of its models) for *seconds*."""
+        key = provider_id if model is None else f"{provider_id}:{model}"
+        until = self._clock() + seconds
+        if until > self._blocked_until.get(key, 0.0):
+            self._blocked_until[key] = until
+
+    def delay(self, provider_id: str, model: str, tokens: float = 0) -> float:
+        """Seconds a call of *tokens* estimated tokens would wait; 0.0 if it could start now."""
+        now = self._clock()
+        wait = 0.0
+        for key in (provider_id, f"{provider_id}:{model}"):
+            wait = max(wait, self._blocked_until.get(key, 0.0) - now)
+            budget = self._budgets.get(key)
+            if budget is not None:
+                for bucket, amount in budget.buckets(tokens):
+                    wait = max(wait, bucket.wait_time(amount))
+        return wait
+
+    def try_acquire(self, provider_id: str, model: str, tokens: float = 0) -> bool:
+        """Take the budget for one call if it is available right now."""
+        if self.delay(provider_id, model, tokens) > 0:
+            return False
+        self._take(provider_id, model, tokens)
+        return True
+
+    async def acquire(self, provider_id: str, model: str, tokens: float = 0) -> None:
+        """Wait until one call of *tokens* estimated tokens fits the budget, then take it."""
+        queue = self._queues.get(provider_id)
+        if (queue is None or not queue.locked()) and self.try_acquire(provider_id, model, tokens):
+            return
+        if queue is None:
+            queue = self._queues[provider_id] = asyncio.Lock()
+        async with queue:
+            while True:
+                wait = self.delay(provider_id, model, tokens)
+                if wait <= 0:
+                    self._take(provider_id, model, tokens)
+                    return
+                await self._sleep(wait)
+
+    def settle(self, provider_id: str, model: str, reserved: float, actual: Optional[float]) -> None:
+        """Correct a token reservation once the call's real usage is known.
+
+        A missing or zero *actual* means the provider reported no usage (e.g.
+        some streams and Ollama builds); the reservation then stands.
+        """
+        if not actual or actual == reserved:
+            return
+        for key in (provider_id, f"{provider_id}:{model}"):
+            budget = self._budgets.get(key)
+            if budget is None or budget.tokens is None:
+                continue
+            if actual < reserved:
+                budget.tokens.give(reserved - actual)
+            else:
+                budget.tokens.take(actual - reserved)
+
+    def _take(self, provider_id: str, model: str, tokens: float) -> None:
+        for key in (provider_id, f"{provider_id}:{model}"):
+            budget = self._budgets.get(key)
+            if budget is not None:
+                for bucket, amount in budget.buckets(tokens):
+                    bucket.take(amount)
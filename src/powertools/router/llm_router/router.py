@@ -1,29 +1,369 @@
 import asyncio
 import time
-from typing import TYPE_CHECKING, List, Dict, Optional, Any
+from typing import TYPE_CHECKING, AsyncIterator, Iterable, Iterator, List, Dict, Optional, Any, Set, Tuple, Union
+
+from .affinity import PrefixAffinity, rendezvous_pick
+from .budget import BudgetAction, BudgetEnforcer, BudgetExceededError, BudgetRule, tags_of
 from .base import LLMProvider
-from .models import LLMResponse, ProviderType, RoutingDecision
+from .cache import ResponseCache, cache_key
+from .circuit_breaker import CircuitBreakerConfig, CircuitBreakerRegistry, CircuitOpenError
+from .concurrency import BatchResult, BatchTask, ConcurrencyLimiter
+from .fallback import Attempt, ErrorClass, FallbackPolicy, classify_error
+from .health import HealthMonitor
+from .hedging import HedgeController, HedgingPolicy
+from .model_index import ModelIndex
+from .rate_limit import RateLimit, RateLimiter, retry_after_seconds
+from .scheduling import Priority, PriorityScheduler, SchedulerConfig
+from .semantic_cache import SemanticCache
+from .singleflight import SingleFlight
+from .stats import ProviderStats
+from .models import LLMResponse, ProviderType, RoutingDecision, RoutingObjective, StreamChunk
+from .streaming import LLMStream
+from .token_cost_tracker import TokenCostTracker
+from ...utils.token_counter import TokenCounter, default_token_counter
 
 if TYPE_CHECKING:
     from powertools.model_registry import ModelRegistry
+    from ...model_registry.complexity import ComplexityEstimator
 
 
 class LLMRouter:
-    def __init__(self):
+    def __init__(self, health_monitor: Optional[HealthMonitor] = None):
         self._providers: Dict[str, LLMProvider] = {}
         self._default_local_model: Optional[str] = None
         self._default_cloud_model: Optional[str] = None
         self._model_registry: Optional["ModelRegistry"] = None
+        self._health = health_monitor or HealthMonitor()
+        self._health.add_probe_listener(self._on_health_probe)
+        self._model_index = ModelIndex()
+        self._limiter = ConcurrencyLimiter()
+        self._rate_limits = RateLimiter()
+        self._scheduler = PriorityScheduler()
+        self._affinity: Optional[PrefixAffinity] = None
+        self._complexity_estimator: Optional["ComplexityEstimator"] = None
+        self._default_complexity_estimator: Optional["ComplexityEstimator"] = None
+        self._token_counter: Optional[TokenCounter] = None
+        self._hedging: Optional[HedgeController] = None
+        self._cost_tracker: Optional[TokenCostTracker] = None
+        self._budgets: Optional[BudgetEnforcer] = None
+        self._response_cache: Optional[ResponseCache] = None
+        self._semantic_cache: Optional[SemanticCache] = None
+        self._singleflight: Optional[SingleFlight[LLMResponse]] = None
+        self._stats = ProviderStats()
+        self._objective = RoutingObjective.LATENCY
+        self._breakers = CircuitBreakerRegistry()
+        self._fallback = FallbackPolicy()
+        self._default_output_tokens = 256
+        self._decision_timeout: Optional[float] = None
 
     def register_provider(self, provider: LLMProvider):
         """Register a new LLM provider."""
         self._providers[provider.provider_id] = provider
+        self._health.track(provider)
+        self._model_index.update(provider.provider_id, provider.get_supported_models())
+
+    def refresh_models(self, provider_id: Optional[str] = None) -> None:
+        """Re-read ``get_supported_models()`` into the model index.
+
+        Called automatically after every health probe (which is when providers
+        such as Ollama refresh their model lists); call it directly after
+        changing a provider's models out of band.
+        """
+        providers = [self._providers[provider_id]] if provider_id else self._providers.values()
+        for provider in providers:
+            self._model_index.update(provider.provider_id, provider.get_supported_models())
+
+    def _on_health_probe(self, provider: LLMProvider, healthy: bool) -> None:
+        if self._providers.get(provider.provider_id) is provider:
+            self._model_index.update(provider.provider_id, provider.get_supported_models())
+
+    def configure_circuit_breakers(self, config: CircuitBreakerConfig) -> None:
+        """Replace the circuit breakers with fresh ones using *config*."""
+        self._breakers = CircuitBreakerRegistry(config)
+
+    @property
+    def circuit_breakers(self) -> CircuitBreakerRegistry:
+        """Per-provider and per-(provider, model) breakers; see ``states()`` and ``transitions``."""
+        return self._breakers
+
+    @property
+    def stats(self) -> ProviderStats:
+        """Online latency/throughput/error stats that drive candidate selection."""
+        return self._stats
+
+    @property
+    def model_index(self) -> ModelIndex:
+        """Model-to-provider index used for ``required_model`` and registry routing."""
+        return self._model_index
+
+    @property
+    def health(self) -> HealthMonitor:
+        """Cached provider health used for routing decisions."""
+        return self._health
 
     def set_defaults(self, local_model: str, cloud_model: str):
         """Set default models for local and cloud routing."""
         self._default_local_model = local_model
         self._default_cloud_model = cloud_model
 
+    def set_concurrency_limits(
+        self,
+        provider_limits: Optional[Dict[str, int]] = None,
+        model_limits: Optional[Dict[str, int]] = None,
+    ) -> None:
+        """Cap concurrent calls per provider id and/or per model name.
+
+        Limits apply to every call the router makes (``route``, ``route_stream``,
+        ``route_many`` and fallbacks); callers beyond the cap wait for a slot.
+        """
+        for provider_id, limit in (provider_limits or {}).items():
+            self._limiter.set_provider_limit(provider_id, limit)
+        for model, limit in (model_limits or {}).items():
+            self._limiter.set_model_limit(model, limit)
+
+    @property
+    def concurrency(self) -> ConcurrencyLimiter:
+        return self._limiter
+
+    def set_scheduling(
+        self,
+        capacities: Dict[str, int],
+        config: Optional[SchedulerConfig] = None,
+    ) -> None:
+        """Schedule calls to the given providers across priority lanes.
+
+        Each provider in *capacities* runs at most that many calls at once;
+        callers beyond that queue in the lane given by ``route(...,
+        priority=...)`` and are released by weighted fair queuing, with
+        interactive work able to hold bulk work back (see
+        :class:`SchedulerConfig`).
+        """
+        self._scheduler = PriorityScheduler(capacities, config)
+
+    @property
+    def scheduler(self) -> PriorityScheduler:
+        return self._scheduler
+
+    def set_decision_timeout(self, seconds: Optional[float]) -> None:
+        """Bound how long a routing decision may wait on health probes.
+
+        Every candidate with stale health is probed at once; those that have
+        not answered within *seconds* are skipped for this decision. ``None``
+        uses the health monitor's ``probe_timeout_seconds``.
+        """
+        self._decision_timeout = seconds
+
+    def set_affinity(self, prefix_chars: Optional[int] = 1024) -> None:
+        """Route requests sharing a prompt prefix or session to the same instance.
+
+        Keeps llama.cpp/vLLM prompt-prefix KV caches warm for agent loops.
+        A request's key is the ``session_key`` passed to :meth:`route`, or a
+        hash of the first *prefix_chars* characters of the prompt. Among the
+        healthy candidates for the chosen model, and among the endpoints of a
+        :class:`ProviderPool`, the key is mapped by rendezvous hashing, so it
+        only moves when its instance drops out. ``None`` disables affinity.
+        Hit rates are in ``affinity.stats``.
+        """
+        self._affinity = PrefixAffinity(prefix_chars) if prefix_chars is not None else None
+
+    @property
+    def affinity(self) -> Optional[PrefixAffinity]:
+        return self._affinity
+
+    def set_rate_limits(
+        self,
+        provider_limits: Optional[Dict[str, RateLimit]] = None,
+        model_limits: Optional[Dict[str, RateLimit]] = None,
+    ) -> None:
+        """Set client-side RPM/TPM limits per provider id and/or per ``"provider:model"``.
+
+        Each call reserves one request plus its estimated prompt and output
+        tokens (``max_tokens`` or the default output length). Candidate
+        selection prefers targets with budget left and only queues on a
+        throttled one when every candidate is throttled. ``429`` and ``503``
+        responses pause the provider for their ``Retry-After`` period
+        without counting against its health.
+        """
+        for provider_id, limit in (provider_limits or {}).items():
+            self._rate_limits.set_provider_limit(provider_id, limit)
+        for full_name, limit in (model_limits or {}).items():
+            provider_id, _, model = full_name.partition(":")
+            self._rate_limits.set_model_limit(provider_id, model, limit)
+
+    @property
+    def rate_limits(self) -> RateLimiter:
+        return self._rate_limits
+
+    def enable_hedging(self, policy: Optional[HedgingPolicy] = None) -> None:
+        """Opt in to hedged requests in :meth:`route`.
+
+        If the primary call has not answered within the policy's latency
+        percentile for that provider/model, a second request is sent to the
+        next candidate (registry, then fallback, then optionally the same
+        target). The first successful response wins and the other call is
+        cancelled. Hedges are reported to the attached
+        :class:`TokenCostTracker`, if any.
+        """
+        self._hedging = HedgeController(policy or HedgingPolicy())
+
+    def disable_hedging(self) -> None:
+        self._hedging = None
+
+    def set_cost_tracker(self, tracker: TokenCostTracker) -> None:
+        """Attach a :class:`TokenCostTracker` for pricing and usage accounting.
+
+        Once attached, every provider call whose model has registered pricing
+        is recorded with :meth:`TokenCostTracker.record_usage` and its cost is
+        written to ``LLMResponse.cost``; routing decisions get an
+        ``estimated_cost``. Register zero pricing for local models to have
+        them tracked too.
+        """
+        self._cost_tracker = tracker
+        if self._budgets is not None:
+            self._budgets = BudgetEnforcer(tracker.windows, self._budgets.rules)
+
+    def set_budgets(self, rules: Iterable[BudgetRule]) -> None:
+        """Enforce spend/token limits over sliding windows before each dispatch.
+
+        Rules are checked against the attached cost tracker's
+        :attr:`TokenCostTracker.windows`, so only calls to models with
+        registered pricing count. Calls are tagged with ``provider=<id>`` and
+        the ``tags`` passed to :meth:`route`. When a rule in scope is over its
+        limit the request is refused with :class:`BudgetExceededError` or,
+        for ``DOWNGRADE`` rules, routed to the rule's ``downgrade_to`` model
+        (default: the local model) if that is within budget. Fallback
+        attempts are not re-checked.
+        """
+        if self._cost_tracker is None:
+            raise ValueError("set_budgets() needs a cost tracker; call set_cost_tracker() first")
+        self._budgets = BudgetEnforcer(self._cost_tracker.windows, rules)
+
+    @property
+    def budgets(self) -> Optional[BudgetEnforcer]:
+        return self._budgets
+
+    def set_routing_objective(
+        self,
+        objective: RoutingObjective,
+        *,
+        default_output_tokens: Optional[int] = None,
+    ) -> None:
+        """Choose what candidate selection optimises.
+
+        ``LATENCY`` (default) picks the lowest expected latency. ``COST``
+        picks the lowest expected cost, using the attached tracker's pricing,
+        with latency as the tie-breaker; with a registry attached, every
+        model at or above the task's preferred tier is considered, so the
+        cheapest model meeting that quality floor wins. Output length is
+        taken from a ``max_tokens`` kwarg when given, else
+        *default_output_tokens*.
+        """
+        self._objective = RoutingObjective(objective)
+        if default_output_tokens is not None:
+            self._default_output_tokens = default_output_tokens
+
+    def set_response_cache(self, cache: Optional[ResponseCache]) -> None:
+        """Serve repeated :meth:`route` calls from *cache* (``None`` disables caching).
+
+        Entries are keyed on the normalised prompt, the provider and model
+        that answered, and the generation kwargs. The cache is consulted for
+        the routed target before :meth:`set_budgets` rules can downgrade it,
+        so a cached answer is still served once a budget is exhausted.
+        Cached responses carry ``metadata["cache_hit"] = True`` and a ``cost`` of 0.
+        """
+        self._response_cache = cache
+
+    @property
+    def response_cache(self) -> Optional[ResponseCache]:
+        return self._response_cache
+
+    def set_semantic_cache(self, cache: Optional[SemanticCache]) -> None:
+        """Answer paraphrased prompts from *cache* for the task types it allows.
+
+        Consulted after the exact-match cache misses and only when ``route``
+        is given a ``task_type`` the cache has a threshold for. Hits carry
+        ``metadata["cache"] = "semantic"`` and the similarity score.
+        """
+        self._semantic_cache = cache
+
+    @property
+    def semantic_cache(self) -> Optional[SemanticCache]:
+        return self._semantic_cache
+
+    def set_request_coalescing(self, enabled: bool = True) -> None:
+        """Collapse identical concurrent :meth:`route` calls into one provider call.
+
+        Requests are identical when they share the cache key (normalised
+        prompt, routed provider/model and generation kwargs), the priority
+        lane and the usage tags. Waiters that joined an in-flight call get
+        their own copy of its response tagged ``metadata["coalesced"] = True``
+        and give up at their own deadline.
+        """
+        self._singleflight = SingleFlight() if enabled else None
+
+    @property
+    def coalesced_requests(self) -> int:
+        """Number of :meth:`route` calls served by joining an identical in-flight call."""
+        return self._singleflight.coalesced if self._singleflight is not None else 0
+
+    def set_fallback_policy(self, policy: FallbackPolicy) -> None:
+        """Configure fallback chains, the attempt budget and request deadlines.
+
+        See :class:`FallbackPolicy`. Failed attempts are classified with
+        :func:`classify_error`: bad requests are raised immediately, auth
+        failures skip the rest of that provider, everything else moves on to
+        the next target in the chain. Every response carries the attempts it
+        took in ``metadata["attempts"]``.
+        """
+        self._fallback = policy
+
+    def set_fallback_chain(self, task_type: str, targets: List[str]) -> None:
+        """Set the fallback targets (``"provider:model"`` or model names) for *task_type*."""
+        self._fallback.chains[task_type] = list(targets)
+
+    @property
+    def fallback_policy(self) -> FallbackPolicy:
+        return self._fallback
+
+    def set_complexity_estimator(self, estimator: Optional["ComplexityEstimator"]) -> None:
+        """Score prompts with *estimator* when ``route`` is called without ``complexity``.
+
+        By default the attached registry's ``complexity_estimator`` is used,
+        or a built-in untrained one without a registry.
+        """
+        self._complexity_estimator = estimator
+
+    @property
+    def complexity_estimator(self) -> "ComplexityEstimator":
+        if self._complexity_estimator is not None:
+            return self._complexity_estimator
+        if self._model_registry is not None:
+            return self._model_registry.complexity_estimator
+        if self._default_complexity_estimator is None:
+            from ...model_registry.complexity import ComplexityEstimator
+
+            self._default_complexity_estimator = ComplexityEstimator()
+        return self._default_complexity_estimator
+
+    def set_token_counter(self, counter: Optional[TokenCounter]) -> None:
+        """Count prompt tokens for rate limits and cost ranking with *counter*.
+
+        By default the attached cost tracker's counter is used, so routing
+        and pricing agree, or the shared :func:`default_token_counter`
+        without a tracker. After each call the provider-reported prompt
+        tokens calibrate the counter's estimate for models ``tiktoken`` does
+        not cover.
+        """
+        self._token_counter = counter
+
+    @property
+    def token_counter(self) -> TokenCounter:
+        if self._token_counter is not None:
+            return self._token_counter
+        if self._cost_tracker is not None:
+            return self._cost_tracker.token_counter
+        return default_token_counter()
+
     def set_model_registry(self, registry: "ModelRegistry") -> None:
         """Attach a :class:`~powertools.model_registry.ModelRegistry` for tier-aware routing.
 
@@ -33,12 +373,38 @@ class LLMRouter:
         """
         self._model_registry = registry
 
+    async def start(self) -> None:
+        """Open long-lived provider resources, load tokenizers and start background health probing."""
+        models = {self._default_local_model, self._default_cloud_model} - {None}
+        for provider in self._providers.values():
+            await provider.open()
+            models.update(provider.get_supported_models())
+        await self.token_counter.preload(models)
+        self._health.start()
+
+    async def aclose(self) -> None:
+        """Stop health probing and release provider resources."""
+        await self._health.stop()
+        for provider in self._providers.values():
+            await provider.aclose()
+
+    async def __aenter__(self) -> "LLMRouter":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
     async def route(
         self,
         task: str,
-        complexity: float = 0.0,
+        complexity: Optional[float] = None,
         required_model: Optional[str] = None,
         task_type: Optional[str] = None,
+        deadline_seconds: Optional[float] = None,
+        priority: Union[Priority, str] = Priority.STANDARD,
+        session_key: Optional[str] = None,
+        tags: Optional[Dict[str, str]] = None,
         **kwargs
     ) -> LLMResponse:
         """
@@ -46,110 +412,893 @@ class LLMRouter:
         
         Args:
             task: The prompt or task description.
-            complexity: Score from 0.0 to 1.0 indicating task difficulty.
+            complexity: Score from 0.0 to 1.0 indicating task difficulty. When
+                omitted it is estimated from the prompt by
+                :attr:`complexity_estimator`.
             required_model: If specified, bypasses routing logic to use this model.
             task_type: Optional task category (e.g. ``"coding"``, ``"summarise"``).
                 When a :class:`~powertools.model_registry.ModelRegistry` is attached
                 via :meth:`set_model_registry`, the router uses this to perform
                 tier-aware model selection before falling back to complexity routing.
+            deadline_seconds: Overall time budget for the request including
+                fallbacks; defaults to the fallback policy's ``deadline_seconds``.
+                Raises :class:`asyncio.TimeoutError` when exhausted.
+            priority: Scheduling lane (``"interactive"``, ``"standard"`` or
+                ``"bulk"``) for providers configured with :meth:`set_scheduling`.
+            session_key: Affinity key for :meth:`set_affinity`; defaults to the
+                prompt prefix.
+            tags: ``key=value`` labels stored in the usage record's metadata,
+                for windowed usage breakdowns and :meth:`set_budgets` rules.
         """
         start_time = time.perf_counter()
+        deadline = self._deadline(start_time, deadline_seconds)
+        priority = Priority(priority)
         
         # 1. Decide which provider and model to use
-        decision = await self._make_routing_decision(task, complexity, required_model, task_type)
+        decision = await self._make_routing_decision(
+            task, complexity, required_model, task_type, kwargs.get("max_tokens"),
+            self._affinity_key(task, session_key),
+        )
+        key = None
+        if self._response_cache is not None or self._singleflight is not None:
+            key = cache_key(task, decision.model, decision.provider_id, kwargs)
+
+        # 2. Serve a cached answer for the routed target before budgets
+        #    (a cache hit costs nothing) can downgrade it
+        cached = await self._cached_response(task, decision, task_type, key, start_time)
+        if cached is not None:
+            cached.metadata["decision_ms"] = (time.perf_counter() - start_time) * 1000
+            return cached
+
+        budgeted = await self._apply_budgets(task, decision, tags, kwargs.get("max_tokens"))
+        downgraded = (budgeted.provider_id, budgeted.model) != (decision.provider_id, decision.model)
+        decision = budgeted
+        if downgraded and key is not None:
+            key = cache_key(task, decision.model, decision.provider_id, kwargs)
+        decision_ms = (time.perf_counter() - start_time) * 1000
         
         provider = self._providers.get(decision.provider_id)
         if not provider:
             raise ValueError(f"Provider {decision.provider_id} not found.")
 
-        # 2. Execute the call
-        try:
-            response = await provider.generate(task, decision.model, **kwargs)
-            response.latency_ms = (time.perf_counter() - start_time) * 1000
+        if self._singleflight is None:
+            response = await self._execute(
+                task, decision, task_type, key, start_time, deadline, priority, downgraded, **kwargs
+            )
+            response.metadata["decision_ms"] = decision_ms
             return response
+
+        # Only requests in the same lane with the same usage tags share a call.
+        flight_key = "|".join([key, priority.value, *sorted(tags_of(decision.tags))])
+        joined = self._singleflight.in_flight(flight_key)
+        flight = self._singleflight.do(
+            flight_key,
+            lambda: self._execute(
+                task, decision, task_type, key, start_time, deadline, priority, downgraded, **kwargs
+            ),
+        )
+        if joined and deadline is not None:
+            # A joiner waits no longer than its own deadline; leaving does not
+            # cancel the shared call while others still wait on it.
+            flight = asyncio.wait_for(flight, max(deadline - time.perf_counter(), 0.0))
+        response = await flight
+        if joined:
+            response = response.model_copy(deep=True)
+            response.metadata["coalesced"] = True
+            response.latency_ms = (time.perf_counter() - start_time) * 1000
+        response.metadata["decision_ms"] = decision_ms
+        return response
+
+    async def _execute(
+        self,
+        task: str,
+        decision: RoutingDecision,
+        task_type: Optional[str],
+        key: Optional[str],
+        start_time: float,
+        deadline: Optional[float] = None,
+        priority: Priority = Priority.STANDARD,
+        check_cache: bool = False,
+        **kwargs
+    ) -> LLMResponse:
+        """Serve *decision* by calling the provider (with fallback) and cache the answer.
+
+        With *check_cache* (the decision was downgraded after the caches were
+        consulted), the caches are checked again for the new target first.
+        """
+        if check_cache:
+            cached = await self._cached_response(task, decision, task_type, key, start_time)
+            if cached is not None:
+                return cached
+
+        # 3. Execute the call, walking the fallback chain on failure
+        response, served = await self._call_with_fallback(
+            task, decision, task_type, deadline, priority, **kwargs
+        )
+        response.latency_ms = (time.perf_counter() - start_time) * 1000
+
+        # Cache under the target that answered, which a fallback may have changed.
+        cache = self._response_cache
+        if cache is not None:
+            if (served.provider_id, served.model) != (decision.provider_id, decision.model):
+                key = cache_key(task, served.model, served.provider_id, kwargs)
+            await cache.aset(key, response)
+        semantic = self._semantic_cache
+        if semantic is not None and semantic.applies(task_type):
+            await semantic.store(
+                task, response, task_type=task_type, provider_id=served.provider_id, model=served.model
+            )
+        return response
+
+    async def _cached_response(
+        self,
+        task: str,
+        decision: RoutingDecision,
+        task_type: Optional[str],
+        key: Optional[str],
+        start_time: float,
+    ) -> Optional[LLMResponse]:
+        """Look *decision*'s target up in the exact, then the semantic cache."""
+        cached = None
+        if self._response_cache is not None:
+            cached = await self._response_cache.aget(key)
+            if cached is not None:
+                cached.metadata["cache"] = "exact"
+        semantic = self._semantic_cache
+        if cached is None and semantic is not None and semantic.applies(task_type):
+            cached = await semantic.lookup(
+                task, task_type=task_type, provider_id=decision.provider_id, model=decision.model
+            )
+            if cached is not None:
+                cached.metadata["cache"] = "semantic"
+        if cached is not None:
+            cached.latency_ms = (time.perf_counter() - start_time) * 1000
+        return cached
+
+    async def _call_with_fallback(
+        self,
+        task: str,
+        decision: RoutingDecision,
+        task_type: Optional[str],
+        deadline: Optional[float],
+        priority: Priority = Priority.STANDARD,
+        **kwargs
+    ) -> Tuple[LLMResponse, RoutingDecision]:
+        """Call *decision*'s target, then each fallback target in turn until one succeeds.
+
+        Returns the response and the decision for the target that produced it.
+        Re-raises the last error once the chain, the attempt budget or the
+        deadline runs out, or straight away for errors no target would accept.
+        """
+        attempts: List[Attempt] = []
+        tried: Set[Tuple[str, str]] = set()
+        excluded: Set[str] = set()
+        target = decision
+        while True:
+            attempt_start = time.perf_counter()
+            try:
+                if self._hedging is not None and not attempts:
+                    response, served = await self._generate_hedged(
+                        task, target, task_type, deadline=deadline, priority=priority, **kwargs
+                    )
+                else:
+                    response = await self._generate(task, target, deadline=deadline, priority=priority, **kwargs)
+                    served = target
+            except Exception as e:
+                error_class = classify_error(e)
+                attempts.append(Attempt(
+                    provider=target.provider_id,
+                    model=target.model,
+                    ok=False,
+                    latency_ms=(time.perf_counter() - attempt_start) * 1000,
+                    error=str(e) or type(e).__name__,
+                    error_class=error_class,
+                ))
+                tried.add((target.provider_id, target.model))
+                if error_class == ErrorClass.AUTH:
+                    excluded.add(target.provider_id)
+                if (
+                    not error_class.retryable
+                    or len(attempts) >= self._fallback.max_attempts
+                    or (deadline is not None and time.perf_counter() >= deadline)
+                ):
+                    raise
+                fallback = await self._fallback_decision(target, task_type, tried, excluded)
+                if fallback is None:
+                    raise
+                target = fallback
+                continue
+            attempts.append(Attempt(
+                provider=served.provider_id,
+                model=served.model,
+                ok=True,
+                latency_ms=(time.perf_counter() - attempt_start) * 1000,
+            ))
+            response.metadata["attempts"] = [attempt.as_dict() for attempt in attempts]
+            return response, served
+
+    def _deadline(self, start_time: float, deadline_seconds: Optional[float]) -> Optional[float]:
+        if deadline_seconds is None:
+            deadline_seconds = self._fallback.deadline_seconds
+        return None if deadline_seconds is None else start_time + deadline_seconds
+
+    def _attempt_timeout(self, deadline: Optional[float]) -> Tuple[Optional[float], bool]:
+        """Time allowed for the next attempt, and whether the request deadline is what bounds it.
+
+        Raises if the deadline has already passed.
+        """
+        timeout = self._fallback.attempt_timeout_seconds
+        if deadline is not None:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                raise asyncio.TimeoutError("Request deadline exceeded")
+            if timeout is None or remaining < timeout:
+                return remaining, True
+        return timeout, False
+
+    async def _generate(
+        self,
+        task: str,
+        decision: RoutingDecision,
+        *,
+        deadline: Optional[float] = None,
+        priority: Priority = Priority.STANDARD,
+        **kwargs
+    ) -> LLMResponse:
+        """Run one provider call for *decision*, updating health and latency stats."""
+        provider = self._providers[decision.provider_id]
+        timeout, deadline_bound = self._attempt_timeout(deadline)
+        self._admit(decision)
+        reserved = self._reserved_tokens(task, decision.model, kwargs)
+        call_start = time.perf_counter()
+        try:
+            call = self._invoke(provider, task, decision, reserved, priority, **kwargs)
+            response = await (call if timeout is None else asyncio.wait_for(call, timeout))
+        except asyncio.TimeoutError as e:
+            if deadline_bound and time.perf_counter() >= deadline:
+                # The caller ran out of patience, which says nothing about the
+                # provider; keep it in rotation for everyone else.
+                self._breakers.release(decision.provider_id, decision.model)
+            else:
+                self._record_failure(decision, e)
+            raise
         except Exception as e:
-            # 3. Fallback logic
-            return await self._handle_fallback(task, decision, e, **kwargs)
+            self._record_failure(decision, e)
+            raise
+        except BaseException:
+            self._breakers.release(decision.provider_id, decision.model)
+            raise
+        call_ms = (time.perf_counter() - call_start) * 1000
+        self._health.mark_healthy(decision.provider_id)
+        self._breakers.record_success(decision.provider_id, decision.model, call_ms)
+        self._rate_limits.settle(
+            decision.provider_id, decision.model, reserved, response.usage.get("total_tokens")
+        )
+        self._record_affinity(decision, response)
+        self._stats.record_success(
+            decision.provider_id, decision.model, call_ms, response.usage.get("completion_tokens", 0)
+        )
+        if self._hedging is not None:
+            self._hedging.record(decision.provider_id, decision.model, call_ms)
+        self.token_counter.observe(task, decision.model, response.usage.get("prompt_tokens"))
+        self._record_usage(decision, response.usage, response)
+        return response
+
+    async def _invoke(
+        self,
+        provider: LLMProvider,
+        task: str,
+        decision: RoutingDecision,
+        reserved: int,
+        priority: Priority,
+        **kwargs
+    ) -> LLMResponse:
+        async with self._scheduler.slot(decision.provider_id, priority):
+            await self._rate_limits.acquire(decision.provider_id, decision.model, reserved)
+            async with self._limiter.acquire(decision.provider_id, decision.model):
+                return await provider.generate(
+                    task, decision.model, **self._provider_kwargs(provider, decision, kwargs)
+                )
+
+    @staticmethod
+    def _provider_kwargs(
+        provider: LLMProvider, decision: RoutingDecision, kwargs: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        if decision.affinity_key is None or not provider.supports_affinity:
+            return kwargs
+        return {**kwargs, "affinity_key": decision.affinity_key}
+
+    def _affinity_key(self, task: str, session_key: Optional[str]) -> Optional[str]:
+        return self._affinity.key_for(task, session_key) if self._affinity is not None else None
+
+    def _record_affinity(self, decision: RoutingDecision, response: Optional[LLMResponse] = None) -> None:
+        if self._affinity is None or decision.affinity_key is None:
+            return
+        instance = f"{decision.provider_id}:{decision.model}"
+        endpoint = response.metadata.get("endpoint") if response is not None else None
+        if endpoint:
+            instance = f"{instance}@{endpoint}"
+        self._affinity.record(decision.affinity_key, instance)
+
+    def _admit(self, decision: RoutingDecision) -> None:
+        """Reserve a circuit-breaker slot for *decision* or raise :class:`CircuitOpenError`."""
+        if not self._breakers.try_acquire(decision.provider_id, decision.model):
+            raise CircuitOpenError(
+                f"Circuit open for {decision.provider_id}:{decision.model}"
+            )
+
+    def _reserved_tokens(self, task: str, model: str, kwargs: Dict[str, Any]) -> int:
+        return self.token_counter.count(task, model) + (kwargs.get("max_tokens") or self._default_output_tokens)
+
+    def _record_failure(self, decision: RoutingDecision, error: Exception) -> None:
+        self._stats.record_error(decision.provider_id, decision.model)
+        retry_after = retry_after_seconds(error)
+        if retry_after is not None:
+            # Throttled, not down: back off without touching health or the breaker.
+            self._rate_limits.block(decision.provider_id, retry_after)
+            self._breakers.release(decision.provider_id, decision.model)
+            return
+        if classify_error(error) not in (ErrorClass.UNAVAILABLE, ErrorClass.TIMEOUT):
+            # A bad request or rejected credentials say nothing about whether
+            # the provider is up; fail the call without rerouting later traffic.
+            self._breakers.release(decision.provider_id, decision.model)
+            return
+        self._health.mark_unhealthy(decision.provider_id, error)
+        self._breakers.record_failure(decision.provider_id, decision.model)
+
+    def _record_usage(
+        self,
+        decision: RoutingDecision,
+        usage: Dict[str, int],
+        response: Optional[LLMResponse] = None,
+    ) -> None:
+        """Record a completed call into the cost tracker and stamp its cost on *response*."""
+        tracker = self._cost_tracker
+        if tracker is None or not tracker.has_pricing(decision.model):
+            return
+        record = tracker.record_usage(
+            model=decision.model,
+            input_tokens=usage.get("prompt_tokens", 0),
+            output_tokens=usage.get("completion_tokens", 0),
+            metadata=self._usage_metadata(decision),
+        )
+        if response is not None:
+            response.cost = record.cost
+
+    @staticmethod
+    def _usage_metadata(decision: RoutingDecision) -> Dict[str, str]:
+        return {**decision.tags, "provider": decision.provider_id}
+
+    async def _apply_budgets(
+        self,
+        task: str,
+        decision: RoutingDecision,
+        tags: Optional[Dict[str, str]],
+        expected_output_tokens: Optional[int] = None,
+    ) -> RoutingDecision:
+        """Attach *tags* to *decision* and enforce :meth:`set_budgets` rules on it."""
+        if tags:
+            decision.tags = dict(tags)
+        budgets = self._budgets
+        if budgets is None:
+            return decision
+        exceeded = budgets.check(decision.model, tags_of(self._usage_metadata(decision)))
+        if exceeded is None:
+            return decision
+        rule, usage = exceeded
+        target = rule.downgrade_to or self._default_local_model
+        if rule.action == BudgetAction.DOWNGRADE and target and target != decision.model:
+            try:
+                downgraded = await self._make_routing_decision(
+                    task, 0.0, target, None, expected_output_tokens, decision.affinity_key
+                )
+            except RuntimeError:
+                downgraded = None
+            if downgraded is not None and downgraded.model == target:
+                downgraded.tags = decision.tags
+                if budgets.check(target, tags_of(self._usage_metadata(downgraded))) is None:
+                    downgraded.reason = (
+                        f"Downgraded from {decision.model}: {rule.window.value} budget exceeded"
+                    )
+                    return downgraded
+        raise BudgetExceededError(rule, usage)
+
+    async def _generate_hedged(
+        self,
+        task: str,
+        decision: RoutingDecision,
+        task_type: Optional[str],
+        *,
+        deadline: Optional[float] = None,
+        priority: Priority = Priority.STANDARD,
+        **kwargs
+    ) -> Tuple[LLMResponse, RoutingDecision]:
+        assert self._hedging is not None
+        primary = asyncio.ensure_future(
+            self._generate(task, decision, deadline=deadline, priority=priority, **kwargs)
+        )
+        hedge: Optional[asyncio.Future] = None
+        try:
+            delay = self._hedging.delay_seconds(decision.provider_id, decision.model)
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done:
+                return primary.result(), decision
+
+            hedge_decision = await self._hedge_decision(decision, task_type)
+            if hedge_decision is None:
+                return await primary, decision
+            hedge = asyncio.ensure_future(
+                self._generate(task, hedge_decision, deadline=deadline, priority=priority, **kwargs)
+            )
+
+            pending = {primary, hedge}
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for finished in done:
+                    if finished.exception() is not None:
+                        error = error or finished.exception()
+                        continue
+                    response = finished.result()
+                    hedge_won = finished is hedge
+                    response.metadata["hedged"] = True
+                    response.metadata["hedge_won"] = hedge_won
+                    if self._cost_tracker is not None:
+                        self._cost_tracker.record_hedge(
+                            primary_model=decision.model,
+                            hedge_model=hedge_decision.model,
+                            hedge_won=hedge_won,
+                            input_tokens=response.usage.get("prompt_tokens", 0),
+                        )
+                    return response, (hedge_decision if hedge_won else decision)
+            assert error is not None
+            raise error
+        finally:
+            for call in (primary, hedge):
+                if call is not None and not call.done():
+                    call.cancel()
+
+    async def _hedge_decision(
+        self,
+        decision: RoutingDecision,
+        task_type: Optional[str],
+    ) -> Optional[RoutingDecision]:
+        """Pick a second target for a hedge request, or ``None`` to skip hedging."""
+        fallback = await self._fallback_decision(decision, task_type)
+        if fallback is not None:
+            return fallback.model_copy(
+                update={"reason": f"Hedge for {decision.provider_id}:{decision.model}"}
+            )
+
+        assert self._hedging is not None
+        if self._hedging.policy.allow_same_target and not self._breakers.is_open(
+            decision.provider_id, decision.model
+        ):
+            return decision.model_copy(update={"reason": "Hedge duplicate of primary"})
+        return None
+
+    async def route_many(
+        self,
+        tasks: Iterable[Union[str, BatchTask]],
+        *,
+        max_in_flight: int = 32,
+    ) -> AsyncIterator[BatchResult]:
+        """
+        Route many tasks concurrently, yielding results in completion order.
+
+        *tasks* is consumed lazily and at most *max_in_flight* items are
+        being routed at any time, so arbitrarily large (or generated) batches
+        use bounded memory. Per-provider/per-model limits from
+        :meth:`set_concurrency_limits` still apply on top. A failing item is
+        reported as a :class:`BatchResult` with ``error`` set instead of
+        aborting the batch. Closing the iterator early cancels in-flight work.
+        """
+        if max_in_flight < 1:
+            raise ValueError(f"max_in_flight must be >= 1, got {max_in_flight}")
+
+        items = enumerate(tasks)
+        pending: Set[asyncio.Task] = set()
+
+        def submit() -> bool:
+            try:
+                index, item = next(items)
+            except StopIteration:
+                return False
+            batch_task = item if isinstance(item, BatchTask) else BatchTask(task=item)
+            pending.add(asyncio.ensure_future(self._route_batch_item(index, batch_task)))
+            return True
+
+        try:
+            while len(pending) < max_in_flight and submit():
+                pass
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                pending.difference_update(done)
+                for finished in done:
+                    submit()
+                    yield finished.result()
+        finally:
+            for unfinished in pending:
+                unfinished.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _route_batch_item(self, index: int, item: BatchTask) -> BatchResult:
+        try:
+            response = await self.route(
+                item.task,
+                complexity=item.complexity,
+                required_model=item.required_model,
+                task_type=item.task_type,
+                priority=item.priority,
+                tags=item.tags,
+                **item.kwargs,
+            )
+        except Exception as e:
+            return BatchResult(index=index, task=item, error=e)
+        return BatchResult(index=index, task=item, response=response)
+
+    def route_stream(
+        self,
+        task: str,
+        complexity: Optional[float] = None,
+        required_model: Optional[str] = None,
+        task_type: Optional[str] = None,
+        priority: Union[Priority, str] = Priority.STANDARD,
+        session_key: Optional[str] = None,
+        tags: Optional[Dict[str, str]] = None,
+        **kwargs
+    ) -> LLMStream:
+        """
+        Route a task like :meth:`route`, but stream the completion as it is generated.
+
+        Returns an :class:`LLMStream` to ``async for`` over; its ``response``
+        attribute holds the assembled :class:`LLMResponse` once the stream is
+        exhausted. If the chosen provider fails before producing its first
+        token the usual fallback applies; failures after that are raised.
+        """
+        stream = LLMStream()
+        stream._chunks = self._stream_chunks(
+            stream, task, complexity, required_model, task_type, Priority(priority), session_key, tags, **kwargs
+        )
+        return stream
+
+    async def _stream_chunks(
+        self,
+        stream: LLMStream,
+        task: str,
+        complexity: Optional[float],
+        required_model: Optional[str],
+        task_type: Optional[str],
+        priority: Priority = Priority.STANDARD,
+        session_key: Optional[str] = None,
+        tags: Optional[Dict[str, str]] = None,
+        **kwargs
+    ) -> AsyncIterator[StreamChunk]:
+        start_time = time.perf_counter()
+        decision = await self._make_routing_decision(
+            task, complexity, required_model, task_type, kwargs.get("max_tokens"),
+            self._affinity_key(task, session_key),
+        )
+        decision = await self._apply_budgets(task, decision, tags, kwargs.get("max_tokens"))
+        decision_ms = (time.perf_counter() - start_time) * 1000
+
+        attempts: List[Attempt] = []
+        tried: Set[Tuple[str, str]] = set()
+        excluded: Set[str] = set()
+        while True:
+            provider = self._providers.get(decision.provider_id)
+            if not provider:
+                raise ValueError(f"Provider {decision.provider_id} not found.")
+
+            parts: List[str] = []
+            usage: Dict[str, int] = {}
+            reserved = self._reserved_tokens(task, decision.model, kwargs)
+            call_start = time.perf_counter()
+            admitted = False
+            try:
+                self._admit(decision)
+                admitted = True
+                async with self._scheduler.slot(decision.provider_id, priority):
+                    await self._rate_limits.acquire(decision.provider_id, decision.model, reserved)
+                    async with self._limiter.acquire(decision.provider_id, decision.model):
+                        async for chunk in provider.generate_stream(
+                            task, decision.model, **self._provider_kwargs(provider, decision, kwargs)
+                        ):
+                            if chunk.content:
+                                if stream.ttft_ms is None:
+                                    stream.ttft_ms = (time.perf_counter() - start_time) * 1000
+                                parts.append(chunk.content)
+                            elif not chunk.done:
+                                continue
+                            if chunk.done:
+                                usage = chunk.usage
+                            yield chunk
+            except Exception as e:
+                if admitted:
+                    self._record_failure(decision, e)
+                error_class = classify_error(e)
+                attempts.append(Attempt(
+                    provider=decision.provider_id,
+                    model=decision.model,
+                    ok=False,
+                    latency_ms=(time.perf_counter() - call_start) * 1000,
+                    error=str(e) or type(e).__name__,
+                    error_class=error_class,
+                ))
+                tried.add((decision.provider_id, decision.model))
+                if error_class == ErrorClass.AUTH:
+                    excluded.add(decision.provider_id)
+                if parts or not error_class.retryable or len(attempts) >= self._fallback.max_attempts:
+                    raise
+                fallback = await self._fallback_decision(decision, task_type, tried, excluded)
+                if fallback is None:
+                    raise
+                decision = fallback
+                continue
+            except BaseException:
+                if admitted:
+                    self._breakers.release(decision.provider_id, decision.model)
+                raise
+            break
+
+        call_ms = (time.perf_counter() - call_start) * 1000
+        attempts.append(Attempt(provider=decision.provider_id, model=decision.model, ok=True, latency_ms=call_ms))
+        self._health.mark_healthy(decision.provider_id)
+        self._breakers.record_success(decision.provider_id, decision.model, call_ms)
+        self._rate_limits.settle(decision.provider_id, decision.model, reserved, usage.get("total_tokens"))
+        self._record_affinity(decision)
+        self._stats.record_success(
+            decision.provider_id, decision.model, call_ms, usage.get("completion_tokens", 0)
+        )
+        stream.response = LLMResponse.trusted(
+            content="".join(parts),
+            model=decision.model,
+            provider=provider.provider_id,
+            provider_type=provider.provider_type,
+            usage=usage,
+            metadata={
+                "ttft_ms": stream.ttft_ms,
+                "streamed": True,
+                "attempts": [attempt.as_dict() for attempt in attempts],
+                "decision_ms": decision_ms,
+            },
+            latency_ms=(time.perf_counter() - start_time) * 1000,
+        )
+        self.token_counter.observe(task, decision.model, usage.get("prompt_tokens"))
+        self._record_usage(decision, usage, stream.response)
 
     async def _make_routing_decision(
         self, 
         task: str, 
-        complexity: float, 
+        complexity: Optional[float], 
         required_model: Optional[str],
         task_type: Optional[str] = None,
+        expected_output_tokens: Optional[int] = None,
+        affinity_key: Optional[str] = None,
     ) -> RoutingDecision:
         """
         Logic to choose the best provider/model.
-        In Phase 1, this is a rule-based engine.
+
+        The rules pick the eligible candidate set (explicit model, registry
+        tier, then local or cloud by complexity); within a set the healthy
+        candidate with the lowest expected latency from :attr:`stats` wins.
+        Candidates without stats are tried first, in registration order, so
+        every endpoint gets measured. Stale health for all candidates in all
+        sets is probed concurrently under one deadline (see
+        :meth:`set_decision_timeout`) before the first set is considered.
+        A *complexity* of ``None`` is estimated from the prompt, and only
+        when an explicit model cannot be served.
         """
         # If a specific model is forced
         if required_model:
-            for p_id, p in self._providers.items():
-                if required_model in p.get_supported_models():
-                    return RoutingDecision(
-                        provider_id=p_id,
-                        model=required_model,
-                        reason="Explicit model requested"
-                    )
+            providers = [
+                p_id for p_id in self._model_index.providers_for(required_model)
+                if not self._breakers.is_open(p_id, required_model)
+            ]
+            if providers:
+                p_id = providers[0]
+                if affinity_key is not None:
+                    p_id = rendezvous_pick(affinity_key, providers, lambda p: f"{p}:{required_model}")
+                return RoutingDecision(
+                    provider_id=p_id,
+                    model=required_model,
+                    reason="Explicit model requested",
+                    affinity_key=affinity_key,
+                )
+
+        if complexity is None:
+            complexity = self.complexity_estimator.score(task)
+        stages: List[List[Tuple[str, str, str]]] = []
 
         # Tier-aware routing via the ModelRegistry
         if task_type and self._model_registry is not None:
-            candidates = self._model_registry.get_models_for_task(task_type)
-            for accred in candidates:
-                provider_name, model_name = accred.model_full_name.split(":", 1)
-                for p_id, p in self._providers.items():
-                    if p_id == provider_name and model_name in p.get_supported_models():
-                        if await p.is_healthy():
-                            return RoutingDecision(
-                                provider_id=p_id,
-                                model=model_name,
-                                reason=(
-                                    f"Tier-{accred.tier.value} model selected for "
-                                    f"task_type='{task_type}'"
-                                ),
-                            )
+            if self._objective == RoutingObjective.COST:
+                accreditations = self._model_registry.get_models_meeting_floor(task_type)
+            else:
+                accreditations = self._model_registry.get_models_for_task(task_type)
+            candidates = []
+            for accred in accreditations:
+                resolved = self._model_index.resolve(accred.model_full_name)
+                if resolved is not None:
+                    candidates.append((
+                        *resolved,
+                        f"Tier-{accred.tier.value} model selected for task_type='{task_type}'",
+                    ))
+            stages.append(candidates)
 
         # Basic complexity-based routing
         if complexity < 0.5 and self._default_local_model:
-            # Check if local provider is healthy
-            local_providers = [p for p in self._providers.values() if p.provider_type == ProviderType.LOCAL]
-            for p in local_providers:
-                if await p.is_healthy():
-                    return RoutingDecision(
-                        provider_id=p.provider_id,
-                        model=self._default_local_model,
-                        reason=f"Low complexity ({complexity}), using local model"
-                    )
+            stages.append([
+                (p.provider_id, self._default_local_model, f"Low complexity ({complexity:.2f}), using local model")
+                for p in self._providers.values()
+                if p.provider_type == ProviderType.LOCAL
+            ])
 
         # Default to cloud if local fails or complexity is high
         if self._default_cloud_model:
-            cloud_providers = [p for p in self._providers.values() if p.provider_type == ProviderType.CLOUD]
-            for p in cloud_providers:
-                if await p.is_healthy():
-                    return RoutingDecision(
-                        provider_id=p.provider_id,
-                        model=self._default_cloud_model,
-                        reason=f"High complexity ({complexity}) or local unavailable, using cloud"
-                    )
+            stages.append([
+                (
+                    p.provider_id,
+                    self._default_cloud_model,
+                    f"High complexity ({complexity:.2f}) or local unavailable, using cloud",
+                )
+                for p in self._providers.values()
+                if p.provider_type == ProviderType.CLOUD
+            ])
+
+        # Probe every plausible candidate at once rather than stage by stage.
+        health = await self._check_candidates([c for stage in stages for c in stage])
+        for candidates in stages:
+            decision = await self._pick_best(candidates, task, expected_output_tokens, affinity_key, health)
+            if decision is not None:
+                return decision
 
         raise RuntimeError("No healthy providers available for routing.")
 
-    async def _handle_fallback(
-        self, 
-        task: str, 
-        failed_decision: RoutingDecision, 
-        error: Exception,
-        **kwargs
-    ) -> LLMResponse:
-        """Handle execution failures by falling back to another provider."""
-        # Simple fallback: if local failed, try cloud
+    async def _check_candidates(self, candidates: List[Tuple[str, str, str]]) -> Dict[str, bool]:
+        """Health of the providers of *candidates* whose circuit is not open, probed in parallel."""
+        return await self._health.check_many(
+            (self._providers[p_id] for p_id, model, _ in candidates if not self._breakers.is_open(p_id, model)),
+            timeout=self._decision_timeout,
+        )
+
+    async def _pick_best(
+        self,
+        candidates: List[Tuple[str, str, str]],
+        task: str,
+        expected_output_tokens: Optional[int] = None,
+        affinity_key: Optional[str] = None,
+        health: Optional[Dict[str, bool]] = None,
+    ) -> Optional[RoutingDecision]:
+        """Return a decision for the best healthy ``(provider_id, model, reason)`` candidate.
+
+        Ranked by expected latency, or by expected cost then latency when the
+        routing objective is ``COST``. Candidates that are out of rate-limit
+        budget are passed over; if all of them are, the one that frees up
+        soonest is returned and the call queues for it. With an
+        *affinity_key*, the instance serving the best-ranked model is chosen
+        by rendezvous hashing instead of by rank. *health* is the result of
+        :meth:`_check_candidates`; it is computed here when not given.
+        """
+        if health is None:
+            health = await self._check_candidates(candidates)
+        counter = self.token_counter
+        output_tokens = expected_output_tokens or self._default_output_tokens
+        eligible: List[tuple] = []
+        best: Optional[tuple] = None
+        throttled: List[Tuple[float, str, str, str]] = []
+        for p_id, model, reason in candidates:
+            if self._breakers.is_open(p_id, model):
+                continue
+            input_tokens = counter.count(task, model)
+            wait = self._rate_limits.delay(p_id, model, input_tokens + output_tokens)
+            if wait > 0:
+                throttled.append((wait, p_id, model, reason))
+                continue
+            if not health.get(p_id):
+                continue
+            expected = self._stats.expected_latency_ms(p_id, model, expected_output_tokens)
+            cost = self._estimate_cost(model, input_tokens, output_tokens)
+            latency_rank = expected if expected is not None else 0.0
+            rank = (cost, latency_rank) if self._objective == RoutingObjective.COST else (latency_rank,)
+            eligible.append((rank, p_id, model, reason, expected, cost))
+        if eligible:
+            best = min(eligible, key=lambda item: item[0])
+            if affinity_key is not None:
+                same_model = [item for item in eligible if item[2] == best[2]]
+                best = rendezvous_pick(affinity_key, same_model, lambda item: f"{item[1]}:{item[2]}")
+        if best is None:
+            for wait, p_id, model, reason in sorted(throttled, key=lambda item: item[0]):
+                if health.get(p_id):
+                    expected = self._stats.expected_latency_ms(p_id, model, expected_output_tokens)
+                    cost = self._estimate_cost(model, counter.count(task, model), output_tokens)
+                    best = (None, p_id, model, f"{reason} (rate limited, ~{wait:.1f}s wait)", expected, cost)
+                    break
+        if best is None:
+            return None
+        _, p_id, model, reason, expected, cost = best
+        return RoutingDecision(
+            provider_id=p_id,
+            model=model,
+            reason=reason,
+            estimated_cost=cost,
+            estimated_latency_ms=expected or 0.0,
+            confidence_score=self._stats.confidence(p_id, model),
+            affinity_key=affinity_key,
+        )
+
+    def _estimate_cost(self, model: str, input_tokens: int, output_tokens: int) -> float:
+        """Expected cost from the tracker's pricing; unpriced models count as free."""
+        tracker = self._cost_tracker
+        if tracker is None or not tracker.has_pricing(model):
+            return 0.0
+        return tracker.estimate_cost(model, input_tokens, output_tokens)
+
+    async def _fallback_decision(
+        self,
+        failed_decision: RoutingDecision,
+        task_type: Optional[str] = None,
+        tried: Optional[Set[Tuple[str, str]]] = None,
+        excluded_providers: Iterable[str] = (),
+    ) -> Optional[RoutingDecision]:
+        """Pick the next healthy target after *failed_decision* failed, or ``None``.
+
+        Walks :meth:`_fallback_targets` in order, skipping targets already
+        *tried*, providers in *excluded_providers* and open circuits.
+        """
+        tried = tried if tried is not None else {(failed_decision.provider_id, failed_decision.model)}
+        excluded = set(excluded_providers)
+        for p_id, model in self._fallback_targets(failed_decision, task_type):
+            if (p_id, model) in tried or p_id in excluded or p_id not in self._providers:
+                continue
+            if self._breakers.is_open(p_id, model):
+                continue
+            if await self._health.check(self._providers[p_id]):
+                return RoutingDecision(
+                    provider_id=p_id,
+                    model=model,
+                    reason=f"Fallback after {failed_decision.provider_id}:{failed_decision.model} failed",
+                    affinity_key=failed_decision.affinity_key,
+                    tags=failed_decision.tags,
+                )
+        return None
+
+    def _fallback_targets(
+        self,
+        failed_decision: RoutingDecision,
+        task_type: Optional[str],
+    ) -> Iterator[Tuple[str, str]]:
+        """Fallback ``(provider_id, model)`` candidates in preference order; may repeat."""
+        chain = self._fallback.chains.get(task_type) if task_type else None
+        if chain is not None:
+            for entry in chain:
+                resolved = self._model_index.resolve(entry)
+                if resolved is not None:
+                    yield resolved
+                else:
+                    for p_id in self._model_index.providers_for(entry):
+                        yield p_id, entry
+            return
+
+        # Same model elsewhere, then the registry's candidates (preferred tier,
+        # then the profile's fallback tier), then the complexity defaults.
+        for p_id in self._model_index.providers_for(failed_decision.model):
+            yield p_id, failed_decision.model
+        if task_type and self._model_registry is not None:
+            for accred in self._model_registry.get_fallback_models(task_type):
+                resolved = self._model_index.resolve(accred.model_full_name)
+                if resolved is not None:
+                    yield resolved
         failed_provider = self._providers.get(failed_decision.provider_id)
-        
-        if failed_provider and failed_provider.provider_type == ProviderType.LOCAL:
-            if self._default_cloud_model:
-                cloud_providers = [p for p in self._providers.values() if p.provider_type == ProviderType.CLOUD]
-                for p in cloud_providers:
-                    if await p.is_healthy():
-                        return await p.generate(task, self._default_cloud_model, **kwargs)
-        
-        raise error
+        if (
+            failed_provider is not None
+            and failed_provider.provider_type == ProviderType.LOCAL
+            and self._default_local_model
+        ):
+            for p in self._providers.values():
+                if p.provider_type == ProviderType.LOCAL:
+                    yield p.provider_id, self._default_local_model
+        if self._default_cloud_model:
+            for p in self._providers.values():
+                if p.provider_type == ProviderType.CLOUD:
+                    yield p.provider_id, self._default_cloud_model
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import AsyncIterator, Deque, Dict, Optional, Union
+
+
+class Priority(str, Enum):
+    INTERACTIVE = "interactive"
+    STANDARD = "standard"
+    BULK = "bulk"
+
+
+@dataclass
+class SchedulerConfig:
+    """
+    Lane weights and bulk throttling for :class:`PriorityScheduler`.
+
+    When a provider is saturated, waiting calls are dispatched by weighted
+    fair queuing: over time each backlogged lane gets slots in proportion to
+    its ``weights`` entry. ``reserved_interactive_slots`` of every
+    provider's capacity (but never the last slot) are only ever given to
+    interactive calls, so a burst of bulk work can never occupy the whole
+    box. While a provider has ``bulk_pause_depth`` or more interactive calls
+    queued, no bulk call is started on it.
+    """
+
+    weights: Dict[Priority, float] = field(
+        default_factory=lambda: {Priority.INTERACTIVE: 8.0, Priority.STANDARD: 4.0, Priority.BULK: 1.0}
+    )
+    reserved_interactive_slots: int = 1
+    bulk_pause_depth: int = 1
+
+    def __post_init__(self) -> None:
+        self.weights = {Priority(lane): weight for lane, weight in self.weights.items()}
+        for lane in Priority:
+            if self.weights.get(lane, 0) <= 0:
+                raise ValueError(f"weight for lane '{lane.value}' must be > 0")
+
+
+@dataclass
+class _Waiter:
+    future: "asyncio.Future[None]"
+    start: float
+
+
+class _ProviderLanes:
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.queues: Dict[Priority, Deque[_Waiter]] = {lane: deque() for lane in Priority}
+        self.in_flight: Dict[Priority, int] = {lane: 0 for lane in Priority}
+        self.last_finish: Dict[Priority, float] = {lane: 0.0 for lane in Priority}
+        self.virtual_time = 0.0
+
+    @property
+    def busy(self) -> int:
+        return sum(self.in_flight.values())
+
+
+class PriorityScheduler:
+    """
+    Per-provider slots handed out across priority lanes.
+
+    Providers with a capacity set via :meth:`set_capacity` run at most that
+    many calls at once; further calls wait in their lane's FIFO queue and
+    are released by weighted fair queuing with the throttling rules of
+    :class:`SchedulerConfig`. Providers without a capacity are not
+    scheduled. Cancelling a waiting call removes it from its queue.
+    """
+
+    def __init__(
+        self,
+        capacities: Optional[Dict[str, int]] = None,
+        config: Optional[SchedulerConfig] = None,
+    ) -> None:
+        self.config = config or SchedulerConfig()
+        self._providers: Dict[str, _ProviderLanes] = {}
+        for provider_id, capacity in (capacities or {}).items():
+            self.set_capacity(provider_id, capacity)
+
+    def set_capacity(self, provider_id: str, capacity: Optional[int]) -> None:
+        if capacity is None:
+            self._providers.pop(provider_id, None)
+            return
+        if capacity < 1:
+            raise ValueError(f"Capacity must be >= 1, got {capacity}")
+        lanes = self._providers.get(provider_id)
+        if lanes is None:
+            self._providers[provider_id] = _ProviderLanes(capacity)
+        else:
+            lanes.capacity = capacity
+            self._dispatch(lanes)
+
+    def queue_depth(self, provider_id: str, priority: Union[Priority, str]) -> int:
+        lanes = self._providers.get(provider_id)
+        return len(lanes.queues[Priority(priority)]) if lanes is not None else 0
+
+    def in_flight(self, provider_id: str, priority: Optional[Union[Priority, str]] = None) -> int:
+        lanes = self._providers.get(provider_id)
+        if lanes is None:
+            return 0
+        return lanes.busy if priority is None else lanes.in_flight[Priority(priority)]
+
+    @asynccontextmanager
+    async def slot(self, provider_id: str, priority: Union[Priority, str] = Priority.STANDARD) -> AsyncIterator[None]:
+        lanes = self._providers.get(provider_id)
+        if lanes is None:
+            yield
+            return
+        lane = Priority(priority)
+        await self._acquire(lanes, lane)
+        try:
+            yield
+        finally:
+            lanes.in_flight[lane] -= 1
+            self._dispatch(lanes)
+
+    async def _acquire(self, lanes: _ProviderLanes, lane: Priority) -> None:
+        start = max(lanes.virtual_time, lanes.last_finish[lane])
+        lanes.last_finish[lane] = start + 1.0 / self.config.weights[lane]
+        waiter = _Waiter(asyncio.get_running_loop().create_future(), start)
+        lanes.queues[lane].append(waiter)
+        self._dispatch(lanes)
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Granted a slot in the same tick we were cancelled: hand it on.
+                lanes.in_flight[lane] -= 1
+                self._dispatch(lanes)
+            elif waiter in lanes.queues[lane]:
+                lanes.queues[lane].remove(waiter)
+            raise
+
+    def _eligible(self, lanes: _ProviderLanes, lane: Priority) -> bool:
+        if lane == Priority.INTERACTIVE:
+            return True
+        shared = max(lanes.capacity - self.config.reserved_interactive_slots, 1)
+        if lanes.busy - lanes.in_flight[Priority.INTERACTIVE] >= shared:
+            return False
+        if lane == Priority.BULK:
+            return len(lanes.queues[Priority.INTERACTIVE]) < self.config.bulk_pause_depth
+        return True
+
+    def _dispatch(self, lanes: _ProviderLanes) -> None:
+        while lanes.busy < lanes.capacity:
+            chosen: Optional[Priority] = None
+            for lane, queue in lanes.queues.items():
+                if queue and self._eligible(lanes, lane):
+                    if chosen is None or queue[0].start < lanes.queues[chosen][0].start:
+                        chosen = lane
+            if chosen is None:
+                return
+            waiter = lanes.queues[chosen].popleft()
+            if waiter.future.done():  # cancelled while queued
+                continue
+            lanes.virtual_time = max(lanes.virtual_time, waiter.start)
+            lanes.in_flight[chosen] += 1
+            waiter.future.set_result(None)
@@ -0,0 +1,315 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy installed
+    np = None
+
+from .cache import CacheStats, normalize_prompt
+from .models import LLMResponse
+
+# Async callable mapping a batch of texts to one embedding vector per text.
+Embedder = Callable[[List[str]], Awaitable[Sequence[Sequence[float]]]]
+
+Partition = Tuple[str, str, str]
+
+# Nearest neighbours examined per lookup, so expired entries do not hide live ones.
+_CANDIDATES = 8
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("SemanticCache requires numpy: pip install numpy")
+
+
+class VectorIndex:
+    """
+    Flat cosine-similarity index over a preallocated float32 matrix.
+
+    Vectors are L2-normalised on insert so a search is a single
+    matrix-vector product. Removed slots are recycled; capacity doubles when
+    full. Search is exact and O(n·d): roughly 0.3 ms per thousand
+    768-dimensional vectors, so ~100 ms for 300k. :class:`SemanticCache`
+    runs searches over large partitions on a worker thread; :meth:`search`
+    and :meth:`top_k` may run off the event loop while it adds and removes.
+    """
+
+    def __init__(self, initial_capacity: int = 1024) -> None:
+        _require_numpy()
+        self._capacity = initial_capacity
+        self._matrix = None
+        self._valid = np.zeros(initial_capacity, dtype=bool)
+        self._high_water = 0
+        self._free: List[int] = []
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @staticmethod
+    def _normalise(vector: Sequence[float]) -> "np.ndarray":
+        arr = np.asarray(vector, dtype=np.float32)
+        norm = float(np.linalg.norm(arr))
+        return arr / norm if norm else arr
+
+    def add(self, vector: Sequence[float]) -> int:
+        arr = self._normalise(vector)
+        if self._matrix is None:
+            self._matrix = np.zeros((self._capacity, arr.shape[0]), dtype=np.float32)
+        elif arr.shape[0] != self._matrix.shape[1]:
+            raise ValueError(
+                f"Embedding dimension {arr.shape[0]} does not match index dimension {self._matrix.shape[1]}"
+            )
+
+        if self._free:
+            slot = self._free.pop()
+        else:
+            if self._high_water == self._capacity:
+                self._grow()
+            slot = self._high_water
+            self._high_water += 1
+        self._matrix[slot] = arr
+        self._valid[slot] = True
+        self._count += 1
+        return slot
+
+    def remove(self, slot: int) -> None:
+        if self._valid[slot]:
+            self._valid[slot] = False
+            self._free.append(slot)
+            self._count -= 1
+
+    def search(self, vector: Sequence[float]) -> Tuple[int, float]:
+        """Return ``(slot, cosine_similarity)`` of the nearest vector, or ``(-1, -1.0)``."""
+        nearest = self.top_k(vector, 1)
+        return nearest[0] if nearest else (-1, -1.0)
+
+    def top_k(self, vector: Sequence[float], k: int) -> List[Tuple[int, float]]:
+        """Return up to *k* ``(slot, cosine_similarity)`` pairs, most similar first."""
+        # Snapshot in this order: _grow() only runs once high water reaches
+        # capacity, so both arrays cover the first `high` rows.
+        high = self._high_water
+        matrix, valid = self._matrix, self._valid
+        if not self._count or matrix is None or high == 0:
+            return []
+        query = self._normalise(vector)
+        scores = matrix[:high] @ query
+        scores[~valid[:high]] = -np.inf
+        if k < high:
+            candidates = np.argpartition(scores, high - k)[high - k:]
+            order = candidates[np.argsort(-scores[candidates])]
+        else:
+            order = np.argsort(-scores)
+        return [(int(slot), float(scores[slot])) for slot in order if scores[slot] != -np.inf]
+
+    def similarity(self, slot: int, vector: Sequence[float]) -> Optional[float]:
+        """Cosine similarity of *vector* to the live vector in *slot*, or ``None`` if the slot is free."""
+        if slot >= self._high_water or not self._valid[slot]:
+            return None
+        return float(self._matrix[slot] @ self._normalise(vector))
+
+    def _grow(self) -> None:
+        self._capacity *= 2
+        matrix = np.zeros((self._capacity, self._matrix.shape[1]), dtype=np.float32)
+        matrix[: self._high_water] = self._matrix[: self._high_water]
+        self._matrix = matrix
+        valid = np.zeros(self._capacity, dtype=bool)
+        valid[: self._high_water] = self._valid[: self._high_water]
+        self._valid = valid
+
+
+@dataclass
+class _SemanticEntry:
+    response: LLMResponse
+    expires_at: float
+
+
+class SemanticCache:
+    """
+    Similarity-based response cache for paraphrased prompts.
+
+    Prompts are embedded with *embedder* (e.g.
+    :class:`~powertools.meta.integrations.llm.ollama.OllamaEmbedder`) and
+    compared against earlier prompts routed to the same provider/model for
+    the same ``task_type``. A stored response is returned when cosine
+    similarity reaches that task type's threshold. Only task types listed in
+    *thresholds* are cached, so paraphrase-tolerant tasks (FAQ answers,
+    summaries) can opt in while everything else always reaches a model;
+    ``default_threshold`` opts in all other task types. Entries expire after
+    ``ttl_seconds`` and the least recently used are evicted beyond
+    ``max_entries``.
+
+    Partitions with at least ``offload_min_entries`` vectors are searched
+    in the default executor (NumPy releases the GIL), so a large index does
+    not stall other requests on the event loop.
+    """
+
+    def __init__(
+        self,
+        embedder: Embedder,
+        *,
+        thresholds: Dict[str, float],
+        default_threshold: Optional[float] = None,
+        max_entries: int = 100_000,
+        ttl_seconds: float = 24 * 3600.0,
+        offload_min_entries: int = 4096,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        _require_numpy()
+        self._embedder = embedder
+        self.thresholds = dict(thresholds)
+        self.default_threshold = default_threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.offload_min_entries = offload_min_entries
+        self.stats = CacheStats()
+        self.embedding_errors = 0
+        self._clock = clock
+        self._indexes: Dict[Partition, VectorIndex] = {}
+        self._entries: "OrderedDict[Tuple[Partition, int], _SemanticEntry]" = OrderedDict()
+        self._embeddings: "OrderedDict[str, Sequence[float]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def threshold_for(self, task_type: Optional[str]) -> Optional[float]:
+        """Similarity threshold for *task_type*, or ``None`` if it must not be cached."""
+        if task_type is None:
+            return None
+        return self.thresholds.get(task_type, self.default_threshold)
+
+    def applies(self, task_type: Optional[str]) -> bool:
+        return self.threshold_for(task_type) is not None
+
+    async def lookup(
+        self,
+        prompt: str,
+        *,
+        task_type: str,
+        provider_id: str,
+        model: str,
+    ) -> Optional[LLMResponse]:
+        """Return a copy of the closest stored response above the threshold, or ``None``.
+
+        The returned response has ``cost`` and ``latency_ms`` zeroed and
+        ``metadata["cache_hit"]`` and ``metadata["semantic_score"]`` set. Embedding
+        failures count as misses. Expired entries met on the way are evicted,
+        and the best live entry above the threshold is returned.
+        """
+        threshold = self.threshold_for(task_type)
+        if threshold is None:
+            return None
+        index = self._indexes.get((task_type, provider_id, model))
+        vector = await self._embed(prompt)
+        if vector is None or index is None:
+            self.stats.misses += 1
+            return None
+
+        partition = (task_type, provider_id, model)
+        now = self._clock()
+        while True:
+            candidates = await self._search(index, vector)
+            key, entry, score, evicted = None, None, 0.0, 0
+            for slot, _ in candidates:
+                # Re-score on the loop: the slot may have been reused while
+                # an offloaded search was running.
+                score = index.similarity(slot, vector)
+                if score is None:
+                    continue
+                if score < threshold:
+                    break
+                key = (partition, slot)
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                if entry.expires_at > now:
+                    break
+                self._evict(key)
+                entry = None
+                evicted += 1
+            # Search again only if every candidate was expired, as a live
+            # match may rank below them.
+            if entry is not None or evicted < _CANDIDATES:
+                break
+        if entry is None:
+            self.stats.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        self.stats.saved_cost += entry.response.cost
+        self.stats.saved_latency_ms += entry.response.latency_ms
+        response = entry.response.model_copy(deep=True)
+        response.cost = 0.0
+        response.latency_ms = 0.0
+        response.metadata["cache_hit"] = True
+        response.metadata["semantic_score"] = score
+        return response
+
+    async def store(
+        self,
+        prompt: str,
+        response: LLMResponse,
+        *,
+        task_type: str,
+        provider_id: str,
+        model: str,
+    ) -> None:
+        if not self.applies(task_type):
+            return
+        vector = await self._embed(prompt)
+        if vector is None:
+            return
+        partition = (task_type, provider_id, model)
+        index = self._indexes.get(partition)
+        if index is None:
+            index = self._indexes[partition] = VectorIndex()
+        slot = index.add(vector)
+        self._entries[(partition, slot)] = _SemanticEntry(
+            response=response.model_copy(deep=True),
+            expires_at=self._clock() + self.ttl_seconds,
+        )
+        while len(self._entries) > self.max_entries:
+            self._evict(next(iter(self._entries)))
+            self.stats.evictions += 1
+
+    async def _search(self, index: VectorIndex, vector: Sequence[float]) -> List[Tuple[int, float]]:
+        if len(index) < self.offload_min_entries:
+            return index.top_k(vector, _CANDIDATES)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, index.top_k, vector, _CANDIDATES)
+
+    def clear(self) -> None:
+        self._indexes.clear()
+        self._entries.clear()
+
+    def _evict(self, key: Tuple[Partition, int]) -> None:
+        partition, slot = key
+        self._entries.pop(key, None)
+        index = self._indexes.get(partition)
+        if index is not None:
+            index.remove(slot)
+
+    async def _embed(self, prompt: str) -> Optional[Sequence[float]]:
+        # Memoise recent embeddings so a miss followed by store() embeds once.
+        digest = hashlib.sha256(normalize_prompt(prompt).encode("utf-8")).hexdigest()
+        vector = self._embeddings.get(digest)
+        if vector is not None:
+            self._embeddings.move_to_end(digest)
+            return vector
+        try:
+            vector = (await self._embedder([normalize_prompt(prompt)]))[0]
+        except Exception:
+            self.embedding_errors += 1
+            return None
+        self._embeddings[digest] = vector
+        if len(self._embeddings) > 1024:
+            self._embeddings.popitem(last=False)
+        return vector
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class _Flight(Generic[T]):
+    task: "asyncio.Future[T]"
+    waiters: int = 0
+
+
+class SingleFlight(Generic[T]):
+    """
+    Collapse concurrent calls that share a key into one execution.
+
+    The first caller for a key starts ``fn()`` as a task; callers arriving
+    while it runs await the same task and receive its result or exception.
+    Each waiter is shielded from the others: cancelling one caller does not
+    cancel the shared work while anyone else is still waiting, and the work
+    is cancelled only once every waiter has gone. The key is released as soon
+    as the task finishes, so later calls start fresh.
+    """
+
+    def __init__(self) -> None:
+        self._flights: Dict[str, _Flight[T]] = {}
+        self.coalesced = 0
+
+    def in_flight(self, key: str) -> bool:
+        return key in self._flights
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(task=asyncio.ensure_future(fn()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _, key=key, flight=flight: self._release(key, flight))
+        else:
+            self.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
+
+    def _release(self, key: str, flight: _Flight[T]) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        # Mark the outcome as retrieved even if every waiter was cancelled.
+        if not flight.task.cancelled():
+            flight.task.exception()
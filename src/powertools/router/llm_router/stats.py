@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+
+@dataclass
+class EndpointStats:
+    """Exponentially weighted online statistics for one provider or provider/model."""
+
+    latency_ms: float = 0.0
+    tokens_per_second: float = 0.0
+    error_rate: float = 0.0
+    successes: int = 0
+    errors: int = 0
+
+    @property
+    def samples(self) -> int:
+        return self.successes + self.errors
+
+    def observe_success(self, latency_ms: float, completion_tokens: int, alpha: float) -> None:
+        if self.successes == 0:
+            self.latency_ms = latency_ms
+        else:
+            self.latency_ms += alpha * (latency_ms - self.latency_ms)
+        if completion_tokens > 0 and latency_ms > 0:
+            tps = completion_tokens / (latency_ms / 1000)
+            if self.tokens_per_second == 0.0:
+                self.tokens_per_second = tps
+            else:
+                self.tokens_per_second += alpha * (tps - self.tokens_per_second)
+        self.error_rate -= alpha * self.error_rate
+        self.successes += 1
+
+    def observe_error(self, alpha: float) -> None:
+        self.error_rate += alpha * (1.0 - self.error_rate)
+        self.errors += 1
+
+
+class ProviderStats:
+    """
+    Online latency, throughput and error-rate tracking for routing.
+
+    Every provider call is folded into two EWMA series: one per provider and
+    one per ``(provider, model)``. :meth:`expected_latency_ms` turns those into
+    a single comparable number for candidate selection, and
+    :meth:`confidence` says how much that number should be trusted.
+    """
+
+    def __init__(self, alpha: float = 0.2, confidence_samples: int = 10) -> None:
+        if not 0.0 < alpha <= 1.0:
+            raise ValueError(f"alpha must be in (0, 1], got {alpha}")
+        self.alpha = alpha
+        self.confidence_samples = confidence_samples
+        self._providers: Dict[str, EndpointStats] = {}
+        self._models: Dict[Tuple[str, str], EndpointStats] = {}
+
+    def _series(self, provider_id: str, model: str) -> Tuple[EndpointStats, EndpointStats]:
+        provider = self._providers.get(provider_id)
+        if provider is None:
+            provider = self._providers[provider_id] = EndpointStats()
+        pair = self._models.get((provider_id, model))
+        if pair is None:
+            pair = self._models[(provider_id, model)] = EndpointStats()
+        return provider, pair
+
+    def record_success(
+        self,
+        provider_id: str,
+        model: str,
+        latency_ms: float,
+        completion_tokens: int = 0,
+    ) -> None:
+        for series in self._series(provider_id, model):
+            series.observe_success(latency_ms, completion_tokens, self.alpha)
+
+    def record_error(self, provider_id: str, model: str) -> None:
+        for series in self._series(provider_id, model):
+            series.observe_error(self.alpha)
+
+    def get(self, provider_id: str, model: Optional[str] = None) -> Optional[EndpointStats]:
+        if model is None:
+            return self._providers.get(provider_id)
+        return self._models.get((provider_id, model))
+
+    def expected_latency_ms(
+        self,
+        provider_id: str,
+        model: str,
+        output_tokens: Optional[int] = None,
+    ) -> Optional[float]:
+        """Expected time to a successful answer, or ``None`` with no successful samples.
+
+        Uses the model's series, falling back to the provider's. When
+        *output_tokens* is known, long generations are bounded below by
+        ``output_tokens / tokens_per_second``. The result is divided by the
+        success rate to account for the cost of failing and retrying.
+        """
+        stats = self._models.get((provider_id, model))
+        if stats is None or stats.successes == 0:
+            stats = self._providers.get(provider_id)
+        if stats is None or stats.successes == 0:
+            return None
+        expected = stats.latency_ms
+        if output_tokens and stats.tokens_per_second > 0:
+            expected = max(expected, output_tokens / stats.tokens_per_second * 1000)
+        return expected / max(1.0 - stats.error_rate, 0.05)
+
+    def confidence(self, provider_id: str, model: str) -> float:
+        """0.0–1.0 trust in :meth:`expected_latency_ms`, growing with samples and shrinking with errors."""
+        stats = self._models.get((provider_id, model))
+        if stats is None or stats.samples == 0:
+            return 0.0
+        coverage = stats.samples / (stats.samples + self.confidence_samples)
+        return coverage * (1.0 - stats.error_rate)
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import json
+from typing import Any, AsyncIterator, Dict, Optional
+
+from .models import LLMResponse, StreamChunk
+
+
+async def iter_ndjson(lines: AsyncIterator[str]) -> AsyncIterator[Dict[str, Any]]:
+    """Decode newline-delimited JSON (Ollama's streaming format)."""
+    async for line in lines:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+async def iter_sse_data(lines: AsyncIterator[str]) -> AsyncIterator[Dict[str, Any]]:
+    """Decode the JSON ``data:`` payloads of an OpenAI-style server-sent event stream.
+
+    Stops at the ``[DONE]`` sentinel. Comments, ``event:``/``id:`` fields and
+    keep-alive blank lines are skipped.
+    """
+    async for line in lines:
+        if not line.startswith("data:"):
+            continue
+        payload = line[5:].strip()
+        if payload == "[DONE]":
+            return
+        if payload:
+            yield json.loads(payload)
+
+
+class LLMStream:
+    """
+    Async iterator returned by :meth:`LLMRouter.route_stream`.
+
+    Yields :class:`StreamChunk` objects as they arrive. Once the stream is
+    exhausted, :attr:`response` holds the assembled :class:`LLMResponse`
+    (full content, final usage, total latency) and :attr:`ttft_ms` the
+    time-to-first-token, which is also recorded in
+    ``response.metadata["ttft_ms"]``.
+    """
+
+    def __init__(self) -> None:
+        self.response: Optional[LLMResponse] = None
+        self.ttft_ms: Optional[float] = None
+        self._chunks: Optional[AsyncIterator[StreamChunk]] = None
+
+    def __aiter__(self) -> "LLMStream":
+        return self
+
+    async def __anext__(self) -> StreamChunk:
+        if self._chunks is None:
+            raise StopAsyncIteration
+        return await self._chunks.__anext__()
+
+    async def aclose(self) -> None:
+        """Stop the stream early and release the underlying connection."""
+        if self._chunks is not None:
+            await self._chunks.aclose()
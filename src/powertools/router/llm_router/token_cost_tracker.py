@@ -1,7 +1,26 @@
 from __future__ import annotations
 
+import threading
+import time
+from array import array
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from itertools import chain
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy installed
+    np = None
+
+from .budget import UsageWindows, Window
+from ...utils.token_counter import TokenCounter, default_token_counter
+
+if TYPE_CHECKING:
+    from .ledger import UsageLedger
+
+
+# (model, input_tokens, output_tokens, metadata, timestamp) as passed to record_batch().
+UsageRow = Tuple[str, int, int, Optional[Dict[str, Any]], float]
 
 
 @dataclass
@@ -12,14 +31,162 @@ class UsageRecord:
     total_tokens: int
     cost: float
     metadata: Dict[str, Any] = field(default_factory=dict)
+    timestamp: float = 0.0
+
+
+class UsageLog:
+    """
+    Columnar store of usage rows, optionally capped to the newest ``max_records``.
+
+    Each field is kept in its own typed :mod:`array` (8 bytes per value,
+    model names interned to a 4-byte code) instead of one object per call;
+    metadata is only stored when non-empty. Once the cap is reached the
+    oldest row is overwritten in place, ring-buffer style, and counted in
+    :attr:`evicted`. Iteration yields rows oldest first without copying the
+    columns; do not record while iterating.
+    """
+
+    def __init__(self, max_records: Optional[int] = None) -> None:
+        if max_records is not None and max_records < 1:
+            raise ValueError(f"max_records must be >= 1, got {max_records}")
+        self.max_records = max_records
+        self.evicted = 0
+        self._timestamp = array("d")
+        self._model = array("I")
+        self._input = array("q")
+        self._output = array("q")
+        self._cost = array("d")
+        self._metadata: List[Optional[Dict[str, Any]]] = []
+        self._models: List[str] = []
+        self._model_codes: Dict[str, int] = {}
+        self._head = 0  # position of the oldest row once the ring is full
+
+    def __len__(self) -> int:
+        return len(self._cost)
+
+    def append(
+        self,
+        timestamp: float,
+        model: str,
+        input_tokens: int,
+        output_tokens: int,
+        cost: float,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        code = self._model_codes.get(model)
+        if code is None:
+            code = self._model_codes[model] = len(self._models)
+            self._models.append(model)
+        metadata = metadata or None
+        if self.max_records is None or len(self._cost) < self.max_records:
+            self._timestamp.append(timestamp)
+            self._model.append(code)
+            self._input.append(input_tokens)
+            self._output.append(output_tokens)
+            self._cost.append(cost)
+            self._metadata.append(metadata)
+            return
+        i = self._head
+        self._timestamp[i] = timestamp
+        self._model[i] = code
+        self._input[i] = input_tokens
+        self._output[i] = output_tokens
+        self._cost[i] = cost
+        self._metadata[i] = metadata
+        self._head = (i + 1) % self.max_records
+        self.evicted += 1
+
+    def _positions(self) -> Iterator[int]:
+        return chain(range(self._head, len(self._cost)), range(self._head))
+
+    def __iter__(self) -> Iterator[UsageRecord]:
+        for i in self._positions():
+            input_tokens = self._input[i]
+            output_tokens = self._output[i]
+            yield UsageRecord(
+                model=self._models[self._model[i]],
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                total_tokens=input_tokens + output_tokens,
+                cost=self._cost[i],
+                metadata=self._metadata[i] or {},
+                timestamp=self._timestamp[i],
+            )
+
+    def to_numpy(self) -> Dict[str, "np.ndarray"]:
+        """Return the retained rows as NumPy columns, oldest first.
+
+        Keys are ``timestamp``, ``model`` (object array of names),
+        ``input_tokens``, ``output_tokens``, ``total_tokens`` and ``cost``.
+        The arrays are copies, so recording may continue while they are held.
+        """
+        if np is None:
+            raise ImportError("UsageLog.to_numpy requires numpy: pip install numpy")
+
+        def column(values: array, dtype: Any) -> "np.ndarray":
+            view = np.frombuffer(values, dtype=dtype)
+            return np.concatenate((view[self._head:], view[: self._head]))
+
+        input_tokens = column(self._input, np.int64)
+        output_tokens = column(self._output, np.int64)
+        names = np.array(self._models, dtype=object)
+        return {
+            "timestamp": column(self._timestamp, np.float64),
+            "model": names[column(self._model, np.uint32)] if len(self) else np.empty(0, dtype=object),
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+            "cost": column(self._cost, np.float64),
+        }
 
 
 class TokenCostTracker:
-    """Deterministic token/cost accounting for routed LLM calls."""
+    """
+    Deterministic token/cost accounting for routed LLM calls.
+
+    Keeps running totals and per-model aggregates over every recorded call,
+    the raw rows in a columnar :class:`UsageLog` (``max_records`` keeps only
+    the newest), sliding :attr:`windows` and, optionally, a durable *ledger*.
+    Safe to share between threads.
+    """
 
-    def __init__(self, pricing: Optional[Dict[str, Dict[str, float]]] = None) -> None:
+    def __init__(
+        self,
+        pricing: Optional[Dict[str, Dict[str, float]]] = None,
+        *,
+        max_records: Optional[int] = None,
+        clock: Callable[[], float] = time.time,
+        ledger: Optional["UsageLedger"] = None,
+        token_counter: Optional[TokenCounter] = None,
+    ) -> None:
+        self.token_counter = token_counter or default_token_counter()
         self._pricing: Dict[str, Dict[str, float]] = pricing.copy() if pricing else {}
-        self._records: List[UsageRecord] = []
+        self._log = UsageLog(max_records)
+        self._clock = clock
+        self._by_model: Dict[str, Dict[str, float]] = {}
+        self._calls = 0
+        self._total_tokens = 0
+        self._total_cost = 0.0
+        self._hedges: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+        self._windows = UsageWindows(clock)
+        self._ledger = ledger
+        if ledger is not None:
+            self._restore(ledger)
+
+    def _restore(self, ledger: "UsageLedger") -> None:
+        """Load the totals and per-model aggregates from *ledger*'s rollups.
+
+        The last day of records is replayed into :attr:`windows`; the raw
+        usage log starts empty.
+        """
+        for model, row in ledger.summarize().items():
+            self._by_model[model] = row
+            self._calls += int(row["calls"])
+            self._total_tokens += int(row["input_tokens"] + row["output_tokens"])
+            self._total_cost += row["cost"]
+        for record in ledger.records(since=self._clock() - Window.DAY.seconds):
+            self._windows.record(record)
 
     def register_model_pricing(
         self,
@@ -33,6 +200,9 @@ class TokenCostTracker:
             "output_cost_per_1k": output_cost_per_1k,
         }
 
+    def has_pricing(self, model: str) -> bool:
+        return model in self._pricing
+
     def estimate_cost(self, model: str, input_tokens: int, output_tokens: int) -> float:
         if model not in self._pricing:
             raise ValueError(f"No pricing registered for model: {model}")
@@ -42,6 +212,10 @@ class TokenCostTracker:
         output_cost = (output_tokens / 1000) * pricing["output_cost_per_1k"]
         return input_cost + output_cost
 
+    def estimate_prompt_cost(self, model: str, prompt: str, output_tokens: int = 0) -> float:
+        """Pre-call cost of sending *prompt* to *model* and receiving *output_tokens*."""
+        return self.estimate_cost(model, self.token_counter.count(prompt, model), output_tokens)
+
     def record_usage(
         self,
         *,
@@ -49,6 +223,7 @@ class TokenCostTracker:
         input_tokens: int,
         output_tokens: int,
         metadata: Optional[Dict[str, Any]] = None,
+        timestamp: Optional[float] = None,
     ) -> UsageRecord:
         cost = self.estimate_cost(model, input_tokens, output_tokens)
         record = UsageRecord(
@@ -58,31 +233,157 @@ class TokenCostTracker:
             total_tokens=input_tokens + output_tokens,
             cost=cost,
             metadata=metadata or {},
+            timestamp=self._clock() if timestamp is None else timestamp,
         )
-        self._records.append(record)
+        with self._lock:
+            self._add(record)
         return record
 
+    def record_batch(self, rows: Iterable[UsageRow]) -> int:
+        """Record several calls under one lock acquisition; all or none are recorded.
+
+        Every row is priced before the lock is taken, so an unpriced model
+        rejects the whole batch. :class:`ShardedRecorder` and
+        :class:`UsageAggregator` use this to fold many threads' or worker
+        processes' calls in at once.
+
+        Raises:
+            ValueError: If any row's model has no registered pricing.
+        """
+        records = [
+            UsageRecord(
+                model=model,
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                total_tokens=input_tokens + output_tokens,
+                cost=self.estimate_cost(model, input_tokens, output_tokens),
+                metadata=metadata or {},
+                timestamp=timestamp,
+            )
+            for model, input_tokens, output_tokens, metadata, timestamp in rows
+        ]
+        with self._lock:
+            for record in records:
+                self._add(record, windows=False)
+            self._windows.record_many(records)
+        return len(records)
+
+    def _add(self, record: UsageRecord, windows: bool = True) -> None:
+        model = record.model
+        input_tokens = record.input_tokens
+        output_tokens = record.output_tokens
+        cost = record.cost
+        self._log.append(record.timestamp, model, input_tokens, output_tokens, cost, record.metadata)
+        row = self._by_model.get(model)
+        if row is None:
+            row = self._by_model[model] = {"calls": 0.0, "input_tokens": 0.0, "output_tokens": 0.0, "cost": 0.0}
+        row["calls"] += 1
+        row["input_tokens"] += input_tokens
+        row["output_tokens"] += output_tokens
+        row["cost"] += cost
+        self._calls += 1
+        self._total_tokens += record.total_tokens
+        self._total_cost += cost
+        if windows:
+            self._windows.record(record)
+        if self._ledger is not None:
+            self._ledger.append(record)
+
+    @property
+    def windows(self) -> UsageWindows:
+        """Sliding minute/hour/day totals per model and tag."""
+        return self._windows
+
+    @property
+    def ledger(self) -> Optional["UsageLedger"]:
+        """Durable store every record is appended to, if any."""
+        return self._ledger
+
+    def flush(self) -> None:
+        """Write records buffered by the ledger, if any."""
+        if self._ledger is not None:
+            with self._lock:
+                self._ledger.flush()
+
+    def close(self) -> None:
+        """Flush and close the ledger; call before exiting so no records are lost."""
+        if self._ledger is not None:
+            with self._lock:
+                self._ledger.close()
+
+    def record_hedge(
+        self,
+        *,
+        primary_model: str,
+        hedge_model: str,
+        hedge_won: bool,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+    ) -> float:
+        """Record a hedged request and the estimated spend of its cancelled loser.
+
+        Stats are keyed by *primary_model*. Cancelled calls do not report
+        usage, so the extra cost is estimated from the tokens supplied
+        (typically the winner's prompt tokens) and is a lower bound. Models
+        without registered pricing count as free.
+        """
+        loser = primary_model if hedge_won else hedge_model
+        extra_cost = (
+            self.estimate_cost(loser, input_tokens, output_tokens) if self.has_pricing(loser) else 0.0
+        )
+        with self._lock:
+            row = self._hedges.setdefault(
+                primary_model, {"hedges": 0.0, "hedge_wins": 0.0, "extra_cost": 0.0}
+            )
+            row["hedges"] += 1
+            row["hedge_wins"] += 1 if hedge_won else 0
+            row["extra_cost"] += extra_cost
+        return extra_cost
+
+    def summarize_hedges(self) -> Dict[str, Dict[str, float]]:
+        """Hedges, wins and estimated extra cost per primary model; see :meth:`record_hedge`."""
+        return {model: dict(row) for model, row in self._hedges.items()}
+
+    @property
+    def hedge_count(self) -> int:
+        return int(sum(row["hedges"] for row in self._hedges.values()))
+
+    @property
+    def hedge_cost(self) -> float:
+        return sum(row["extra_cost"] for row in self._hedges.values())
+
     @property
     def records(self) -> List[UsageRecord]:
-        return list(self._records)
+        """The retained rows as a new list; prefer :meth:`iter_records` for large logs."""
+        with self._lock:
+            return list(self._log)
+
+    def iter_records(self) -> Iterator[UsageRecord]:
+        """Yield the retained rows oldest first without copying the log; not locked."""
+        return iter(self._log)
+
+    def to_numpy(self) -> Dict[str, "np.ndarray"]:
+        """The retained rows as NumPy columns; see :meth:`UsageLog.to_numpy`."""
+        with self._lock:
+            return self._log.to_numpy()
+
+    @property
+    def usage_log(self) -> UsageLog:
+        return self._log
+
+    @property
+    def call_count(self) -> int:
+        return self._calls
 
     @property
     def total_cost(self) -> float:
-        return sum(record.cost for record in self._records)
+        return self._total_cost
 
     @property
     def total_tokens(self) -> int:
-        return sum(record.total_tokens for record in self._records)
+        return self._total_tokens
 
     def summarize_by_model(self) -> Dict[str, Dict[str, float]]:
-        summary: Dict[str, Dict[str, float]] = {}
-        for record in self._records:
-            row = summary.setdefault(
-                record.model,
-                {"calls": 0.0, "input_tokens": 0.0, "output_tokens": 0.0, "cost": 0.0},
-            )
-            row["calls"] += 1
-            row["input_tokens"] += record.input_tokens
-            row["output_tokens"] += record.output_tokens
-            row["cost"] += record.cost
-        return summary
+        """Calls, tokens and cost per model over every recorded call, not just retained rows."""
+        with self._lock:
+            return {model: dict(row) for model, row in self._by_model.items()}
@@ -7,6 +7,8 @@ from typing import Any, Dict, List, Optional
 
 import httpx
 
+from ..utils.http_pool import HTTPClientPool, HTTPPoolConfig
+
 
 @dataclass
 class WrappedLLMRequest:
@@ -45,6 +47,10 @@ class LocalLLMRequestWrapper:
 
     The output of ``build_transfer_payload`` is designed to be generated by a
     public LLM and then transmitted to a local LLM service with minimal parsing.
+
+    ``execute`` reuses one pooled client per origin. Use the wrapper as an
+    ``async with`` block, or call :meth:`aclose`, to close that client;
+    an ``http_pool`` passed in is left open for its owner.
     """
 
     JSON_BLOCK_PATTERN = re.compile(r"```json\s*(\{.*?\})\s*```", re.DOTALL)
@@ -56,11 +62,14 @@ class LocalLLMRequestWrapper:
         model: str,
         api_key: Optional[str] = None,
         timeout_seconds: float = 30.0,
+        http_pool: Optional[HTTPClientPool] = None,
     ) -> None:
         self.base_url = base_url.rstrip("/")
         self.model = model
         self.api_key = api_key
         self.timeout_seconds = timeout_seconds
+        self._http_pool = http_pool or HTTPClientPool(HTTPPoolConfig(timeout_seconds=timeout_seconds))
+        self._owns_pool = http_pool is None
 
     def build_transfer_payload(self, request: WrappedLLMRequest) -> str:
         """Create a plain-text wrapper payload safe to pass across tools/models."""
@@ -100,25 +109,31 @@ class LocalLLMRequestWrapper:
         if self.api_key:
             headers["Authorization"] = f"Bearer {self.api_key}"
 
-        should_close = client is None
-        http_client = client or httpx.AsyncClient(timeout=self.timeout_seconds)
-
-        try:
-            response = await http_client.post(
-                f"{self.base_url}/v1/chat/completions",
-                headers=headers,
-                json=payload,
-            )
-            response.raise_for_status()
-            raw = response.json()
-        finally:
-            if should_close:
-                await http_client.aclose()
+        http_client = client or self._http_pool.client(self.base_url)
+        response = await http_client.post(
+            f"{self.base_url}/v1/chat/completions",
+            headers=headers,
+            json=payload,
+            timeout=self.timeout_seconds,
+        )
+        response.raise_for_status()
+        raw = response.json()
 
         content = raw["choices"][0]["message"]["content"]
         model = raw.get("model", self.model)
         return WrappedLLMResponse(content=content, model=model, raw_response=raw)
 
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client if this wrapper created its own pool."""
+        if self._owns_pool:
+            await self._http_pool.aclose()
+
+    async def __aenter__(self) -> "LocalLLMRequestWrapper":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
     @staticmethod
     def _build_messages(request: WrappedLLMRequest) -> List[Dict[str, str]]:
         messages: List[Dict[str, str]] = []
@@ -1 +1,11 @@
 # AI PowerTools Shared Utilities
+
+from .http_pool import HTTPClientPool, HTTPPoolConfig
+from .token_counter import TokenCounter, default_token_counter
+
+__all__ = [
+    "HTTPClientPool",
+    "HTTPPoolConfig",
+    "TokenCounter",
+    "default_token_counter",
+]
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import importlib.util
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import httpx
+
+
+@dataclass
+class HTTPPoolConfig:
+    """Connection settings shared by every client a pool hands out."""
+
+    timeout_seconds: float = 60.0
+    connect_timeout_seconds: float = 5.0
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry_seconds: float = 30.0
+    http2: bool = False
+
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry_seconds,
+        )
+
+    def timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(self.timeout_seconds, connect=self.connect_timeout_seconds)
+
+
+class HTTPClientPool:
+    """
+    Long-lived ``httpx.AsyncClient`` instances, one per origin.
+
+    Providers ask the pool for a client instead of opening one per call, so
+    TCP/TLS connections are kept alive and reused across requests. Because
+    each origin gets its own client, ``max_connections`` acts as a per-host
+    limit. Several providers may share one pool; whoever created it is
+    responsible for calling :meth:`aclose`.
+    """
+
+    def __init__(
+        self,
+        config: Optional[HTTPPoolConfig] = None,
+        *,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        self.config = config or HTTPPoolConfig()
+        if self.config.http2 and importlib.util.find_spec("h2") is None:
+            raise ImportError("HTTP/2 support requires the 'h2' package: pip install httpx[http2]")
+        self._transport = transport
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    @staticmethod
+    def _origin(base_url: str) -> str:
+        url = httpx.URL(base_url)
+        port = f":{url.port}" if url.port else ""
+        return f"{url.scheme}://{url.host}{port}"
+
+    def client(self, base_url: str) -> httpx.AsyncClient:
+        """Return the pooled client for *base_url*'s origin, creating it on first use."""
+        origin = self._origin(base_url)
+        client = self._clients.get(origin)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                timeout=self.config.timeout(),
+                limits=self.config.limits(),
+                http2=self.config.http2,
+                transport=self._transport,
+            )
+            self._clients[origin] = client
+        return client
+
+    @property
+    def origins(self) -> list[str]:
+        return [origin for origin, client in self._clients.items() if not client.is_closed]
+
+    async def aclose(self) -> None:
+        """Close every pooled client. The pool may be reused afterwards."""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            await client.aclose()
+
+    async def __aenter__(self) -> "HTTPClientPool":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import math
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+_tiktoken: Any = _MISSING
+
+
+def _load_tiktoken() -> Any:
+    """Import tiktoken on first use; ``None`` when it is not installed."""
+    global _tiktoken
+    if _tiktoken is _MISSING:
+        try:
+            import tiktoken
+        except ImportError:
+            tiktoken = None
+        _tiktoken = tiktoken
+    return _tiktoken
+
+
+class TokenCounter:
+    """
+    Pre-call token counts: exact via ``tiktoken`` where it knows the model, estimated elsewhere.
+
+    The tokenizer for a model is resolved once and cached; ``tiktoken`` is
+    only imported on the first count and is optional. Exact counts are
+    memoised by a hash of the text in an LRU of ``cache_size`` entries, so a
+    system prompt or shared context resent on every call is tokenised once.
+    Texts shorter than ``min_cached_chars`` are not memoised, as hashing them
+    costs about as much as counting.
+
+    Models ``tiktoken`` does not know (local Llama, Mistral, ...) use a
+    characters-per-token estimate, ``chars_per_token`` by default. Feed
+    actual prompt token counts back through :meth:`observe` and the ratio
+    is calibrated per model with an exponential moving average. The same
+    estimate stands in when ``tiktoken`` fails to load an encoding.
+    """
+
+    def __init__(
+        self,
+        *,
+        chars_per_token: float = 4.0,
+        cache_size: int = 8192,
+        min_cached_chars: int = 256,
+        calibration_alpha: float = 0.1,
+    ) -> None:
+        self.chars_per_token = chars_per_token
+        self.cache_size = cache_size
+        self.min_cached_chars = min_cached_chars
+        self.calibration_alpha = calibration_alpha
+        self._encodings: Dict[str, Any] = {}
+        self._ratios: Dict[str, float] = {}
+        self._cache: "OrderedDict[Tuple[str, bytes], int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_failed = False
+        self.hits = 0
+        self.misses = 0
+
+    def encoding_for(self, model: str) -> Any:
+        """The cached ``tiktoken`` encoding for *model*, or ``None`` to estimate."""
+        encoding = self._encodings.get(model, _MISSING)
+        if encoding is _MISSING:
+            encoding = self._encodings[model] = self._load_encoding(model)
+        return encoding
+
+    async def preload(self, models: Iterable[str]) -> None:
+        """Resolve the encodings for *models* in a worker thread.
+
+        ``tiktoken`` downloads a model's BPE file the first time it is asked
+        for it; preloading keeps that blocking I/O off the event loop and out
+        of the first request.
+        """
+        pending = [model for model in set(models) if model not in self._encodings]
+        if pending:
+            await asyncio.to_thread(lambda: [self.encoding_for(model) for model in pending])
+
+    def _load_encoding(self, model: str) -> Any:
+        tiktoken = _load_tiktoken()
+        if tiktoken is None:
+            return None
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return None
+        except Exception as e:
+            # Fetching the BPE file can fail (offline, proxy, read-only cache
+            # dir); counting must never fail a request, so estimate instead.
+            if not self._load_failed:
+                self._load_failed = True
+                logger.warning(
+                    "tiktoken could not load an encoding for %r (%s); estimating token counts instead",
+                    model, e,
+                )
+            return None
+
+    def is_exact(self, model: str) -> bool:
+        return self.encoding_for(model) is not None
+
+    def count(self, text: str, model: str) -> int:
+        """Tokens in *text* for *model*."""
+        if not text:
+            return 0
+        encoding = self.encoding_for(model)
+        if encoding is None:
+            return self._estimate(text, model)
+        if len(text) < self.min_cached_chars:
+            return len(encoding.encode_ordinary(text))
+        key = (encoding.name, hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest())
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        count = len(encoding.encode_ordinary(text))
+        self._store(key, count)
+        return count
+
+    def count_many(self, texts: Sequence[str], model: str) -> List[int]:
+        """Token counts for each of *texts*; uncached texts are encoded in one batch call."""
+        encoding = self.encoding_for(model)
+        if encoding is None:
+            return [self._estimate(text, model) if text else 0 for text in texts]
+        counts: List[Optional[int]] = [None] * len(texts)
+        keys: Dict[int, Tuple[str, bytes]] = {}
+        todo: List[int] = []
+        for i, text in enumerate(texts):
+            if not text:
+                counts[i] = 0
+                continue
+            if len(text) >= self.min_cached_chars:
+                key = keys[i] = (encoding.name, hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest())
+                counts[i] = self._lookup(key)
+            if counts[i] is None:
+                todo.append(i)
+        if todo:
+            encoded = encoding.encode_ordinary_batch([texts[i] for i in todo])
+            for i, tokens in zip(todo, encoded):
+                counts[i] = len(tokens)
+                if i in keys:
+                    self._store(keys[i], len(tokens))
+        return counts  # type: ignore[return-value]
+
+    def observe(self, text: str, model: str, actual_tokens: Optional[int]) -> None:
+        """Calibrate the estimate for *model* from a provider-reported prompt token count."""
+        if not text or not actual_tokens or self.encoding_for(model) is not None:
+            return
+        # Reported counts include chat-template tokens, which dominate on
+        # very short prompts; keep a single call from skewing the ratio.
+        observed = min(max(len(text) / actual_tokens, 1.0), 8.0)
+        with self._lock:
+            ratio = self._ratios.get(model)
+            self._ratios[model] = (
+                observed if ratio is None else ratio + self.calibration_alpha * (observed - ratio)
+            )
+
+    def chars_per_token_for(self, model: str) -> float:
+        return self._ratios.get(model, self.chars_per_token)
+
+    def _estimate(self, text: str, model: str) -> int:
+        return math.ceil(len(text) / self._ratios.get(model, self.chars_per_token))
+
+    def _lookup(self, key: Tuple[str, bytes]) -> Optional[int]:
+        with self._lock:
+            count = self._cache.get(key)
+            if count is None:
+                self.misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return count
+
+    def _store(self, key: Tuple[str, bytes], count: int) -> None:
+        with self._lock:
+            self._cache[key] = count
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+
+_default_counter: Optional[TokenCounter] = None
+
+
+def default_token_counter() -> TokenCounter:
+    """The process-wide :class:`TokenCounter` shared by providers and trackers that are not given one."""
+    global _default_counter
+    if _default_counter is None:
+        _default_counter = TokenCounter()
+    return _default_counter
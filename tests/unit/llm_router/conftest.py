@@ -0,0 +1,118 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from powertools.router.llm_router import LLMRouter, TokenCostTracker
+from powertools.router.llm_router.base import LLMProvider
+from powertools.router.llm_router.models import LLMResponse, ProviderType
+from powertools.utils import token_counter
+
+
+@pytest.fixture(autouse=True)
+def fresh_default_token_counter(monkeypatch):
+    """Give each test its own shared TokenCounter, so calibration does not leak between tests."""
+    monkeypatch.setattr(token_counter, "_default_counter", None)
+
+
+class FakeClock:
+    """Clock the test advances by hand; ``sleep`` records the wait and moves time on."""
+
+    def __init__(self, now=0.0):
+        self.now = now
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def llm_response(content="ok", model="llama3", provider="ollama", provider_type=ProviderType.LOCAL, usage=None):
+    return LLMResponse(
+        content=content, model=model, provider=provider, provider_type=provider_type, usage=dict(usage or {})
+    )
+
+
+@pytest.fixture
+def make_response():
+    return llm_response
+
+
+def mock_provider(
+    provider_id="ollama",
+    provider_type=ProviderType.LOCAL,
+    models=("llama3",),
+    *,
+    healthy=True,
+    loaded=None,
+    content="ok",
+    usage=None,
+    error=None,
+    delay=0.0,
+    generate=None,
+):
+    """A healthy ``LLMProvider`` mock answering ``content`` for whichever model it is asked for.
+
+    ``error`` is raised after ``delay`` seconds instead of answering; ``generate``
+    replaces the default coroutine altogether.
+    """
+    provider = MagicMock(spec=LLMProvider)
+    provider.provider_id = provider_id
+    provider.provider_type = provider_type
+    provider.supports_affinity = False
+    provider.is_healthy = AsyncMock(return_value=healthy)
+    provider.get_supported_models.return_value = list(models)
+    provider.get_loaded_models = AsyncMock(return_value=loaded)
+
+    async def answer(prompt, model, **kwargs):
+        if delay:
+            await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return llm_response(content, model, provider_id, provider_type, usage)
+
+    provider.generate = AsyncMock(side_effect=generate or answer)
+    return provider
+
+
+@pytest.fixture
+def make_provider():
+    return mock_provider
+
+
+def router_for(*providers, local_model="llama3", cloud_model="gpt-4o"):
+    """An ``LLMRouter`` with *providers* registered and the given default models."""
+    router = LLMRouter()
+    for provider in providers:
+        router.register_provider(provider)
+    router.set_defaults(local_model=local_model, cloud_model=cloud_model)
+    return router
+
+
+@pytest.fixture
+def make_router():
+    return router_for
+
+
+PRICES = {"gpt": (1.0, 2.0), "llama": (0.0, 0.0)}
+
+
+def cost_tracker(prices=None, **kwargs):
+    """A ``TokenCostTracker`` with per-1k ``(input, output)`` *prices* registered; *kwargs* go to the tracker."""
+    tracker = TokenCostTracker(**kwargs)
+    for model, (input_cost, output_cost) in (prices or PRICES).items():
+        tracker.register_model_pricing(model, input_cost_per_1k=input_cost, output_cost_per_1k=output_cost)
+    return tracker
+
+
+@pytest.fixture
+def make_tracker():
+    return cost_tracker
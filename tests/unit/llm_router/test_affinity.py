@@ -0,0 +1,69 @@
+import pytest
+
+from powertools.router.llm_router import LLMRouter, PrefixAffinity, ProviderPool
+from powertools.router.llm_router.affinity import rendezvous_pick
+
+SYSTEM_PROMPT = "You are a careful coding agent. " * 40
+
+
+def test_key_uses_prefix_or_session():
+    affinity = PrefixAffinity(prefix_chars=64)
+    first = affinity.key_for(SYSTEM_PROMPT + "turn 1")
+    second = affinity.key_for(SYSTEM_PROMPT + "turn 1\nturn 2")
+    assert first == second
+    assert affinity.key_for("something else entirely") != first
+    assert affinity.key_for("anything", session_key="abc") == affinity.key_for("other", session_key="abc")
+
+
+def test_rendezvous_only_moves_keys_of_removed_instance():
+    instances = ["a", "b", "c", "d"]
+    keys = [f"key-{i}" for i in range(200)]
+    before = {k: rendezvous_pick(k, instances) for k in keys}
+    after = {k: rendezvous_pick(k, ["a", "b", "d"]) for k in keys}
+
+    moved = [k for k in keys if before[k] != after[k]]
+    assert moved and all(before[k] == "c" for k in moved)
+    assert len(set(before.values())) == 4
+
+
+@pytest.mark.asyncio
+async def test_router_sticks_prefix_to_one_provider_and_reports_hits(make_provider):
+    providers = [make_provider(f"box-{i}") for i in range(4)]
+    router = LLMRouter()
+    for provider in providers:
+        router.register_provider(provider)
+    router.set_defaults(local_model="llama3", cloud_model="gpt-4o")
+    router.set_affinity(prefix_chars=256)
+
+    served = {(await router.route(SYSTEM_PROMPT + f"turn {i}", complexity=0.1)).provider for i in range(5)}
+
+    assert len(served) == 1
+    assert router.affinity.stats.new_keys == 1
+    assert router.affinity.stats.hits == 4
+
+    # Rebalance when the sticky instance goes away.
+    sticky = next(p for p in providers if p.provider_id in served)
+    router.health.mark_unhealthy(sticky.provider_id, ConnectionError("down"))
+    moved = await router.route(SYSTEM_PROMPT + "turn 6", complexity=0.1)
+    assert moved.provider != sticky.provider_id
+    assert router.affinity.stats.moves == 1
+
+
+@pytest.mark.asyncio
+async def test_session_key_pins_pool_endpoint(make_provider):
+    endpoints = [make_provider() for _ in range(3)]
+    for i, endpoint in enumerate(endpoints):
+        endpoint.base_url = f"http://gpu{i}:11434"
+    pool = ProviderPool("gpu-pool", endpoints)
+    router = LLMRouter()
+    router.register_provider(pool)
+    router.set_defaults(local_model="llama3", cloud_model="gpt-4o")
+    router.set_affinity()
+
+    seen = set()
+    for i in range(6):
+        response = await router.route(f"message {i}", complexity=0.1, session_key="conversation-42")
+        seen.add(response.metadata["endpoint"])
+
+    assert len(seen) == 1
+    assert router.affinity.stats.hit_rate == 1.0
@@ -0,0 +1,144 @@
+import multiprocessing
+import threading
+
+import pytest
+
+from powertools.router.llm_router import (
+    RemoteUsageRecorder,
+    ShardedRecorder,
+    UsageAggregator,
+    Window,
+)
+
+
+def run_threads(target, count):
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_tracker_totals_are_exact_under_threads(make_tracker):
+    tracker = make_tracker()
+
+    def work(i):
+        for _ in range(500):
+            tracker.record_usage(model="gpt" if i % 2 else "llama", input_tokens=10, output_tokens=5)
+
+    run_threads(work, 8)
+    assert tracker.call_count == 4000
+    assert tracker.total_tokens == 4000 * 15
+    assert tracker.summarize_by_model()["gpt"]["calls"] == 2000
+
+
+def test_sharded_recorder_batches_and_reads_exact_totals(make_tracker):
+    tracker = make_tracker()
+    recorder = ShardedRecorder(tracker, batch_size=64)
+
+    def work(i):
+        for _ in range(1000):
+            recorder.record_usage(model="gpt", input_tokens=1000, output_tokens=0)
+
+    run_threads(work, 8)
+    assert recorder.pending == 8 * (1000 % 64)
+    assert recorder.call_count == 8000
+    assert recorder.total_cost == pytest.approx(8000.0)
+    assert recorder.pending == 0
+    assert tracker.windows.usage(Window.DAY, model="gpt")["calls"] == 8000
+    with pytest.raises(ValueError):
+        recorder.record_usage(model="unknown", input_tokens=1, output_tokens=1)
+
+
+def test_sharded_recorder_reads_wait_for_batches_in_flight(make_tracker):
+    tracker = make_tracker()
+    recorder = ShardedRecorder(tracker, batch_size=4)
+    entered, release = threading.Event(), threading.Event()
+    record_batch = tracker.record_batch
+
+    def slow_record_batch(rows):
+        entered.set()
+        release.wait(5)
+        return record_batch(rows)
+
+    tracker.record_batch = slow_record_batch
+    writer = threading.Thread(
+        target=lambda: [recorder.record_usage(model="gpt", input_tokens=1, output_tokens=0) for _ in range(4)]
+    )
+    writer.start()
+    assert entered.wait(5)
+    counts = []
+    reader = threading.Thread(target=lambda: counts.append(recorder.call_count))
+    reader.start()
+    reader.join(0.1)
+    assert reader.is_alive()  # blocked on the shard until its batch lands
+    release.set()
+    writer.join()
+    reader.join()
+    assert counts == [4]
+
+
+def _worker(address, count):
+    with RemoteUsageRecorder(address, batch_size=50) as recorder:
+        for _ in range(count):
+            recorder.record_usage(model="gpt", input_tokens=1000, output_tokens=0, metadata={"job": "batch"})
+
+
+def test_aggregator_collects_exact_totals_from_processes(tmp_path, make_tracker):
+    tracker = make_tracker()
+    with UsageAggregator(tracker, str(tmp_path / "usage.sock")) as aggregator:
+        processes = [
+            multiprocessing.Process(target=_worker, args=(aggregator.address, 333)) for _ in range(3)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(timeout=30)
+            assert process.exitcode == 0
+
+    assert tracker.call_count == 999
+    assert tracker.total_cost == pytest.approx(999.0)
+    assert tracker.records[0].metadata == {"job": "batch"}
+
+
+def test_aggregator_over_tcp_rejects_unpriced_batches_atomically(make_tracker):
+    tracker = make_tracker()
+    with UsageAggregator(tracker, ("127.0.0.1", 0)) as aggregator:
+        recorder = RemoteUsageRecorder(aggregator.address, batch_size=10)
+        recorder.record_usage(model="gpt", input_tokens=1, output_tokens=1)
+        recorder.record_usage(model="unknown", input_tokens=1, output_tokens=1)
+        with pytest.raises(ValueError, match="No pricing registered"):
+            recorder.flush()
+        recorder.record_usage(model="llama", input_tokens=1, output_tokens=1)
+        recorder.close()
+
+    assert tracker.call_count == 1
+    assert tracker.summarize_by_model() == {
+        "llama": {"calls": 1.0, "input_tokens": 1.0, "output_tokens": 1.0, "cost": 0.0}
+    }
+
+
+class _LostAck:
+    def readline(self):
+        raise ConnectionResetError("connection lost before the ack")
+
+    def close(self):
+        pass
+
+
+def test_batch_resent_after_lost_ack_is_counted_once(make_tracker):
+    tracker = make_tracker()
+    with UsageAggregator(tracker, ("127.0.0.1", 0)) as aggregator:
+        recorder = RemoteUsageRecorder(aggregator.address, batch_size=100)
+        recorder.record_usage(model="gpt", input_tokens=1000, output_tokens=0)
+        recorder.flush()
+        recorder.record_usage(model="gpt", input_tokens=1000, output_tokens=0)
+        recorder.record_usage(model="gpt", input_tokens=1000, output_tokens=0)
+        recorder._reader = _LostAck()
+        with pytest.raises(ConnectionResetError):
+            recorder.flush()
+        recorder.record_usage(model="llama", input_tokens=1, output_tokens=1)
+        recorder.close()
+
+    assert tracker.call_count == 4
+    assert tracker.summarize_by_model()["gpt"]["calls"] == 3
@@ -0,0 +1,127 @@
+import functools
+
+import pytest
+
+from powertools.router.llm_router import (
+    BudgetAction,
+    BudgetExceededError,
+    BudgetRule,
+    LLMRouter,
+    ResponseCache,
+    SQLiteUsageLedger,
+    Window,
+)
+from powertools.router.llm_router.models import ProviderType
+
+
+PRICES = {"gpt-4o": (10.0, 10.0), "llama3": (0.0, 0.0)}
+
+
+@pytest.fixture
+def clock(clock):
+    clock.now = 1_000_000.0
+    return clock
+
+
+@pytest.fixture
+def make_tracker(make_tracker, clock):
+    return functools.partial(make_tracker, PRICES, clock=clock)
+
+
+@pytest.fixture
+def router(make_provider, make_router, make_tracker):
+    usage = {"prompt_tokens": 100, "completion_tokens": 0}
+    router = make_router(
+        make_provider("ollama", ProviderType.LOCAL, ["llama3"], usage=usage),
+        make_provider("openai", ProviderType.CLOUD, ["gpt-4o"], usage=usage),
+    )
+    router.set_cost_tracker(make_tracker())
+    return router
+
+
+def test_windows_slide_and_break_down_by_model_and_tag(clock, make_tracker):
+    tracker = make_tracker()
+    tracker.record_usage(model="gpt-4o", input_tokens=100, output_tokens=0, metadata={"team": "search"})
+    clock.now += 30
+    tracker.record_usage(model="llama3", input_tokens=50, output_tokens=0, metadata={"team": "ads"})
+    windows = tracker.windows
+
+    assert windows.usage(Window.MINUTE) == {"calls": 2, "tokens": 150, "cost": pytest.approx(1.0)}
+    assert windows.spend(Window.HOUR, tag="team=search") == pytest.approx(1.0)
+    assert windows.breakdown(Window.HOUR)["llama3"]["tokens"] == 50
+    assert set(windows.breakdown(Window.DAY, scope="tag")) == {"team=search", "team=ads"}
+
+    clock.now += 45  # first call is now older than a minute
+    assert windows.usage(Window.MINUTE, model="gpt-4o")["calls"] == 0
+    assert windows.usage(Window.MINUTE)["calls"] == 1
+    assert windows.usage(Window.HOUR)["calls"] == 2
+
+    series = windows.series(Window.HOUR, model="gpt-4o")
+    assert len(series) == 60 and sum(b["calls"] for b in series) == 1
+
+    clock.now += 2 * 86400
+    assert windows.breakdown(Window.DAY) == {}
+
+
+def test_windows_are_replayed_from_ledger(tmp_path, clock, make_tracker):
+    tracker = make_tracker(ledger=SQLiteUsageLedger(str(tmp_path / "usage.db")))
+    tracker.record_usage(model="gpt-4o", input_tokens=100, output_tokens=0)
+    clock.now += 2 * 86400
+    tracker.record_usage(model="gpt-4o", input_tokens=200, output_tokens=0)
+    tracker.close()
+
+    restored = make_tracker(ledger=SQLiteUsageLedger(str(tmp_path / "usage.db")))
+    assert restored.call_count == 2
+    assert restored.windows.usage(Window.DAY)["tokens"] == 200
+
+
+@pytest.mark.asyncio
+async def test_router_refuses_once_budget_is_spent(clock, router):
+    router.set_budgets([BudgetRule(window=Window.HOUR, max_cost=1.5, tag="team=search")])
+
+    await router.route("x", complexity=0.9, tags={"team": "search"})
+    await router.route("x", complexity=0.9, tags={"team": "search"})
+    with pytest.raises(BudgetExceededError, match="tag 'team=search'"):
+        await router.route("x", complexity=0.9, tags={"team": "search"})
+
+    # Other teams are unaffected, and the budget frees up as the window slides.
+    assert (await router.route("x", complexity=0.9, tags={"team": "ads"})).provider == "openai"
+    clock.now += 3600
+    assert (await router.route("x", complexity=0.9, tags={"team": "search"})).provider == "openai"
+    assert router._cost_tracker.records[0].metadata == {"team": "search", "provider": "openai"}
+
+
+@pytest.mark.asyncio
+async def test_router_downgrades_to_local_model_when_model_budget_is_spent(router):
+    router.set_budgets([
+        BudgetRule(window=Window.DAY, max_tokens=100, model="gpt-4o", action=BudgetAction.DOWNGRADE),
+    ])
+
+    first = await router.route("x", complexity=0.9)
+    second = await router.route("x", complexity=0.9)
+
+    assert first.provider == "openai"
+    assert second.provider == "ollama" and second.model == "llama3"
+
+
+@pytest.mark.asyncio
+async def test_cached_answers_are_served_after_a_downgrade_budget_fires(clock, router):
+    router.set_response_cache(ResponseCache(clock=clock))
+    router.set_budgets([
+        BudgetRule(window=Window.DAY, max_tokens=100, model="gpt-4o", action=BudgetAction.DOWNGRADE),
+    ])
+
+    await router.route("cached prompt", complexity=0.9)
+    repeat = await router.route("cached prompt", complexity=0.9)
+    fresh = await router.route("new prompt", complexity=0.9)
+
+    assert repeat.metadata["cache_hit"] is True and repeat.model == "gpt-4o"
+    assert fresh.model == "llama3"
+    assert router._providers["openai"].generate.await_count == 1
+
+
+def test_set_budgets_requires_cost_tracker():
+    with pytest.raises(ValueError):
+        LLMRouter().set_budgets([BudgetRule(max_cost=1.0)])
+    with pytest.raises(ValueError):
+        BudgetRule()
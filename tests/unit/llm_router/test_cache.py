@@ -0,0 +1,171 @@
+import functools
+import threading
+
+import pytest
+
+from powertools.router.llm_router import (
+    LLMRouter,
+    ResponseCache,
+    SQLiteCacheStore,
+    TokenCostTracker,
+)
+from powertools.router.llm_router.cache import cache_key
+from powertools.router.llm_router.models import ProviderType
+
+
+USAGE = {"prompt_tokens": 1000, "completion_tokens": 1000}
+
+
+@pytest.fixture
+def make_response(make_response):
+    return functools.partial(
+        make_response, model="gpt-4o", provider="openai", provider_type=ProviderType.CLOUD, usage=USAGE
+    )
+
+
+def test_cache_key_normalises_prompt_and_sorts_kwargs():
+    a = cache_key("  Hello\r\nworld ", "m", "p", {"temperature": 0, "top_p": 1})
+    b = cache_key("Hello\nworld", "m", "p", {"top_p": 1, "temperature": 0})
+
+    assert a == b
+    assert a != cache_key("Hello\nworld", "m", "p", {"temperature": 0.7, "top_p": 1})
+    assert a != cache_key("Hello  world", "m", "p", {"temperature": 0, "top_p": 1})
+
+
+def test_ttl_expiry_and_stats(clock, make_response):
+    cache = ResponseCache(ttl_seconds=10, clock=clock)
+    cache.set("k", make_response("answer"))
+
+    assert cache.get("k").content == "answer"
+    clock.now += 11
+    assert cache.get("k") is None
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+    assert cache.stats.hit_rate == 0.5
+
+
+def test_lru_evicts_by_entries_and_bytes(make_response):
+    cache = ResponseCache(max_entries=2, max_bytes=10)
+    cache.set("a", make_response("aaaa"))
+    cache.set("b", make_response("bbbb"))
+    cache.get("a")
+    cache.set("c", make_response("cccc"))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    cache.set("d", make_response("dddddddd"))
+    assert len(cache) == 1
+    assert cache.size_bytes == 8
+    assert cache.stats.evictions == 3
+
+
+def test_returned_responses_are_copies(make_response):
+    cache = ResponseCache()
+    cache.set("k", make_response("answer"))
+    cache.get("k").metadata["mutated"] = True
+
+    assert "mutated" not in cache.get("k").metadata
+
+
+def test_hits_are_free_and_tagged(make_response):
+    cache = ResponseCache()
+    response = make_response("answer")
+    response.cost, response.latency_ms = 0.02, 800.0
+    cache.set("k", response)
+
+    hit = cache.get("k")
+    assert (hit.cost, hit.latency_ms) == (0.0, 0.0)
+    assert hit.metadata["cache_hit"] is True
+    assert cache.stats.saved_cost == pytest.approx(0.02)
+    assert cache.stats.saved_latency_ms == 800.0
+
+
+@pytest.mark.asyncio
+async def test_async_access_runs_store_io_off_the_event_loop(tmp_path, make_response):
+    threads = []
+
+    class RecordingStore(SQLiteCacheStore):
+        def get(self, key, now):
+            threads.append(threading.get_ident())
+            return super().get(key, now)
+
+        def set(self, key, response, expires_at):
+            threads.append(threading.get_ident())
+            super().set(key, response, expires_at)
+
+    store = RecordingStore(str(tmp_path / "cache.db"))
+    await ResponseCache(store=store).aset("k", make_response("persisted"))
+    hit = await ResponseCache(store=store).aget("k")
+
+    assert hit.content == "persisted"
+    assert len(threads) == 2
+    assert threading.get_ident() not in threads
+    store.close()
+
+
+def test_sqlite_store_survives_restart(tmp_path, make_response):
+    path = str(tmp_path / "cache.db")
+    first = ResponseCache(store=SQLiteCacheStore(path))
+    first.set("k", make_response("persisted"))
+    first.store.close()
+
+    second = ResponseCache(store=SQLiteCacheStore(path))
+    assert second.get("k").content == "persisted"
+    assert len(second) == 1
+    second.store.close()
+
+
+def test_oversized_store_entry_is_served_without_promotion(tmp_path, make_response):
+    store = SQLiteCacheStore(str(tmp_path / "cache.db"))
+    store.set("k", make_response("x" * 1000), expires_at=10**12)
+    cache = ResponseCache(max_bytes=100, store=store)
+    cache.set("small", make_response("tiny"))
+
+    assert cache.get("k").content == "x" * 1000
+    assert cache.get("small") is not None
+    assert len(cache) == 1
+    assert cache.stats.evictions == 0
+    store.close()
+
+
+@pytest.mark.asyncio
+async def test_router_serves_repeat_requests_from_cache(make_provider):
+    provider = make_provider("openai", ProviderType.CLOUD, ["gpt-4o"], content="answer", usage=USAGE)
+
+    tracker = TokenCostTracker()
+    tracker.register_model_pricing("gpt-4o", input_cost_per_1k=0.005, output_cost_per_1k=0.015)
+    router = LLMRouter()
+    router.register_provider(provider)
+    router.set_defaults(local_model="llama3", cloud_model="gpt-4o")
+    router.set_cost_tracker(tracker)
+    router.set_response_cache(ResponseCache())
+
+    first = await router.route("Extract", complexity=0.9, temperature=0)
+    second = await router.route("Extract", complexity=0.9, temperature=0)
+    await router.route("Extract", complexity=0.9, temperature=1)
+
+    assert "cache_hit" not in first.metadata
+    assert second.metadata["cache_hit"] is True
+    assert first.cost == pytest.approx(0.02)
+    assert second.cost == 0.0
+    assert tracker.total_cost == pytest.approx(0.04)
+    assert second.content == first.content
+    assert provider.generate.await_count == 2
+    assert router.response_cache.stats.saved_cost == pytest.approx(0.02)
+
+
+@pytest.mark.asyncio
+async def test_router_caches_under_the_fallback_target_that_answered(make_provider):
+    failing = make_provider("box-a", ProviderType.LOCAL, ["llama3"], error=ConnectionError("down"))
+    cloud = make_provider("openai", ProviderType.CLOUD, ["gpt-4o"], content="answer", usage=USAGE)
+    router = LLMRouter()
+    router.register_provider(failing)
+    router.register_provider(cloud)
+    router.set_defaults(local_model="llama3", cloud_model="gpt-4o")
+    router.set_response_cache(ResponseCache())
+
+    await router.route("Extract", complexity=0.1)
+
+    cache = router.response_cache
+    assert cache.get(cache_key("Extract", "gpt-4o", "openai", {})) is not None
+    assert cache.get(cache_key("Extract", "llama3", "box-a", {})) is None
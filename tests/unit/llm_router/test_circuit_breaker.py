@@ -0,0 +1,111 @@
+import pytest
+
+from powertools.router.llm_router import (
+    CircuitBreakerConfig,
+    CircuitBreakerRegistry,
+    CircuitOpenError,
+    CircuitState,
+    LLMRouter,
+)
+from powertools.router.llm_router.models import ProviderType, RoutingDecision
+
+
+def test_opens_on_error_rate_and_recovers_through_half_open(clock):
+    registry = CircuitBreakerRegistry(
+        CircuitBreakerConfig(min_calls=4, error_rate_threshold=0.5, open_seconds=10, half_open_successes=2),
+        clock=clock,
+    )
+    registry.record_success("ollama", "llama3", 100)
+    registry.record_success("ollama", "llama3", 100)
+    registry.record_failure("ollama", "llama3")
+    assert not registry.is_open("ollama", "llama3")
+    registry.record_failure("ollama", "llama3")
+    assert registry.is_open("ollama", "llama3")
+    assert not registry.try_acquire("ollama", "llama3")
+
+    clock.now = 10
+    assert registry.breaker("ollama").state == CircuitState.HALF_OPEN
+    assert registry.try_acquire("ollama", "llama3")
+    assert not registry.try_acquire("ollama", "llama3")  # one trial at a time
+    registry.record_success("ollama", "llama3", 100)
+    assert registry.try_acquire("ollama", "llama3")
+    registry.record_success("ollama", "llama3", 100)
+
+    assert registry.breaker("ollama").state == CircuitState.CLOSED
+    assert [t.to_state for t in registry.transitions if t.key == "ollama"] == [
+        CircuitState.OPEN,
+        CircuitState.HALF_OPEN,
+        CircuitState.CLOSED,
+    ]
+
+
+def test_failed_trial_reopens(clock):
+    registry = CircuitBreakerRegistry(CircuitBreakerConfig(min_calls=1, open_seconds=5), clock=clock)
+    registry.record_failure("ollama", "llama3")
+    clock.now = 5
+    assert registry.try_acquire("ollama", "llama3")
+    registry.record_failure("ollama", "llama3")
+    assert registry.breaker("ollama").state == CircuitState.OPEN
+    clock.now = 9
+    assert registry.is_open("ollama", "llama3")
+
+
+def test_slow_calls_trip_the_breaker():
+    registry = CircuitBreakerRegistry(
+        CircuitBreakerConfig(min_calls=3, slow_call_ms=1000, slow_call_rate_threshold=0.6)
+    )
+    registry.record_success("ollama", "llama3", 5000)
+    registry.record_success("ollama", "llama3", 200)
+    registry.record_success("ollama", "llama3", 5000)
+    assert registry.is_open("ollama", "llama3")
+    assert "slow-call" in registry.transitions[-1].reason
+
+
+def test_model_breaker_leaves_other_models_in_rotation():
+    registry = CircuitBreakerRegistry(CircuitBreakerConfig(min_calls=2))
+    for _ in range(3):
+        registry.record_success("ollama", "mistral")
+    registry.record_failure("ollama", "llama3")
+    registry.record_failure("ollama", "llama3")
+    assert registry.is_open("ollama", "llama3")
+    assert not registry.is_open("ollama", "mistral")
+
+
+@pytest.mark.asyncio
+async def test_router_skips_open_circuit_without_calling_provider(make_provider):
+    local = make_provider("ollama", ProviderType.LOCAL, ["llama3"])
+    cloud = make_provider("openai", ProviderType.CLOUD, ["gpt-4"])
+    router = LLMRouter()
+    router.register_provider(local)
+    router.register_provider(cloud)
+    router.set_defaults(local_model="llama3", cloud_model="gpt-4")
+    router.configure_circuit_breakers(CircuitBreakerConfig(min_calls=1))
+    router.circuit_breakers.record_failure("ollama", "llama3")
+    local.is_healthy.reset_mock()
+
+    response = await router.route("hi", complexity=0.1)
+
+    assert response.provider == "openai"
+    local.generate.assert_not_called()
+    local.is_healthy.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_router_records_failures_and_refuses_open_target(make_provider):
+    local = make_provider("ollama", ProviderType.LOCAL, ["llama3"])
+    local.generate.side_effect = ConnectionError("down")
+    router = LLMRouter()
+    router.register_provider(local)
+    router.set_defaults(local_model="llama3", cloud_model="gpt-4")
+    router.configure_circuit_breakers(CircuitBreakerConfig(min_calls=1))
+
+    with pytest.raises(ConnectionError):
+        await router.route("hi", complexity=0.1)
+    assert router.circuit_breakers.is_open("ollama", "llama3")
+
+    with pytest.raises(RuntimeError, match="No healthy providers"):
+        await router._make_routing_decision("hi", 0.1, "llama3")
+    decision = RoutingDecision(provider_id="ollama", model="llama3", reason="pinned")
+    with pytest.raises(CircuitOpenError):
+        await router._generate("hi", decision)
+    assert local.generate.await_count == 1
@@ -0,0 +1,48 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from powertools.model_registry import ComplexityEstimator, ModelRegistry
+from powertools.router.llm_router import LLMRouter
+from powertools.router.llm_router.models import ProviderType
+
+SIMPLE = "hi there, thanks!"
+HARD = (
+    "Design a sharded, horizontally scalable job queue. Analyze the trade-offs of "
+    "at-least-once delivery and explain why.\n"
+    "1. It must survive node loss\n"
+    "2. It should keep ordering per key\n"
+    "```python\ndef enqueue(job):\n    return store.put(job)\n```"
+)
+
+
+@pytest.mark.asyncio
+async def test_router_estimates_complexity_when_omitted(make_provider):
+    router = LLMRouter()
+    router.register_provider(make_provider("ollama", ProviderType.LOCAL, ["llama3"]))
+    router.register_provider(make_provider("openai", ProviderType.CLOUD, ["gpt-4o"]))
+    router.set_defaults(local_model="llama3", cloud_model="gpt-4o")
+
+    assert (await router.route(SIMPLE)).provider == "ollama"
+    assert (await router.route(HARD)).provider == "openai"
+    assert (await router.route(HARD, complexity=0.0)).provider == "ollama"
+
+    registry = ModelRegistry()
+    router.set_model_registry(registry)
+    assert router.complexity_estimator is registry.complexity_estimator
+    custom = ComplexityEstimator()
+    router.set_complexity_estimator(custom)
+    assert router.complexity_estimator is custom
+
+
+@pytest.mark.asyncio
+async def test_router_skips_estimate_for_explicit_model(make_provider):
+    router = LLMRouter()
+    router.register_provider(make_provider("ollama", ProviderType.LOCAL, ["llama3"]))
+    estimator = MagicMock(spec=ComplexityEstimator)
+    router.set_complexity_estimator(estimator)
+
+    await router.route(HARD, required_model="llama3")
+    [chunk async for chunk in router.route_stream(HARD, required_model="llama3")]
+
+    estimator.score.assert_not_called()
@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from powertools.router.llm_router import BatchTask, ConcurrencyLimiter
+
+
+@pytest.mark.asyncio
+async def test_route_many_yields_in_completion_order_and_captures_errors(make_provider, make_router, make_response):
+    async def generate(prompt, model, **kwargs):
+        if prompt == "bad":
+            raise ValueError("bad prompt")
+        await asyncio.sleep(float(prompt))
+        return make_response(prompt)
+
+    router = make_router(make_provider(generate=generate))
+
+    results = [r async for r in router.route_many(["0.03", "bad", "0.01"])]
+
+    assert [r.index for r in results] == [1, 2, 0]
+    assert not results[0].ok
+    assert isinstance(results[0].error, ValueError)
+    assert results[1].response.content == "0.01"
+    assert results[2].ok
+
+
+@pytest.mark.asyncio
+async def test_provider_limit_caps_concurrent_calls(make_provider, make_router, make_response):
+    active = 0
+    peak = 0
+
+    async def generate(prompt, model, **kwargs):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.005)
+        active -= 1
+        return make_response(prompt)
+
+    router = make_router(make_provider(generate=generate))
+    router.set_concurrency_limits(provider_limits={"ollama": 2})
+
+    results = [r async for r in router.route_many(
+        (BatchTask(task=str(i), task_type="bulk") for i in range(10)),
+        max_in_flight=8,
+    )]
+
+    assert len(results) == 10
+    assert all(r.ok for r in results)
+    assert peak == 2
+    assert router.concurrency.in_flight("ollama") == 0
+
+
+@pytest.mark.asyncio
+async def test_route_many_consumes_tasks_lazily(make_provider, make_router, make_response):
+    pulled = 0
+
+    def tasks():
+        nonlocal pulled
+        for i in range(100):
+            pulled += 1
+            yield str(i)
+
+    async def generate(prompt, model, **kwargs):
+        return make_response(prompt)
+
+    router = make_router(make_provider(generate=generate))
+    results = router.route_many(tasks(), max_in_flight=4)
+
+    await results.__anext__()
+    assert pulled <= 5
+    await results.aclose()
+
+
+@pytest.mark.asyncio
+async def test_model_limit_applies_across_providers():
+    limiter = ConcurrencyLimiter(model_limits={"llama3": 1})
+    order = []
+
+    async def worker(name):
+        async with limiter.acquire(name, "llama3"):
+            order.append(f"{name}-start")
+            await asyncio.sleep(0.001)
+            order.append(f"{name}-end")
+
+    await asyncio.gather(worker("a"), worker("b"))
+
+    assert order == ["a-start", "a-end", "b-start", "b-end"]
@@ -0,0 +1,61 @@
+import pytest
+
+from powertools.model_registry import ModelAccreditation, ModelRegistry, ModelTier
+from powertools.router.llm_router import LLMRouter, RoutingObjective
+from powertools.router.llm_router.models import ProviderType
+
+
+USAGE = {"prompt_tokens": 100, "completion_tokens": 200, "total_tokens": 300}
+
+
+PRICES = {"gpt-4": (0.03, 0.06), "gpt-4o": (0.005, 0.015), "gpt-3.5-turbo": (0.0005, 0.0015)}
+
+
+def make_registry():
+    registry = ModelRegistry()
+    for name, tier in (("gpt-4", ModelTier.S), ("gpt-4o", ModelTier.A), ("gpt-3.5-turbo", ModelTier.B)):
+        registry.add_accreditation(ModelAccreditation(model_full_name=f"openai:{name}", tier=tier))
+    return registry
+
+
+@pytest.mark.asyncio
+async def test_cost_objective_picks_cheapest_model_meeting_tier_floor(make_provider, make_tracker):
+    router = LLMRouter()
+    router.register_provider(
+        make_provider("openai", ProviderType.CLOUD, ["gpt-4", "gpt-4o", "gpt-3.5-turbo"], usage=USAGE)
+    )
+    router.set_model_registry(make_registry())
+    router.set_cost_tracker(make_tracker(PRICES))
+    router.set_routing_objective(RoutingObjective.COST)
+
+    coding = await router._make_routing_decision("Write a parser", 0.9, None, "coding")
+    architecture = await router._make_routing_decision("Design it", 0.9, None, "architecture")
+
+    assert coding.model == "gpt-4o"
+    assert coding.estimated_cost > 0
+    assert architecture.model == "gpt-4"
+
+
+@pytest.mark.asyncio
+async def test_usage_is_recorded_and_cost_stamped_after_each_call(make_provider, make_tracker, make_router):
+    tracker = make_tracker(PRICES)
+    router = make_router(make_provider("openai", ProviderType.CLOUD, ["gpt-4o"], usage=USAGE))
+    router.set_cost_tracker(tracker)
+
+    response = await router.route("Explain", complexity=0.9)
+
+    assert response.cost == pytest.approx(0.0035)
+    assert tracker.total_tokens == 300
+    assert tracker.records[0].metadata["provider"] == "openai"
+
+
+@pytest.mark.asyncio
+async def test_estimated_cost_uses_max_tokens(make_provider, make_tracker, make_router):
+    router = make_router(make_provider("openai", ProviderType.CLOUD, ["gpt-4o"], usage=USAGE))
+    router.set_cost_tracker(make_tracker(PRICES))
+
+    short = await router._make_routing_decision("x" * 400, 0.9, None, None, 100)
+    long = await router._make_routing_decision("x" * 400, 0.9, None, None, 1000)
+
+    assert short.estimated_cost == pytest.approx(0.1 * 0.005 + 0.1 * 0.015)
+    assert long.estimated_cost > short.estimated_cost
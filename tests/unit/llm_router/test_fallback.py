@@ -0,0 +1,181 @@
+import asyncio
+
+import httpx
+import pytest
+
+from powertools.model_registry import ModelAccreditation, ModelRegistry, ModelTier
+from powertools.router.llm_router import (
+    ErrorClass,
+    FallbackPolicy,
+    LLMRouter,
+    classify_error,
+)
+from powertools.router.llm_router.models import ProviderType
+
+
+def http_error(status):
+    request = httpx.Request("POST", "http://llm.local/v1/chat/completions")
+    return httpx.HTTPStatusError(str(status), request=request, response=httpx.Response(status, request=request))
+
+
+def test_classify_error():
+    assert classify_error(http_error(400)) == ErrorClass.BAD_REQUEST
+    assert classify_error(http_error(401)) == ErrorClass.AUTH
+    assert classify_error(http_error(429)) == ErrorClass.RATE_LIMITED
+    assert classify_error(http_error(502)) == ErrorClass.UNAVAILABLE
+    assert classify_error(asyncio.TimeoutError()) == ErrorClass.TIMEOUT
+    assert classify_error(httpx.ReadTimeout("slow")) == ErrorClass.TIMEOUT
+    assert classify_error(ConnectionError("refused")) == ErrorClass.UNAVAILABLE
+    assert not ErrorClass.BAD_REQUEST.retryable
+
+
+@pytest.mark.asyncio
+async def test_tries_other_local_instances_before_cloud(make_provider):
+    box_a = make_provider("box-a", ProviderType.LOCAL, ["llama3"], error=ConnectionError("down"))
+    box_b = make_provider("box-b", ProviderType.LOCAL, ["llama3"])
+    cloud = make_provider("openai", ProviderType.CLOUD, ["gpt-4o"])
+    router = LLMRouter()
+    for provider in (box_a, box_b, cloud):
+        router.register_provider(provider)
+    router.set_defaults(local_model="llama3", cloud_model="gpt-4o")
+
+    response = await router.route("hi", complexity=0.1)
+
+    assert response.provider == "box-b"
+    cloud.generate.assert_not_called()
+    attempts = response.metadata["attempts"]
+    assert [(a["provider"], a["ok"]) for a in attempts] == [("box-a", False), ("box-b", True)]
+    assert attempts[0]["error_class"] == "unavailable"
+
+
+@pytest.mark.asyncio
+async def test_registry_fallback_tier_is_tried(make_provider):
+    strong = make_provider("ollama", ProviderType.LOCAL, ["qwen-coder"], error=ConnectionError("down"))
+    weaker = make_provider("lmstudio", ProviderType.LOCAL, ["phi3"])
+    registry = ModelRegistry()
+    registry.add_accreditation(ModelAccreditation(model_full_name="ollama:qwen-coder", tier=ModelTier.A))
+    registry.add_accreditation(ModelAccreditation(model_full_name="lmstudio:phi3", tier=ModelTier.B))
+    router = LLMRouter()
+    router.register_provider(strong)
+    router.register_provider(weaker)
+    router.set_model_registry(registry)
+
+    response = await router.route("Summarise", task_type="analysis")
+
+    assert (response.provider, response.model) == ("lmstudio", "phi3")
+
+
+def make_chain_router(make_provider, policy):
+    failing = [
+        make_provider(f"box-{i}", ProviderType.LOCAL, ["llama3"], error=ConnectionError("down"))
+        for i in range(3)
+    ]
+    cloud = make_provider("openai", ProviderType.CLOUD, ["gpt-4o"])
+    router = LLMRouter()
+    for provider in (*failing, cloud):
+        router.register_provider(provider)
+    router.set_defaults(local_model="llama3", cloud_model="gpt-4o")
+    router.set_fallback_policy(policy)
+    return router, failing, cloud
+
+
+@pytest.mark.asyncio
+async def test_configured_chain_is_followed_in_order(make_provider):
+    router, failing, cloud = make_chain_router(
+        make_provider, FallbackPolicy(chains={"chat": ["box-2:llama3", "openai:gpt-4o"]})
+    )
+
+    response = await router.route("hi", complexity=0.1, task_type="chat")
+
+    assert response.provider == "openai"
+    assert [a["provider"] for a in response.metadata["attempts"]] == ["box-0", "box-2", "openai"]
+    failing[1].generate.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_attempt_budget_stops_the_chain(make_provider):
+    router, failing, cloud = make_chain_router(make_provider, FallbackPolicy(max_attempts=2))
+
+    with pytest.raises(ConnectionError):
+        await router.route("hi", complexity=0.1)
+
+    failing[2].generate.assert_not_called()
+    cloud.generate.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_bad_request_is_not_retried(make_provider):
+    local = make_provider("ollama", ProviderType.LOCAL, ["llama3"], error=http_error(400))
+    cloud = make_provider("openai", ProviderType.CLOUD, ["gpt-4o"])
+    router = LLMRouter()
+    router.register_provider(local)
+    router.register_provider(cloud)
+    router.set_defaults(local_model="llama3", cloud_model="gpt-4o")
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await router.route("hi", complexity=0.1)
+    cloud.generate.assert_not_called()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status", [400, 401])
+async def test_client_errors_do_not_mark_provider_unhealthy(status, make_provider):
+    local = make_provider("ollama", ProviderType.LOCAL, ["llama3"])
+    errors = [http_error(status)]
+    ok = local.generate.side_effect
+
+    async def generate(prompt, model, **kwargs):
+        if errors:
+            raise errors.pop()
+        return await ok(prompt, model, **kwargs)
+
+    local.generate.side_effect = generate
+    cloud = make_provider("openai", ProviderType.CLOUD, ["gpt-4o"])
+    router = LLMRouter()
+    router.register_provider(local)
+    router.register_provider(cloud)
+    router.set_defaults(local_model="llama3", cloud_model="gpt-4o")
+
+    try:
+        await router.route("malformed prompt", complexity=0.1)
+    except httpx.HTTPStatusError:
+        assert status == 400  # auth errors move on to the next provider instead
+    response = await router.route("another valid prompt", complexity=0.1)
+
+    assert response.provider == "ollama"
+    assert router._health.get_state("ollama").healthy
+    assert not router._breakers.is_open("ollama", "llama3")
+
+
+@pytest.mark.asyncio
+async def test_deadline_bounds_each_attempt(make_provider):
+    slow = make_provider("ollama", ProviderType.LOCAL, ["llama3"], delay=1.0)
+    cloud = make_provider("openai", ProviderType.CLOUD, ["gpt-4o"])
+    router = LLMRouter()
+    router.register_provider(slow)
+    router.register_provider(cloud)
+    router.set_defaults(local_model="llama3", cloud_model="gpt-4o")
+    router.set_fallback_policy(FallbackPolicy(attempt_timeout_seconds=0.05))
+
+    response = await router.route("hi", complexity=0.1, deadline_seconds=0.5)
+    assert response.provider == "openai"
+    assert response.metadata["attempts"][0]["error_class"] == "timeout"
+
+    with pytest.raises(asyncio.TimeoutError):
+        await router.route("hi", complexity=0.1, required_model="llama3", deadline_seconds=0.05)
+
+
+@pytest.mark.asyncio
+async def test_caller_deadline_does_not_take_provider_out_of_rotation(make_provider):
+    slow = make_provider("ollama", ProviderType.LOCAL, ["llama3"], delay=0.2)
+    router = LLMRouter()
+    router.register_provider(slow)
+    router.set_defaults(local_model="llama3", cloud_model="gpt-4o")
+
+    with pytest.raises(asyncio.TimeoutError):
+        await router.route("hi", complexity=0.1, deadline_seconds=0.05)
+    response = await router.route("hi", complexity=0.1)
+
+    assert response.provider == "ollama"
+    assert router._health.get_state("ollama").healthy
+    assert not router._breakers.is_open("ollama", "llama3")
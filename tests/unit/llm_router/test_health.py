@@ -0,0 +1,137 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from powertools.router.llm_router import HealthMonitor, LLMRouter
+from powertools.router.llm_router.models import ProviderType
+
+
+@pytest.mark.asyncio
+async def test_check_uses_cache_until_ttl_expires(clock, make_provider):
+    monitor = HealthMonitor(ttl_seconds=5.0, clock=clock)
+    provider = make_provider("local", ProviderType.LOCAL, ["local-model"])
+    monitor.track(provider)
+
+    assert await monitor.check(provider) is True
+    assert await monitor.check(provider) is True
+    assert provider.is_healthy.await_count == 1
+
+    clock.now = 6.0
+    assert await monitor.check(provider) is True
+    assert provider.is_healthy.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_probe_timeout_marks_unhealthy(make_provider):
+    monitor = HealthMonitor(probe_timeout_seconds=0.01)
+    provider = make_provider("local", ProviderType.LOCAL, ["local-model"])
+
+    async def slow():
+        await asyncio.sleep(1)
+        return True
+
+    provider.is_healthy = AsyncMock(side_effect=slow)
+
+    assert await monitor.probe(provider) is False
+    assert monitor.get_state("local").last_error is not None
+
+
+@pytest.mark.asyncio
+async def test_routing_reads_cached_health_and_failures_mark_unhealthy(make_provider):
+    local = make_provider("local", ProviderType.LOCAL, ["local-model"])
+    cloud = make_provider("cloud", ProviderType.CLOUD, ["cloud-model"])
+    router = LLMRouter()
+    router.register_provider(local)
+    router.register_provider(cloud)
+    router.set_defaults(local_model="local-model", cloud_model="cloud-model")
+
+    await router.route("a", complexity=0.1)
+    await router.route("b", complexity=0.1)
+    assert local.is_healthy.await_count == 1
+
+    answer = local.generate.side_effect
+    local.generate.side_effect = Exception("boom")
+    response = await router.route("c", complexity=0.1)
+    assert response.provider == "cloud"
+    assert router.health.cached("local") is False
+
+    local.generate.side_effect = answer
+    response = await router.route("d", complexity=0.1)
+    assert response.provider == "cloud"
+    assert local.generate.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_background_prober_refreshes_state(make_provider):
+    monitor = HealthMonitor(probe_interval_seconds=0.01)
+    provider = make_provider("local", ProviderType.LOCAL, ["local-model"], healthy=False)
+    monitor.track(provider)
+
+    monitor.start()
+    await asyncio.sleep(0.005)
+    assert monitor.cached("local") is False
+
+    provider.is_healthy.return_value = True
+    await asyncio.sleep(0.03)
+    assert monitor.cached("local") is True
+
+    await monitor.stop()
+    assert not monitor.running
+
+
+@pytest.fixture
+def make_slow_provider(make_provider):
+    def make(provider_id, provider_type, delay, healthy=True):
+        provider = make_provider(provider_id, provider_type, [f"{provider_id}-model"], healthy=healthy)
+
+        async def slow():
+            await asyncio.sleep(delay)
+            return healthy
+
+        provider.is_healthy = AsyncMock(side_effect=slow)
+        return provider
+
+    return make
+
+
+@pytest.mark.asyncio
+async def test_check_many_probes_concurrently_under_one_deadline(make_slow_provider):
+    monitor = HealthMonitor(probe_timeout_seconds=1.0)
+    providers = [make_slow_provider(f"p{i}", ProviderType.LOCAL, 0.05) for i in range(4)]
+    stuck = make_slow_provider("stuck", ProviderType.LOCAL, 0.5)
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    results = await monitor.check_many(providers + [stuck, providers[0]], timeout=0.2)
+    elapsed = loop.time() - started
+
+    assert elapsed < 0.3
+    assert results == {"p0": True, "p1": True, "p2": True, "p3": True, "stuck": False}
+    assert providers[0].is_healthy.await_count == 1
+    assert monitor.cached("stuck") is None
+
+    # The stuck probe keeps running and fills the cache for the next decision.
+    await asyncio.sleep(0.4)
+    assert monitor.cached("stuck") is True
+    assert stuck.is_healthy.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_routing_decision_probes_candidates_in_parallel_and_reports_time(make_slow_provider):
+    slow_local = make_slow_provider("local", ProviderType.LOCAL, 0.5)
+    clouds = [make_slow_provider(f"cloud{i}", ProviderType.CLOUD, 0.05) for i in range(3)]
+    for cloud in clouds:
+        cloud.get_supported_models.return_value = ["cloud-model"]
+    router = LLMRouter()
+    router.register_provider(slow_local)
+    for cloud in clouds:
+        router.register_provider(cloud)
+    router.set_defaults(local_model="local-model", cloud_model="cloud-model")
+    router.set_decision_timeout(0.15)
+
+    response = await router.route("hello", complexity=0.1)
+
+    assert response.provider == "cloud0"
+    assert 40 <= response.metadata["decision_ms"] < 300
+    assert all(cloud.is_healthy.await_count == 1 for cloud in clouds)
@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from powertools.router.llm_router import HedgingPolicy, TokenCostTracker
+from powertools.router.llm_router.hedging import HedgeController, LatencyWindow
+from powertools.router.llm_router.models import ProviderType
+
+
+@pytest.fixture
+def make_cloud_provider(make_provider, make_response):
+    def make(delays):
+        """Cloud provider whose successive calls take the given delays (seconds)."""
+        calls = iter(delays)
+
+        async def generate(prompt, model, **kwargs):
+            delay = next(calls)
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                provider.cancelled += 1
+                raise
+            return make_response(f"after {delay}", model, "openai", ProviderType.CLOUD, {"prompt_tokens": 1000})
+
+        provider = make_provider("openai", ProviderType.CLOUD, ["gpt-4o"], generate=generate)
+        provider.cancelled = 0
+        return provider
+
+    return make
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_is_hedged_and_cancelled(make_cloud_provider, make_router):
+    provider = make_cloud_provider([1.0, 0.0])
+    tracker = TokenCostTracker()
+    tracker.register_model_pricing("gpt-4o", input_cost_per_1k=0.005, output_cost_per_1k=0.015)
+    router = make_router(provider)
+    router.enable_hedging(HedgingPolicy(initial_delay_ms=10, min_delay_ms=1))
+    router.set_cost_tracker(tracker)
+
+    response = await router.route("Explain", complexity=0.9)
+    await asyncio.sleep(0)
+
+    assert response.content == "after 0.0"
+    assert response.metadata["hedge_won"] is True
+    assert provider.generate.await_count == 2
+    assert provider.cancelled == 1
+    assert tracker.hedge_count == 1
+    assert tracker.hedge_cost == pytest.approx(0.005)
+    assert tracker.summarize_hedges()["gpt-4o"]["hedge_wins"] == 1
+
+
+@pytest.mark.asyncio
+async def test_fast_primary_is_not_hedged(make_cloud_provider, make_router):
+    provider = make_cloud_provider([0.0])
+    router = make_router(provider)
+    router.enable_hedging(HedgingPolicy(initial_delay_ms=500))
+
+    response = await router.route("Explain", complexity=0.9)
+
+    assert "hedged" not in response.metadata
+    assert provider.generate.await_count == 1
+
+
+def test_delay_uses_percentile_once_enough_samples():
+    controller = HedgeController(HedgingPolicy(percentile=0.9, min_samples=10, initial_delay_ms=999))
+    assert controller.delay_seconds("openai", "gpt-4o") == pytest.approx(0.999)
+
+    for latency in range(1, 11):
+        controller.record("openai", "gpt-4o", latency * 100.0)
+
+    assert controller.delay_seconds("openai", "gpt-4o") == pytest.approx(0.9)
+
+
+def test_latency_window_is_bounded():
+    window = LatencyWindow(size=3)
+    for latency in (1000.0, 1.0, 2.0, 3.0):
+        window.record("p", "m", latency)
+
+    assert window.count("p", "m") == 3
+    assert window.percentile("p", "m", 0.99) == 3.0
@@ -0,0 +1,108 @@
+import json
+
+import pytest
+
+from powertools.router.llm_router import (
+    SegmentFileUsageLedger,
+    SQLiteUsageLedger,
+    SyncMode,
+)
+
+
+def make_ledger(kind, tmp_path, **kwargs):
+    if kind == "sqlite":
+        return SQLiteUsageLedger(str(tmp_path / "usage.db"), **kwargs)
+    return SegmentFileUsageLedger(str(tmp_path / "usage"), **kwargs)
+
+
+@pytest.mark.parametrize("kind", ["sqlite", "segments"])
+def test_totals_survive_restart_and_rotation(kind, tmp_path, clock, make_tracker):
+    tracker = make_tracker(ledger=make_ledger(kind, tmp_path, batch_size=3, segment_records=4), clock=clock)
+    for i in range(10):
+        clock.now = float(i)
+        tracker.record_usage(
+            model="gpt" if i % 2 else "llama", input_tokens=100, output_tokens=50, metadata={"tag": "t"}
+        )
+    tracker.close()
+
+    ledger = make_ledger(kind, tmp_path, segment_records=4)
+    assert [r.segment for r in ledger.rollups()] == [0, 1, 2]
+    restored = make_tracker(ledger=ledger, clock=clock)
+    assert restored.call_count == 10
+    assert restored.total_tokens == 1500
+    assert restored.total_cost == pytest.approx(tracker.total_cost)
+    assert restored.summarize_by_model() == tracker.summarize_by_model()
+
+    # Appending after a restart continues the open segment.
+    restored.record_usage(model="gpt", input_tokens=1, output_tokens=1)
+    restored.close()
+    reopened = make_ledger(kind, tmp_path, segment_records=4)
+    assert reopened.summarize()["gpt"]["calls"] == 6
+    assert [r.segment for r in reopened.rollups()] == [0, 1, 2]
+    reopened.close()
+
+
+@pytest.mark.parametrize("kind", ["sqlite", "segments"])
+def test_summarize_since_uses_rollups_and_scans_straddling_segment(kind, tmp_path, clock, make_tracker):
+    ledger = make_ledger(kind, tmp_path, batch_size=1, segment_records=4)
+    tracker = make_tracker(ledger=ledger, clock=clock)
+    for i in range(10):
+        clock.now = float(i)
+        tracker.record_usage(model="gpt", input_tokens=10, output_tokens=0)
+
+    assert ledger.summarize(since=5.0)["gpt"]["calls"] == 5
+    assert ledger.summarize(since=8.0)["gpt"]["calls"] == 2
+    assert ledger.summarize(since=100.0) == {}
+    ledger.close()
+
+
+@pytest.mark.parametrize("kind", ["sqlite", "segments"])
+def test_max_segments_drops_raw_rows_but_keeps_rollups(kind, tmp_path, clock, make_tracker):
+    ledger = make_ledger(kind, tmp_path, batch_size=1, segment_records=2, max_segments=1)
+    tracker = make_tracker(ledger=ledger, clock=clock)
+    for i in range(6):
+        clock.now = float(i)
+        tracker.record_usage(model="gpt", input_tokens=10, output_tokens=0)
+
+    assert ledger.summarize()["gpt"]["calls"] == 6
+    assert list(ledger._segment_records(0)) == []
+    assert len(list(ledger._segment_records(2))) == 2
+    ledger.close()
+
+
+def test_buffering_by_batch_size_and_interval(tmp_path, clock, make_tracker):
+    ledger = SQLiteUsageLedger(
+        str(tmp_path / "usage.db"), batch_size=3, flush_interval_seconds=10.0, clock=clock
+    )
+    tracker = make_tracker(ledger=ledger, clock=clock)
+    tracker.record_usage(model="gpt", input_tokens=1, output_tokens=0)
+    tracker.record_usage(model="gpt", input_tokens=1, output_tokens=0)
+    assert ledger.rollups() == []
+
+    tracker.record_usage(model="gpt", input_tokens=1, output_tokens=0)
+    assert ledger.rollups()[0].by_model["gpt"]["calls"] == 3
+
+    tracker.record_usage(model="gpt", input_tokens=1, output_tokens=0)
+    clock.now = 11.0
+    tracker.record_usage(model="gpt", input_tokens=1, output_tokens=0)
+    assert ledger.rollups()[0].by_model["gpt"]["calls"] == 5
+    ledger.close()
+
+
+def test_segment_ledger_ignores_torn_last_line(tmp_path, clock, make_tracker):
+    directory = tmp_path / "usage"
+    ledger = SegmentFileUsageLedger(str(directory), batch_size=1, sync=SyncMode.FULL)
+    tracker = make_tracker(ledger=ledger, clock=clock)
+    tracker.record_usage(model="gpt", input_tokens=1000, output_tokens=0)
+    ledger.close()
+    with open(directory / "segment-000000.jsonl", "a") as f:
+        f.write('{"t":1.0,"m":"gpt","i":')
+
+    ledger = SegmentFileUsageLedger(str(directory), batch_size=1)
+    tracker = make_tracker(ledger=ledger, clock=clock)
+    assert tracker.call_count == 1
+    tracker.record_usage(model="gpt", input_tokens=1000, output_tokens=0)
+    ledger.close()
+
+    lines = (directory / "segment-000000.jsonl").read_text().splitlines()
+    assert [json.loads(line)["i"] for line in lines] == [1000, 1000]
@@ -0,0 +1,51 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from powertools.router.llm_router import LLMRouter, ModelIndex
+
+
+def test_update_indexes_models_and_full_names():
+    index = ModelIndex()
+    index.update("ollama", ["llama3", "mistral:7b"])
+    index.update("vllm", ["llama3"])
+
+    assert index.providers_for("llama3") == ["ollama", "vllm"]
+    assert index.resolve("ollama:mistral:7b") == ("ollama", "mistral:7b")
+    assert index.resolve("vllm:mistral:7b") is None
+
+
+def test_update_is_incremental_and_preserves_registration_order():
+    index = ModelIndex()
+    index.update("first", [])
+    index.update("second", ["llama3"])
+    index.update("first", ["llama3"])
+
+    assert index.providers_for("llama3") == ["first", "second"]
+    assert index.update("first", ["llama3"]) is False
+
+    index.update("second", ["phi3"])
+    assert index.providers_for("llama3") == ["first"]
+    assert not index.supports("second", "llama3")
+
+    index.remove("first")
+    assert index.providers_for("llama3") == []
+
+
+@pytest.mark.asyncio
+async def test_router_refreshes_index_after_health_probe(make_provider):
+    provider = make_provider(models=())
+
+    async def probe():
+        provider.get_supported_models.return_value = ["llama3"]
+        return True
+
+    provider.is_healthy = AsyncMock(side_effect=probe)
+
+    router = LLMRouter()
+    router.register_provider(provider)
+    assert router.model_index.providers_for("llama3") == []
+
+    await router.health.probe_all()
+
+    assert router.model_index.providers_for("llama3") == ["ollama"]
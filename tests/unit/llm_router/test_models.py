@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+from powertools.router.llm_router.models import LLMResponse, ProviderType, StreamChunk
+
+
+def test_trusted_response_matches_validated_one():
+    kwargs = dict(
+        content="hi",
+        model="llama3",
+        provider="ollama",
+        provider_type=ProviderType.LOCAL,
+        usage={"total_tokens": 3},
+        metadata={"streamed": True},
+    )
+    trusted = LLMResponse.trusted(**kwargs)
+
+    assert trusted == LLMResponse(**kwargs)
+    assert json.loads(trusted.model_dump_json()) == json.loads(LLMResponse(**kwargs).model_dump_json())
+    assert LLMResponse.model_validate_json(trusted.model_dump_json()) == trusted
+
+
+def test_trusted_responses_do_not_share_state():
+    first = LLMResponse.trusted("a", "m", "p", ProviderType.CLOUD)
+    second = LLMResponse.trusted("b", "m", "p", ProviderType.CLOUD)
+    first.metadata["cache_hit"] = True
+    first.latency_ms = 12.5
+
+    assert second.metadata == {}
+    assert second.latency_ms == 0.0
+    copy = first.model_copy(deep=True)
+    copy.metadata["cache_hit"] = False
+    assert first.metadata["cache_hit"] is True
+
+
+def test_stream_chunk_is_slotted():
+    chunk = StreamChunk(content="tok")
+    assert chunk.done is False and chunk.usage == {}
+    assert not hasattr(chunk, "__dict__")
+    with pytest.raises(AttributeError):
+        chunk.extra = 1
@@ -0,0 +1,95 @@
+import asyncio
+import random
+
+import pytest
+
+from powertools.router.llm_router import BalancingStrategy, LLMRouter, ProviderPool
+from powertools.router.llm_router.models import ProviderType
+
+
+@pytest.fixture
+def make_endpoint(make_provider):
+    def make(name, models=("llama3",), gate=None, **kwargs):
+        endpoint = make_provider("ollama", ProviderType.LOCAL, models, content=name, **kwargs)
+        endpoint.base_url = f"http://{name}:11434"
+        answer = endpoint.generate.side_effect
+
+        async def generate(prompt, model, **kwargs):
+            if gate is not None:
+                await gate.wait()
+            return await answer(prompt, model, **kwargs)
+
+        endpoint.generate.side_effect = generate
+        return endpoint
+
+    return make
+
+
+@pytest.mark.asyncio
+async def test_prefers_endpoint_with_model_loaded(make_endpoint):
+    pool = ProviderPool("gpu-pool", [make_endpoint("a", loaded=[]), make_endpoint("b", loaded=["llama3"])])
+    assert await pool.is_healthy()
+
+    response = await pool.generate("hi", "llama3")
+
+    assert response.content == "b"
+    assert response.provider == "gpu-pool"
+    assert response.metadata["endpoint"] == "http://b:11434"
+
+
+@pytest.mark.asyncio
+async def test_least_outstanding_spreads_concurrent_calls(make_endpoint):
+    gate = asyncio.Event()
+    pool = ProviderPool("gpu-pool", [make_endpoint(n, gate=gate) for n in ("a", "b", "c")])
+
+    calls = [asyncio.ensure_future(pool.generate("hi", "llama3")) for _ in range(3)]
+    await asyncio.sleep(0)
+    assert [e.outstanding for e in pool.endpoints] == [1, 1, 1]
+    gate.set()
+
+    assert sorted(r.content for r in await asyncio.gather(*calls)) == ["a", "b", "c"]
+    assert [e.outstanding for e in pool.endpoints] == [0, 0, 0]
+
+
+def test_power_of_two_picks_less_busy_of_sample(make_endpoint):
+    pool = ProviderPool(
+        "gpu-pool",
+        [make_endpoint(n) for n in ("a", "b", "c", "d")],
+        strategy=BalancingStrategy.POWER_OF_TWO,
+        rng=random.Random(7),
+    )
+    for endpoint, busy in zip(pool.endpoints, (5, 0, 3, 9)):
+        endpoint.outstanding = busy
+
+    for _ in range(20):
+        chosen = pool.select("llama3")
+        assert chosen.outstanding != 9
+
+
+@pytest.mark.asyncio
+async def test_failed_endpoint_leaves_rotation_and_call_is_retried(make_endpoint):
+    pool = ProviderPool(
+        "gpu-pool",
+        [make_endpoint("a", error=ConnectionError("refused")), make_endpoint("b")],
+    )
+
+    response = await pool.generate("hi", "llama3")
+
+    assert response.content == "b"
+    assert [e.healthy for e in pool.endpoints] == [False, True]
+    assert await pool.is_healthy()
+    assert [e.healthy for e in pool.endpoints] == [True, True]
+
+
+@pytest.mark.asyncio
+async def test_only_endpoints_serving_the_model_are_used(make_endpoint):
+    pool = ProviderPool("gpu-pool", [make_endpoint("a", models=["phi3"]), make_endpoint("b", models=["llama3"])])
+    router = LLMRouter()
+    router.register_provider(pool)
+    router.set_defaults(local_model="llama3", cloud_model="gpt-4o")
+
+    response = await router.route("hi", complexity=0.1)
+
+    assert response.content == "b"
+    assert set(pool.get_supported_models()) == {"phi3", "llama3"}
+    assert router.model_index.providers_for("phi3") == ["gpu-pool"]
@@ -0,0 +1,99 @@
+import httpx
+import pytest
+
+from powertools.router.llm_router import LLMRouter, RateLimit, RateLimiter, TokenBucket
+from powertools.router.llm_router.models import ProviderType
+from powertools.router.llm_router.rate_limit import retry_after_seconds
+
+
+def rate_limited(headers):
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(429, headers=headers, request=request)
+    return httpx.HTTPStatusError("429", request=request, response=response)
+
+
+def test_token_bucket_refills_continuously(clock):
+    bucket = TokenBucket(60, clock=clock)
+    bucket.take(60)
+    assert bucket.wait_time(1) == pytest.approx(1.0)
+    clock.now = 0.5
+    assert bucket.level == pytest.approx(0.5)
+    assert bucket.wait_time(1000) == pytest.approx(59.5)  # capped at a full bucket
+
+
+def test_delay_covers_request_and_token_buckets(clock):
+    limiter = RateLimiter(clock=clock)
+    limiter.set_provider_limit("openai", RateLimit(requests_per_minute=2))
+    limiter.set_model_limit("openai", "gpt-4o", RateLimit(tokens_per_minute=600))
+
+    assert limiter.try_acquire("openai", "gpt-4o", tokens=500)
+    assert limiter.delay("openai", "gpt-4o", tokens=500) == pytest.approx(40.0)
+    assert limiter.delay("openai", "gpt-4o-mini", tokens=500) == 0.0
+
+    limiter.settle("openai", "gpt-4o", reserved=500, actual=100)
+    assert limiter.delay("openai", "gpt-4o", tokens=500) == 0.0
+    assert limiter.try_acquire("openai", "gpt-4o", tokens=500)
+    assert limiter.delay("openai", "gpt-4o", tokens=1) == pytest.approx(30.0)
+
+
+@pytest.mark.parametrize("actual", [None, 0])
+def test_settle_keeps_reservation_when_usage_is_unreported(actual, clock):
+    limiter = RateLimiter(clock=clock)
+    limiter.set_model_limit("ollama", "llama3", RateLimit(tokens_per_minute=600))
+
+    assert limiter.try_acquire("ollama", "llama3", tokens=500)
+    limiter.settle("ollama", "llama3", reserved=500, actual=actual)
+
+    assert limiter.delay("ollama", "llama3", tokens=500) == pytest.approx(40.0)
+
+
+@pytest.mark.asyncio
+async def test_acquire_queues_until_budget_refills(clock):
+    limiter = RateLimiter(clock=clock, sleep=clock.sleep)
+    limiter.set_provider_limit("openai", RateLimit(requests_per_minute=1))
+
+    await limiter.acquire("openai", "gpt-4o")
+    await limiter.acquire("openai", "gpt-4o")
+
+    assert clock.slept == [pytest.approx(60.0)]
+
+
+def test_retry_after_parsing():
+    assert retry_after_seconds(rate_limited({"retry-after": "7"})) == 7.0
+    assert retry_after_seconds(rate_limited({"retry-after-ms": "250"})) == 0.25
+    assert retry_after_seconds(rate_limited({})) == 1.0
+    assert retry_after_seconds(ConnectionError("down")) is None
+
+
+@pytest.mark.asyncio
+async def test_router_spills_over_to_provider_with_budget(make_provider):
+    primary = make_provider("openai", ProviderType.CLOUD, ["gpt-4o"], usage={"total_tokens": 10})
+    secondary = make_provider("azure", ProviderType.CLOUD, ["gpt-4o"], usage={"total_tokens": 10})
+    router = LLMRouter()
+    router.register_provider(primary)
+    router.register_provider(secondary)
+    router.set_defaults(local_model="llama3", cloud_model="gpt-4o")
+    router.set_rate_limits(provider_limits={"openai": RateLimit(requests_per_minute=1)})
+
+    first = await router.route("hi", complexity=0.9)
+    second = await router.route("hi", complexity=0.9)
+
+    assert first.provider == "openai"
+    assert second.provider == "azure"
+
+
+@pytest.mark.asyncio
+async def test_429_blocks_provider_without_marking_it_unhealthy(make_provider):
+    provider = make_provider(
+        "openai", ProviderType.CLOUD, ["gpt-4o"], error=rate_limited({"retry-after": "30"})
+    )
+    router = LLMRouter()
+    router.register_provider(provider)
+    router.set_defaults(local_model="llama3", cloud_model="gpt-4o")
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await router.route("hi", complexity=0.9)
+
+    assert router.rate_limits.delay("openai", "gpt-4o") > 29
+    assert router.health.cached("openai") is True
+    assert not router.circuit_breakers.is_open("openai", "gpt-4o")
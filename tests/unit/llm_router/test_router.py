@@ -1,8 +1,8 @@
 import pytest
 from unittest.mock import AsyncMock, MagicMock
-from powertools.core.llm_router.router import LLMRouter
-from powertools.core.llm_router.base import LLMProvider
-from powertools.core.llm_router.models import LLMResponse, ProviderType
+from powertools.router.llm_router.router import LLMRouter
+from powertools.router.llm_router.base import LLMProvider
+from powertools.router.llm_router.models import LLMResponse, ProviderType
 
 @pytest.fixture
 def mock_local_provider():
@@ -78,3 +78,16 @@ async def test_router_fallback(mock_local_provider, mock_cloud_provider):
     assert response.content == "Cloud response"
     mock_local_provider.generate.assert_called_once()
     mock_cloud_provider.generate.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_router_lifecycle_opens_and_closes_providers(mock_local_provider, mock_cloud_provider):
+    router = LLMRouter()
+    router.register_provider(mock_local_provider)
+    router.register_provider(mock_cloud_provider)
+
+    async with router:
+        mock_local_provider.open.assert_awaited_once()
+        mock_cloud_provider.open.assert_awaited_once()
+
+    mock_local_provider.aclose.assert_awaited_once()
+    mock_cloud_provider.aclose.assert_awaited_once()
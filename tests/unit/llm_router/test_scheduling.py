@@ -0,0 +1,131 @@
+import asyncio
+
+import pytest
+
+from powertools.router.llm_router import (
+    BatchTask,
+    LLMRouter,
+    Priority,
+    PriorityScheduler,
+    SchedulerConfig,
+)
+from powertools.router.llm_router.models import LLMResponse, ProviderType
+
+
+async def hold(scheduler, provider_id, priority, order, release):
+    async with scheduler.slot(provider_id, priority):
+        order.append(priority)
+        await release.wait()
+
+
+async def settle():
+    for _ in range(20):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_unscheduled_provider_is_not_limited():
+    scheduler = PriorityScheduler()
+    async with scheduler.slot("ollama", Priority.BULK):
+        assert scheduler.in_flight("ollama") == 0
+
+
+@pytest.mark.asyncio
+async def test_weighted_fair_queuing_between_lanes():
+    scheduler = PriorityScheduler(
+        {"gpu": 1},
+        SchedulerConfig(weights={"interactive": 3, "standard": 1, "bulk": 1}, reserved_interactive_slots=0),
+    )
+    release = asyncio.Event()
+    blocker = asyncio.ensure_future(hold(scheduler, "gpu", Priority.STANDARD, [], release))
+    await settle()
+
+    served = []
+
+    async def one(priority):
+        async with scheduler.slot("gpu", priority):
+            served.append(priority)
+
+    tasks = [asyncio.ensure_future(one(Priority.STANDARD)) for _ in range(4)]
+    tasks += [asyncio.ensure_future(one(Priority.INTERACTIVE)) for _ in range(8)]
+    await settle()
+    assert scheduler.queue_depth("gpu", "interactive") == 8
+
+    release.set()
+    await asyncio.gather(blocker, *tasks)
+
+    # Interactive gets about three slots per standard one, but standard is not starved.
+    assert served[:8].count(Priority.INTERACTIVE) >= 6
+    assert Priority.STANDARD in served[:8]
+
+
+@pytest.mark.asyncio
+async def test_bulk_waits_while_interactive_is_queued_and_slots_are_reserved():
+    scheduler = PriorityScheduler({"gpu": 2}, SchedulerConfig(reserved_interactive_slots=1))
+    order = []
+    release = asyncio.Event()
+
+    first_bulk = asyncio.ensure_future(hold(scheduler, "gpu", Priority.BULK, order, release))
+    second_bulk = asyncio.ensure_future(hold(scheduler, "gpu", Priority.BULK, order, release))
+    await settle()
+    # One slot stays free for interactive work even though bulk is waiting.
+    assert scheduler.in_flight("gpu", "bulk") == 1
+    assert scheduler.queue_depth("gpu", "bulk") == 1
+
+    interactive = asyncio.ensure_future(hold(scheduler, "gpu", Priority.INTERACTIVE, order, release))
+    await settle()
+    assert order == [Priority.BULK, Priority.INTERACTIVE]
+
+    release.set()
+    await asyncio.gather(first_bulk, second_bulk, interactive)
+    assert scheduler.in_flight("gpu") == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_the_queue():
+    scheduler = PriorityScheduler({"gpu": 1})
+    release = asyncio.Event()
+    holder = asyncio.ensure_future(hold(scheduler, "gpu", Priority.STANDARD, [], release))
+    await settle()
+    waiting = asyncio.ensure_future(hold(scheduler, "gpu", Priority.BULK, [], release))
+    await settle()
+    assert scheduler.queue_depth("gpu", "bulk") == 1
+
+    waiting.cancel()
+    await settle()
+    assert scheduler.queue_depth("gpu", "bulk") == 0
+    release.set()
+    await holder
+    assert scheduler.in_flight("gpu") == 0
+
+
+@pytest.mark.asyncio
+async def test_router_dispatches_interactive_ahead_of_queued_bulk(make_provider):
+    started = []
+    gate = asyncio.Event()
+
+    async def generate(prompt, model, **kwargs):
+        started.append(prompt)
+        await gate.wait()
+        return LLMResponse(content=prompt, model=model, provider="ollama", provider_type=ProviderType.LOCAL)
+
+    provider = make_provider(generate=generate)
+    router = LLMRouter()
+    router.register_provider(provider)
+    router.set_defaults(local_model="llama3", cloud_model="gpt-4o")
+    router.set_scheduling({"ollama": 1})
+
+    batch = asyncio.ensure_future(_drain(router.route_many(
+        [BatchTask(task=f"bulk-{i}", priority=Priority.BULK) for i in range(3)]
+    )))
+    await settle()
+    chat = asyncio.ensure_future(router.route("chat", priority="interactive"))
+    await settle()
+    gate.set()
+    await asyncio.gather(batch, chat)
+
+    assert started[:2] == ["bulk-0", "chat"]
+
+
+async def _drain(results):
+    return [result async for result in results]
@@ -0,0 +1,159 @@
+import json
+import threading
+
+import httpx
+import numpy as np
+import pytest
+
+from powertools.meta.integrations.llm.ollama import OllamaEmbedder
+from powertools.router.llm_router import LLMRouter, SemanticCache, VectorIndex
+from powertools.utils import HTTPClientPool
+
+VECTORS = {
+    "How do I reset my password?": [1.0, 0.0, 0.0],
+    "How can I reset my password?": [0.98, 0.2, 0.0],
+    "What are your opening hours?": [0.0, 0.0, 1.0],
+    "Password reset steps?": [0.95, 0.25, 0.0],
+}
+
+
+async def fake_embedder(texts):
+    return [VECTORS[text] for text in texts]
+
+
+def test_vector_index_search_and_slot_reuse():
+    index = VectorIndex(initial_capacity=2)
+    a = index.add([1.0, 0.0])
+    b = index.add([0.0, 2.0])
+    c = index.add([1.0, 1.0])
+
+    slot, score = index.search([0.0, 5.0])
+    assert slot == b
+    assert score == pytest.approx(1.0)
+
+    index.remove(b)
+    assert index.search([0.0, 5.0])[0] == c
+    assert index.add([0.0, 1.0]) == b
+    assert len(index) == 3
+    assert a == 0
+
+
+def test_vector_index_top_k_orders_by_similarity():
+    index = VectorIndex()
+    slots = [index.add(v) for v in ([1.0, 0.0], [0.0, 1.0], [1.0, 1.0], [1.0, 0.1])]
+    index.remove(slots[3])
+
+    assert [slot for slot, _ in index.top_k([1.0, 0.05], 2)] == [slots[0], slots[2]]
+    assert [slot for slot, _ in index.top_k([1.0, 0.05], 10)] == [slots[0], slots[2], slots[1]]
+    assert index.similarity(slots[3], [1.0, 0.0]) is None
+    assert VectorIndex().top_k([1.0], 3) == []
+
+
+@pytest.mark.asyncio
+async def test_expired_nearest_entry_does_not_hide_live_match(clock, make_response):
+    cache = SemanticCache(fake_embedder, thresholds={"support": 0.95}, ttl_seconds=100, clock=clock)
+    target = dict(task_type="support", provider_id="ollama", model="llama3")
+
+    await cache.store("How can I reset my password?", make_response("old"), **target)
+    clock.now += 60
+    await cache.store("Password reset steps?", make_response("live"), **target)
+    clock.now += 60
+
+    hit = await cache.lookup("How do I reset my password?", **target)
+    assert hit.content == "live"
+    assert len(cache) == 1
+
+
+@pytest.mark.asyncio
+async def test_large_partitions_are_searched_off_the_event_loop(monkeypatch, make_response):
+    threads = []
+    top_k = VectorIndex.top_k
+
+    def recording_top_k(self, vector, k):
+        threads.append(threading.current_thread())
+        return top_k(self, vector, k)
+
+    monkeypatch.setattr(VectorIndex, "top_k", recording_top_k)
+    cache = SemanticCache(fake_embedder, thresholds={"support": 0.95}, offload_min_entries=2)
+    target = dict(task_type="support", provider_id="ollama", model="llama3")
+    await cache.store("How do I reset my password?", make_response("Use the link."), **target)
+
+    assert (await cache.lookup("How can I reset my password?", **target)).content == "Use the link."
+    await cache.store("What are your opening hours?", make_response("9-5"), **target)
+    assert (await cache.lookup("How can I reset my password?", **target)).content == "Use the link."
+
+    assert threads[0] is threading.main_thread()
+    assert threads[1] is not threading.main_thread()
+
+
+@pytest.mark.asyncio
+async def test_paraphrase_hits_above_threshold_only(make_response):
+    cache = SemanticCache(fake_embedder, thresholds={"support": 0.95})
+    target = dict(task_type="support", provider_id="ollama", model="llama3")
+
+    response = make_response("Use the link.")
+    response.cost = 0.01
+    await cache.store("How do I reset my password?", response, **target)
+
+    hit = await cache.lookup("How can I reset my password?", **target)
+    assert hit.content == "Use the link."
+    assert hit.metadata["semantic_score"] > 0.95
+    assert hit.cost == 0.0 and hit.metadata["cache_hit"] is True
+    assert cache.stats.saved_cost == 0.01
+    assert await cache.lookup("What are your opening hours?", **target) is None
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+
+
+@pytest.mark.asyncio
+async def test_unlisted_task_types_are_not_cached(make_response):
+    cache = SemanticCache(fake_embedder, thresholds={"support": 0.9})
+
+    await cache.store("How do I reset my password?", make_response("x"),
+                      task_type="coding", provider_id="ollama", model="llama3")
+
+    assert len(cache) == 0
+    assert not cache.applies("coding")
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction_bounds_entries(make_response):
+    cache = SemanticCache(fake_embedder, thresholds={"support": 0.9}, max_entries=1)
+    target = dict(task_type="support", provider_id="ollama", model="llama3")
+
+    await cache.store("How do I reset my password?", make_response("a"), **target)
+    await cache.store("What are your opening hours?", make_response("b"), **target)
+
+    assert len(cache) == 1
+    assert cache.stats.evictions == 1
+    assert await cache.lookup("How can I reset my password?", **target) is None
+
+
+@pytest.mark.asyncio
+async def test_router_answers_paraphrase_from_semantic_cache(make_provider):
+    provider = make_provider(content="Use the link.")
+
+    router = LLMRouter()
+    router.register_provider(provider)
+    router.set_defaults(local_model="llama3", cloud_model="gpt-4o")
+    router.set_semantic_cache(SemanticCache(fake_embedder, thresholds={"support": 0.95}))
+
+    await router.route("How do I reset my password?", task_type="support")
+    response = await router.route("How can I reset my password?", task_type="support")
+
+    assert response.metadata["cache"] == "semantic"
+    assert response.metadata["cache_hit"] is True
+    assert provider.generate.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_ollama_embedder_posts_batch():
+    def handler(request):
+        body = json.loads(request.content)
+        return httpx.Response(200, json={"embeddings": [[0.1, 0.2] for _ in body["input"]]})
+
+    embedder = OllamaEmbedder(http_pool=HTTPClientPool(transport=httpx.MockTransport(handler)))
+    vectors = await embedder(["a", "b"])
+
+    assert np.asarray(vectors).shape == (2, 2)
+    await embedder.aclose()
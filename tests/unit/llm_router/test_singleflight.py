@@ -0,0 +1,135 @@
+import asyncio
+
+import pytest
+
+from powertools.router.llm_router import LLMRouter, SingleFlight
+from powertools.router.llm_router.models import LLMResponse, ProviderType
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "result"
+
+    results = await asyncio.gather(*(flight.do("k", work) for _ in range(5)))
+
+    assert results == ["result"] * 5
+    assert calls == 1
+    assert flight.coalesced == 4
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_errors_propagate_to_every_waiter():
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(*(flight.do("k", work) for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert not flight.in_flight("k")
+
+
+@pytest.mark.asyncio
+async def test_cancelling_one_waiter_keeps_work_running_for_others():
+    flight = SingleFlight()
+    started = asyncio.Event()
+
+    async def work():
+        started.set()
+        await asyncio.sleep(0.02)
+        return "done"
+
+    first = asyncio.ensure_future(flight.do("k", work))
+    await started.wait()
+    second = asyncio.ensure_future(flight.do("k", work))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == "done"
+    assert first.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_work_is_cancelled_when_all_waiters_leave():
+    flight = SingleFlight()
+    cancelled = asyncio.Event()
+
+    async def work():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    waiter = asyncio.ensure_future(flight.do("k", work))
+    await asyncio.sleep(0)
+    waiter.cancel()
+
+    await asyncio.wait_for(cancelled.wait(), 1)
+    await asyncio.sleep(0)
+    assert not flight.in_flight("k")
+
+
+@pytest.mark.asyncio
+async def test_router_coalesces_identical_requests(make_provider):
+    async def generate(prompt, model, **kwargs):
+        await asyncio.sleep(0.01)
+        return LLMResponse(content="shared", model=model, provider="ollama", provider_type=ProviderType.LOCAL)
+
+    provider = make_provider(generate=generate)
+    router = LLMRouter()
+    router.register_provider(provider)
+    router.set_defaults(local_model="llama3", cloud_model="gpt-4o")
+    router.set_request_coalescing()
+
+    responses = await asyncio.gather(
+        *(router.route("Same prompt") for _ in range(4)),
+        router.route("Other prompt"),
+    )
+
+    assert provider.generate.await_count == 2
+    assert router.coalesced_requests == 3
+    assert [r.metadata.get("coalesced", False) for r in responses[:4]].count(True) == 3
+    assert all(r.content == "shared" for r in responses)
+
+
+@pytest.mark.asyncio
+async def test_router_coalesces_only_within_a_lane_and_tag_set(make_provider, make_router):
+    provider = make_provider(delay=0.01)
+    router = make_router(provider)
+    router.set_request_coalescing()
+
+    await asyncio.gather(
+        router.route("Same prompt", tags={"team": "search"}),
+        router.route("Same prompt", tags={"team": "search"}),
+        router.route("Same prompt", tags={"team": "ads"}),
+        router.route("Same prompt", tags={"team": "search"}, priority="bulk"),
+    )
+
+    assert provider.generate.await_count == 3
+    assert router.coalesced_requests == 1
+
+
+@pytest.mark.asyncio
+async def test_joined_request_gives_up_at_its_own_deadline(make_provider, make_router):
+    provider = make_provider(content="shared", delay=0.05)
+    router = make_router(provider)
+    router.set_request_coalescing()
+
+    leader = asyncio.ensure_future(router.route("Same prompt"))
+    await asyncio.sleep(0)
+    with pytest.raises(asyncio.TimeoutError):
+        await router.route("Same prompt", deadline_seconds=0.01)
+
+    assert (await leader).content == "shared"
+    assert provider.generate.await_count == 1
@@ -0,0 +1,59 @@
+import pytest
+
+from powertools.router.llm_router import LLMRouter, ProviderStats
+
+
+def test_ewma_latency_throughput_and_error_rate():
+    stats = ProviderStats(alpha=0.5)
+    stats.record_success("ollama", "llama3", latency_ms=1000, completion_tokens=100)
+    stats.record_success("ollama", "llama3", latency_ms=2000, completion_tokens=100)
+    stats.record_error("ollama", "llama3")
+
+    series = stats.get("ollama", "llama3")
+    assert series.latency_ms == pytest.approx(1500)
+    assert series.tokens_per_second == pytest.approx(75)
+    assert series.error_rate == pytest.approx(0.5)
+    assert stats.expected_latency_ms("ollama", "llama3") == pytest.approx(3000)
+    assert stats.get("ollama").samples == 3
+
+
+def test_expected_latency_accounts_for_output_length():
+    stats = ProviderStats()
+    stats.record_success("ollama", "llama3", latency_ms=500, completion_tokens=50)
+
+    assert stats.expected_latency_ms("ollama", "llama3") == pytest.approx(500)
+    assert stats.expected_latency_ms("ollama", "llama3", output_tokens=1000) == pytest.approx(10_000)
+    assert stats.expected_latency_ms("ollama", "phi3") == pytest.approx(500)
+    assert stats.expected_latency_ms("vllm", "llama3") is None
+
+
+def test_confidence_grows_with_samples():
+    stats = ProviderStats(confidence_samples=10)
+    assert stats.confidence("ollama", "llama3") == 0.0
+
+    for _ in range(10):
+        stats.record_success("ollama", "llama3", latency_ms=100)
+
+    assert stats.confidence("ollama", "llama3") == pytest.approx(0.5)
+
+
+@pytest.mark.asyncio
+async def test_router_prefers_faster_candidate_and_fills_estimates(make_provider):
+    slow = make_provider("slow-box", usage={"completion_tokens": 50})
+    fast = make_provider("fast-box", usage={"completion_tokens": 50})
+    router = LLMRouter()
+    router.register_provider(slow)
+    router.register_provider(fast)
+    router.set_defaults(local_model="llama3", cloud_model="gpt-4o")
+    router.stats.record_success("slow-box", "llama3", latency_ms=900)
+    router.stats.record_success("fast-box", "llama3", latency_ms=100)
+
+    decision = await router._make_routing_decision("Hi", 0.1, None)
+    response = await router.route("Hi", complexity=0.1)
+
+    assert decision.provider_id == "fast-box"
+    assert decision.estimated_latency_ms == pytest.approx(100)
+    assert 0.0 < decision.confidence_score < 1.0
+    assert response.provider == "fast-box"
+    assert router.stats.get("fast-box", "llama3").successes == 2
+    slow.generate.assert_not_called()
@@ -0,0 +1,151 @@
+import json
+
+import httpx
+import pytest
+
+from powertools.meta.integrations.llm.ollama import OllamaProvider
+from powertools.meta.integrations.llm.openai import OpenAIProvider
+from powertools.router.llm_router import LLMProvider, StreamChunk
+from powertools.router.llm_router.models import LLMResponse, ProviderType
+from powertools.utils import HTTPClientPool
+
+
+class StreamingProvider(LLMProvider):
+    def __init__(self, provider_id, provider_type, tokens, fail_after=None):
+        self._id = provider_id
+        self._type = provider_type
+        self.tokens = tokens
+        self.fail_after = fail_after
+        self.calls = 0
+
+    @property
+    def provider_id(self):
+        return self._id
+
+    @property
+    def provider_type(self):
+        return self._type
+
+    async def generate(self, prompt, model, **kwargs):
+        return LLMResponse(
+            content="".join(self.tokens), model=model, provider=self._id, provider_type=self._type
+        )
+
+    async def generate_stream(self, prompt, model, **kwargs):
+        self.calls += 1
+        for i, token in enumerate(self.tokens):
+            if self.fail_after is not None and i == self.fail_after:
+                raise RuntimeError("stream broke")
+            yield StreamChunk(content=token)
+        yield StreamChunk(content="", done=True, usage={"total_tokens": len(self.tokens)})
+
+    async def is_healthy(self):
+        return True
+
+    def get_supported_models(self):
+        return [f"{self._id}-model"]
+
+
+@pytest.mark.asyncio
+async def test_route_stream_yields_tokens_and_assembles_response(make_router):
+    local = StreamingProvider("local", ProviderType.LOCAL, ["Hel", "lo"])
+    cloud = StreamingProvider("cloud", ProviderType.CLOUD, ["nope"])
+    router = make_router(local, cloud, local_model="local-model", cloud_model="cloud-model")
+    stream = router.route_stream("Hi", complexity=0.1)
+
+    chunks = [chunk.content async for chunk in stream]
+
+    assert chunks == ["Hel", "lo", ""]
+    assert stream.response.content == "Hello"
+    assert stream.response.provider == "local"
+    assert stream.response.usage == {"total_tokens": 2}
+    assert stream.response.metadata["ttft_ms"] == stream.ttft_ms
+    assert stream.ttft_ms <= stream.response.latency_ms
+
+
+@pytest.mark.asyncio
+async def test_route_stream_falls_back_before_first_token(make_router):
+    local = StreamingProvider("local", ProviderType.LOCAL, ["x"], fail_after=0)
+    cloud = StreamingProvider("cloud", ProviderType.CLOUD, ["from ", "cloud"])
+    router = make_router(local, cloud, local_model="local-model", cloud_model="cloud-model")
+    stream = router.route_stream("Hi", complexity=0.1)
+
+    content = "".join([chunk.content async for chunk in stream])
+
+    assert content == "from cloud"
+    assert stream.response.provider == "cloud"
+    assert stream.response.model == "cloud-model"
+
+
+@pytest.mark.asyncio
+async def test_route_stream_raises_after_first_token(make_router):
+    local = StreamingProvider("local", ProviderType.LOCAL, ["a", "b"], fail_after=1)
+    cloud = StreamingProvider("cloud", ProviderType.CLOUD, ["c"])
+    router = make_router(local, cloud, local_model="local-model", cloud_model="cloud-model")
+    stream = router.route_stream("Hi", complexity=0.1)
+
+    with pytest.raises(RuntimeError, match="stream broke"):
+        async for _ in stream:
+            pass
+    assert cloud.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_ollama_streams_ndjson():
+    lines = [
+        {"response": "Hel", "done": False},
+        {"response": "lo", "done": False},
+        {"response": "", "done": True, "prompt_eval_count": 3, "eval_count": 2},
+    ]
+
+    def handler(request):
+        assert json.loads(request.content)["stream"] is True
+        return httpx.Response(200, content="\n".join(json.dumps(line) for line in lines).encode())
+
+    provider = OllamaProvider(http_pool=HTTPClientPool(transport=httpx.MockTransport(handler)))
+    chunks = [chunk async for chunk in provider.generate_stream("Hi", "llama3")]
+
+    assert [c.content for c in chunks] == ["Hel", "lo", ""]
+    assert chunks[-1].done
+    assert chunks[-1].usage["total_tokens"] == 5
+    await provider.aclose()
+
+
+@pytest.mark.asyncio
+async def test_openai_streams_sse():
+    events = [
+        {"choices": [{"delta": {"role": "assistant"}}]},
+        {"choices": [{"delta": {"content": "Hi"}}]},
+        {"choices": [{"delta": {"content": " there"}}]},
+        {"choices": [], "usage": {"prompt_tokens": 4, "completion_tokens": 2, "total_tokens": 6}},
+    ]
+    body = "".join(f"data: {json.dumps(e)}\n\n" for e in events) + "data: [DONE]\n\n"
+
+    provider = OpenAIProvider(
+        api_key="sk-test",
+        http_pool=HTTPClientPool(transport=httpx.MockTransport(lambda r: httpx.Response(200, content=body.encode()))),
+    )
+    chunks = [chunk async for chunk in provider.generate_stream("Hi", "gpt-4o")]
+
+    assert "".join(c.content for c in chunks) == "Hi there"
+    assert chunks[-1].done
+    assert chunks[-1].usage["total_tokens"] == 6
+    await provider.aclose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "provider_cls, body",
+    [
+        (OllamaProvider, {"done": True}),
+        (OpenAIProvider, {"choices": [{"message": {"content": None}}]}),
+    ],
+)
+async def test_malformed_provider_replies_raise(provider_cls, body):
+    pool = HTTPClientPool(transport=httpx.MockTransport(lambda r: httpx.Response(200, json=body)))
+    kwargs = {"api_key": "sk-test"} if provider_cls is OpenAIProvider else {}
+    provider = provider_cls(http_pool=pool, **kwargs)
+
+    with pytest.raises((KeyError, ValueError)):
+        await provider.generate("Hi", "model")
+    await provider.aclose()
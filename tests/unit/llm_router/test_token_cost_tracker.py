@@ -32,3 +32,58 @@ def test_estimate_cost_raises_for_unknown_model():
 
     with pytest.raises(ValueError, match="No pricing registered"):
         tracker.estimate_cost("unknown", input_tokens=10, output_tokens=10)
+
+
+PRICES = {"a": (1.0, 2.0), "b": (0.0, 0.0)}
+
+
+def test_retention_cap_keeps_newest_rows_but_totals_cover_all_calls(make_tracker):
+    ticks = iter(range(100))
+    tracker = make_tracker(PRICES, max_records=3, clock=lambda: float(next(ticks)))
+    for i in range(5):
+        tracker.record_usage(model="a" if i % 2 == 0 else "b", input_tokens=i, output_tokens=1)
+
+    assert [r.input_tokens for r in tracker.iter_records()] == [2, 3, 4]
+    assert [r.timestamp for r in tracker.records] == [2.0, 3.0, 4.0]
+    assert tracker.usage_log.evicted == 2
+    assert tracker.call_count == 5
+    assert tracker.total_tokens == sum(range(5)) + 5
+    assert tracker.total_cost == pytest.approx((0 + 2 + 4) / 1000 + 3 * 2 / 1000)
+    assert tracker.summarize_by_model()["a"]["calls"] == 3
+
+
+def test_records_keep_metadata_and_summary_is_a_copy(make_tracker):
+    tracker = make_tracker(PRICES)
+    tracker.record_usage(model="a", input_tokens=10, output_tokens=5, metadata={"provider": "openai"})
+    tracker.record_usage(model="b", input_tokens=1, output_tokens=1)
+
+    first, second = tracker.records
+    assert first.metadata == {"provider": "openai"}
+    assert second.metadata == {}
+    assert first.total_tokens == 15
+
+    tracker.summarize_by_model()["a"]["calls"] = 99
+    assert tracker.summarize_by_model()["a"]["calls"] == 1
+
+
+def test_to_numpy_exports_columns_oldest_first(make_tracker):
+    np = pytest.importorskip("numpy")
+    tracker = make_tracker(PRICES, max_records=2)
+    assert tracker.to_numpy()["cost"].shape == (0,)
+
+    for model, tokens in [("a", 100), ("b", 200), ("a", 300)]:
+        tracker.record_usage(model=model, input_tokens=tokens, output_tokens=0)
+    columns = tracker.to_numpy()
+
+    assert list(columns["model"]) == ["b", "a"]
+    assert columns["input_tokens"].tolist() == [200, 300]
+    assert columns["total_tokens"].dtype == np.int64
+    assert columns["cost"] == pytest.approx([0.0, 0.3])
+    # Exported arrays are copies: recording continues while they are held.
+    tracker.record_usage(model="a", input_tokens=1, output_tokens=1)
+    assert columns["input_tokens"].tolist() == [200, 300]
+
+
+def test_max_records_must_be_positive():
+    with pytest.raises(ValueError):
+        TokenCostTracker(max_records=0)
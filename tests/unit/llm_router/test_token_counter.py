@@ -0,0 +1,185 @@
+import logging
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from powertools.router.llm_router import LLMRouter, TokenCostTracker, TokenCounter
+from powertools.utils import token_counter as token_counter_module
+
+
+class FakeEncoding:
+    """Whitespace tokenizer standing in for a tiktoken encoding."""
+
+    name = "fake_base"
+
+    def __init__(self):
+        self.encoded = 0
+
+    def encode_ordinary(self, text):
+        self.encoded += 1
+        return text.split()
+
+    def encode_ordinary_batch(self, texts):
+        self.encoded += len(texts)
+        return [text.split() for text in texts]
+
+
+@pytest.fixture
+def encoding(monkeypatch):
+    encoding = FakeEncoding()
+
+    def encoding_for_model(model):
+        if not model.startswith("gpt-"):
+            raise KeyError(model)
+        return encoding
+
+    monkeypatch.setattr(
+        token_counter_module, "_tiktoken", SimpleNamespace(encoding_for_model=encoding_for_model)
+    )
+    return encoding
+
+
+def test_estimates_without_tiktoken(monkeypatch):
+    monkeypatch.setattr(token_counter_module, "_tiktoken", None)
+    counter = TokenCounter()
+
+    assert not counter.is_exact("gpt-4o")
+    assert counter.count("x" * 40, "gpt-4o") == 10
+    assert counter.count("", "gpt-4o") == 0
+
+
+def test_exact_counts_for_models_tiktoken_knows(encoding):
+    counter = TokenCounter()
+
+    assert counter.is_exact("gpt-4o")
+    assert not counter.is_exact("llama3")
+    assert counter.count("one two three", "gpt-4o") == 3
+    assert counter.count("one two three", "llama3") == 4  # 13 chars / 4
+
+
+def test_long_texts_are_counted_once(encoding):
+    counter = TokenCounter(min_cached_chars=10)
+    system_prompt = "You are a careful assistant. " * 20
+
+    first = counter.count(system_prompt, "gpt-4o")
+    second = counter.count(system_prompt, "gpt-4")  # same encoding, same cache entry
+
+    assert first == second == 100
+    assert encoding.encoded == 1
+    assert (counter.hits, counter.misses) == (1, 1)
+
+
+def test_cache_evicts_least_recently_used(encoding):
+    counter = TokenCounter(cache_size=2, min_cached_chars=1)
+
+    for text in ("a", "b", "a", "c", "a", "b"):
+        counter.count(text, "gpt-4o")
+
+    assert encoding.encoded == 4  # "b" was evicted by "c"
+
+
+def test_count_many_batches_misses(encoding):
+    counter = TokenCounter(min_cached_chars=1)
+    counter.count("cached text here", "gpt-4o")
+    encoding.encoded = 0
+
+    counts = counter.count_many(["one", "", "cached text here", "four five"], "gpt-4o")
+
+    assert counts == [1, 0, 3, 2]
+    assert encoding.encoded == 2
+
+
+def test_count_many_estimates_unknown_models(encoding):
+    assert TokenCounter().count_many(["x" * 8, "", "y"], "mistral") == [2, 0, 1]
+
+
+def test_observe_calibrates_estimate(encoding):
+    counter = TokenCounter(calibration_alpha=0.5)
+
+    counter.observe("x" * 300, "llama3", 100)  # 3 chars per token
+    assert counter.chars_per_token_for("llama3") == pytest.approx(3.0)
+    assert counter.count("x" * 30, "llama3") == 10
+
+    counter.observe("x" * 500, "llama3", 100)  # 5 chars per token
+    assert counter.chars_per_token_for("llama3") == pytest.approx(4.0)
+
+    counter.observe("x" * 500, "gpt-4o", 100)  # exact models are not calibrated
+    counter.observe("x" * 500, "mistral", 0)
+    assert counter.chars_per_token_for("gpt-4o") == counter.chars_per_token_for("mistral") == 4.0
+
+    counter.observe("hi", "phi3", 40)  # template overhead dominates a short prompt
+    assert counter.chars_per_token_for("phi3") == 1.0
+
+
+def test_failing_encoding_load_falls_back_to_estimate(monkeypatch, caplog):
+    def encoding_for_model(model):
+        raise OSError("could not fetch cl100k_base.tiktoken")
+
+    monkeypatch.setattr(
+        token_counter_module, "_tiktoken", SimpleNamespace(encoding_for_model=encoding_for_model)
+    )
+    counter = TokenCounter()
+
+    with caplog.at_level(logging.WARNING, logger=token_counter_module.__name__):
+        assert counter.count("x" * 40, "gpt-4o") == 10
+        assert counter.count("x" * 40, "gpt-4") == 10
+
+    assert not counter.is_exact("gpt-4o")
+    assert len(caplog.records) == 1
+
+
+@pytest.mark.asyncio
+async def test_preload_resolves_encodings_off_the_event_loop(monkeypatch):
+    threads = []
+    encoding = FakeEncoding()
+
+    def encoding_for_model(model):
+        threads.append(threading.current_thread())
+        return encoding
+
+    monkeypatch.setattr(
+        token_counter_module, "_tiktoken", SimpleNamespace(encoding_for_model=encoding_for_model)
+    )
+    counter = TokenCounter()
+
+    await counter.preload(["gpt-4o", "gpt-4o", "gpt-4"])
+    await counter.preload(["gpt-4o"])
+
+    assert len(threads) == 2
+    assert threading.main_thread() not in threads
+    assert counter.count("one two", "gpt-4o") == 2
+
+
+def test_tracker_estimates_prompt_cost(monkeypatch):
+    monkeypatch.setattr(token_counter_module, "_tiktoken", None)
+    tracker = TokenCostTracker(token_counter=TokenCounter())
+    tracker.register_model_pricing("gpt-4o", input_cost_per_1k=1.0, output_cost_per_1k=2.0)
+
+    cost = tracker.estimate_prompt_cost("gpt-4o", "x" * 4000, output_tokens=500)
+
+    assert cost == pytest.approx(2.0)
+
+
+@pytest.mark.asyncio
+async def test_router_calibrates_counter_from_reported_usage(monkeypatch, make_provider):
+    monkeypatch.setattr(token_counter_module, "_tiktoken", None)
+    provider = make_provider(usage={"prompt_tokens": 20, "completion_tokens": 5, "total_tokens": 25})
+    router = LLMRouter()
+    router.register_provider(provider)
+    counter = TokenCounter()
+    router.set_token_counter(counter)
+
+    await router.route("x" * 40, complexity=0.1, required_model="llama3")
+
+    assert router.token_counter is counter
+    assert counter.chars_per_token_for("llama3") == pytest.approx(2.0)
+
+
+def test_router_shares_the_cost_trackers_counter():
+    router = LLMRouter()
+    assert router.token_counter is token_counter_module.default_token_counter()
+
+    counter = TokenCounter()
+    router.set_cost_tracker(TokenCostTracker(token_counter=counter))
+    assert router.token_counter is counter
@@ -0,0 +1,73 @@
+import pytest
+
+from powertools.model_registry import FEATURE_NAMES, ComplexityEstimator, ModelRegistry, extract_features
+from powertools.model_registry.complexity import MAX_SCANNED_CHARS
+
+SIMPLE = "hi there, thanks!"
+HARD = (
+    "Design a sharded, horizontally scalable job queue. Analyze the trade-offs of "
+    "at-least-once delivery and explain why.\n"
+    "1. It must survive node loss\n"
+    "2. It should keep ordering per key\n"
+    "```python\ndef enqueue(job):\n    return store.put(job)\n```"
+)
+
+
+def test_extract_features_has_one_value_per_name():
+    features = extract_features(HARD)
+    assert len(features) == len(FEATURE_NAMES)
+    assert features[FEATURE_NAMES.index("code")] > 0
+    assert extract_features("")[FEATURE_NAMES.index("avg_word_length")] == 0.0
+
+
+def test_extract_features_scans_a_bounded_prefix():
+    prefix = (HARD * 100)[:MAX_SCANNED_CHARS]
+    short, long = extract_features(prefix), extract_features(prefix + HARD * 100)
+
+    assert long[0] > short[0]  # log_chars still sees the full length
+    assert long[1:] == short[1:]
+
+
+def test_default_model_orders_simple_below_hard():
+    estimator = ComplexityEstimator()
+    assert estimator.score(SIMPLE) < 0.3
+    assert estimator.score(HARD) > 0.7
+
+
+def test_score_is_memoised_by_prompt():
+    estimator = ComplexityEstimator(cache_size=1)
+    first = estimator.score(HARD)
+    estimator.weights = [0.0] * len(FEATURE_NAMES)
+    assert estimator.score(HARD) == first
+    estimator.score(SIMPLE)  # evicts HARD
+    assert estimator.score(HARD) != first
+
+
+def test_fit_reduces_loss_and_moves_scores_towards_labels():
+    samples = [(SIMPLE, 0.0), ("Translate 'cat' to French", 0.0), (HARD, 1.0)]
+    estimator = ComplexityEstimator(weights=[0.0] * len(FEATURE_NAMES), bias=0.0)
+    first = estimator.fit(samples, epochs=1)
+    last = estimator.fit(samples, epochs=300)
+    assert last < first
+    assert estimator.score(SIMPLE) < 0.5 < estimator.score(HARD)
+
+    with pytest.raises(ValueError):
+        estimator.fit([])
+
+
+def test_registry_persists_trained_estimator(tmp_path):
+    registry = ModelRegistry()
+    registry.complexity_estimator.fit([(SIMPLE, 0.0), (HARD, 1.0)], epochs=50)
+    path = str(tmp_path / "registry.json")
+    registry.save(path)
+
+    loaded = ModelRegistry.load(path)
+    assert loaded.complexity_estimator.weights == registry.complexity_estimator.weights
+    assert loaded.complexity_estimator.bias == registry.complexity_estimator.bias
+
+
+def test_from_dict_rejects_other_feature_set():
+    data = ComplexityEstimator().to_dict()
+    data["features"] = ["log_chars"]
+    with pytest.raises(ValueError):
+        ComplexityEstimator.from_dict(data)
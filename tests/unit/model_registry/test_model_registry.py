@@ -330,3 +330,25 @@ async def test_router_uses_tier_aware_routing_when_registry_attached():
 
     assert response.content == "Tier-S response"
     provider.generate.assert_called_once_with("Plan the system architecture", "llama3")
+
+
+def test_get_models_meeting_floor_includes_stronger_tiers():
+    registry = ModelRegistry()
+    for name, tier in (("s", ModelTier.S), ("a", ModelTier.A), ("b", ModelTier.B), ("c", ModelTier.C)):
+        registry.add_accreditation(ModelAccreditation(model_full_name=f"ollama:{name}", tier=tier))
+
+    models = registry.get_models_meeting_floor("analysis")
+
+    assert [m.model_full_name for m in models] == ["ollama:s", "ollama:a"]
+    assert len(registry.get_models_meeting_floor("unknown-task")) == 4
+
+
+def test_get_fallback_models_includes_fallback_tier():
+    registry = ModelRegistry()
+    for name, tier in (("s", ModelTier.S), ("a", ModelTier.A), ("b", ModelTier.B), ("c", ModelTier.C)):
+        registry.add_accreditation(ModelAccreditation(model_full_name=f"ollama:{name}", tier=tier))
+
+    models = registry.get_fallback_models("analysis")
+
+    assert [m.model_full_name for m in models] == ["ollama:a", "ollama:b"]
+    assert [m.model_full_name for m in registry.get_models_for_task("analysis")] == ["ollama:a"]
@@ -7,6 +7,7 @@ from powertools.tools.local_llm_wrapper import (
     LocalLLMRequestWrapper,
     WrappedLLMRequest,
 )
+from powertools.utils import HTTPClientPool
 
 
 def test_build_and_unwrap_transfer_payload_round_trip():
@@ -65,3 +66,35 @@ async def test_execute_calls_local_openai_compatible_endpoint():
     assert captured["json"]["messages"][0]["role"] == "user"
     assert "Task: lint" in captured["json"]["messages"][0]["content"]
     assert response.content == "done"
+
+
+def chat_completion(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json={"model": "llama3", "choices": [{"message": {"content": "done"}}]})
+
+
+@pytest.mark.asyncio
+async def test_repeated_execute_reuses_one_pooled_client():
+    pool = HTTPClientPool(transport=httpx.MockTransport(chat_completion))
+    wrapper = LocalLLMRequestWrapper(base_url="http://localhost:11434", model="llama3", http_pool=pool)
+    client = pool.client("http://localhost:11434")
+
+    for _ in range(3):
+        await wrapper.execute(WrappedLLMRequest(task="lint", user_prompt="Check code quality"))
+
+    assert pool.origins == ["http://localhost:11434"]
+    assert pool.client("http://localhost:11434") is client
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_aclose_closes_only_a_pool_the_wrapper_owns():
+    async with LocalLLMRequestWrapper(base_url="http://localhost:11434", model="llama3") as wrapper:
+        owned = wrapper._http_pool.client(wrapper.base_url)
+    assert owned.is_closed
+
+    pool = HTTPClientPool(transport=httpx.MockTransport(chat_completion))
+    shared = pool.client("http://localhost:11434")
+    async with LocalLLMRequestWrapper(base_url="http://localhost:11434", model="llama3", http_pool=pool):
+        pass
+    assert not shared.is_closed
+    await pool.aclose()
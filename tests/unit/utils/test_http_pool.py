@@ -0,0 +1,85 @@
+import httpx
+import pytest
+
+from powertools.meta.integrations.llm.ollama import OllamaProvider
+from powertools.meta.integrations.llm.openai import OpenAIProvider
+from powertools.utils import HTTPClientPool, HTTPPoolConfig
+
+
+@pytest.mark.asyncio
+async def test_client_is_reused_per_origin():
+    pool = HTTPClientPool(transport=httpx.MockTransport(lambda request: httpx.Response(200)))
+
+    first = pool.client("http://localhost:11434")
+    second = pool.client("http://localhost:11434/api/generate")
+    other = pool.client("https://api.openai.com/v1")
+
+    assert first is second
+    assert first is not other
+    assert sorted(pool.origins) == ["http://localhost:11434", "https://api.openai.com"]
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_aclose_closes_clients_and_pool_can_reopen():
+    pool = HTTPClientPool(transport=httpx.MockTransport(lambda request: httpx.Response(200)))
+    client = pool.client("http://localhost:11434")
+
+    await pool.aclose()
+
+    assert client.is_closed
+    assert pool.origins == []
+    reopened = pool.client("http://localhost:11434")
+    assert reopened is not client
+    response = await reopened.get("http://localhost:11434/api/tags")
+    assert response.status_code == 200
+    await pool.aclose()
+
+
+def test_config_builds_httpx_limits():
+    config = HTTPPoolConfig(max_connections=8, max_keepalive_connections=4, keepalive_expiry_seconds=12.0)
+
+    limits = config.limits()
+
+    assert limits.max_connections == 8
+    assert limits.max_keepalive_connections == 4
+    assert limits.keepalive_expiry == 12.0
+
+
+def reply(request: httpx.Request) -> httpx.Response:
+    if request.url.path.endswith("/api/generate"):
+        return httpx.Response(200, json={"response": "ok", "prompt_eval_count": 1, "eval_count": 1})
+    return httpx.Response(200, json={"choices": [{"message": {"content": "ok"}}], "usage": {}})
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "provider_cls, kwargs",
+    [(OllamaProvider, {}), (OpenAIProvider, {"api_key": "sk-test"})],
+)
+async def test_providers_reuse_one_client_and_leave_shared_pool_open(provider_cls, kwargs):
+    pool = HTTPClientPool(transport=httpx.MockTransport(reply))
+    provider = provider_cls(http_pool=pool, **kwargs)
+    await provider.open()
+    client = pool.client(provider.base_url)
+
+    for _ in range(3):
+        assert (await provider.generate("hi", "m")).content == "ok"
+
+    assert pool.client(provider.base_url) is client
+    assert len(pool.origins) == 1
+    await provider.aclose()
+    assert not client.is_closed
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("provider_cls", [OllamaProvider, OpenAIProvider])
+async def test_providers_close_the_pool_they_own(provider_cls):
+    provider = provider_cls()
+    await provider.open()
+    client = provider._http_pool.client(provider.base_url)
+
+    await provider.aclose()
+
+    assert client.is_closed